@@ -2,6 +2,8 @@
 #define CANARY
 
 #include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
 
 #define CANARY_STR_IMPL_(x) #x
 #define CANARY_STR(x) CANARY_STR_IMPL_(x)
@@ -147,19 +149,91 @@ char *PrimitivePlaceholder(int type) {
     return CANARY_PRIMITIVE_DEFAULT;
 }
 
+// With CANARY_TRACE_FILE set, the trace is written to that file as
+//   records of an operation and an id, instead of as lines on stdout.
+//   Names follow their record, padded to a multiple of the record size.
+//   The file is weak, such that it is shared by everything including this
+#define CANARY_TRACE_LOCATION   (1)
+#define CANARY_TRACE_BEGIN_TEST (2)
+#define CANARY_TRACE_END_TEST   (3)
+#define CANARY_TRACE_BEGIN_UNIT (4)
+#define CANARY_TRACE_END_UNIT   (5)
+#define CANARY_TRACE_COUNT      (6)
+
+__attribute__((weak)) FILE *canary_trace = NULL;
+__attribute__((weak)) int canary_trace_opened = 0;
+
+static inline FILE *canary_trace_file(void) {
+    if (!canary_trace_opened) {
+        canary_trace_opened = 1;
+        const char *path = getenv("CANARY_TRACE_FILE");
+        if (path != NULL) canary_trace = fopen(path, "wb");
+    }
+    return canary_trace;
+}
+
+static inline void canary_trace_record(unsigned int operation, unsigned int id) {
+    unsigned int record[2] = { operation, id };
+    fwrite(record, sizeof(record), 1, canary_trace);
+}
+
+static inline void canary_trace_named(unsigned int operation, const char *name) {
+    static const char padding[8] = { 0 };
+    unsigned int length = strlen(name);
+    canary_trace_record(operation, length);
+    fwrite(name, 1, length, canary_trace);
+    fwrite(padding, 1, (8 - length % 8) % 8, canary_trace);
+}
+
+// With CANARY_COVERAGE set, the visits of each location are only counted.
+//   The counts are written at the end of each test and at exit, as a count
+//   record followed by the 64-bit count, or as "Count=<id>:<count>" lines
+#define CANARY_COUNTS (65536)
+
+__attribute__((weak)) unsigned long long canary_counts[CANARY_COUNTS];
+__attribute__((weak)) int canary_counting_checked = 0;
+__attribute__((weak)) int canary_counting_enabled = 0;
+
+static inline void canary_write_counts(void) {
+    for (unsigned int id = 0; id < CANARY_COUNTS; ++id) {
+        if (canary_counts[id] == 0) continue;
+        if (canary_trace_file() != NULL) {
+            canary_trace_record(CANARY_TRACE_COUNT, id);
+            fwrite(&canary_counts[id], sizeof(canary_counts[id]), 1, canary_trace);
+        } else printf("Count=%u:%llu\n", id, canary_counts[id]);
+        canary_counts[id] = 0;
+    }
+}
+
+static inline int canary_counting(void) {
+    if (!canary_counting_checked) {
+        canary_counting_checked = 1;
+        canary_counting_enabled = getenv("CANARY_COVERAGE") != NULL;
+        if (canary_counting_enabled) atexit(canary_write_counts);
+    }
+    return canary_counting_enabled;
+}
+
 #define CANARY_ACT(ACT) \
-    { printf("BeginTest=%s\n", __func__); } \
+    { if (canary_trace_file() != NULL) canary_trace_named(CANARY_TRACE_BEGIN_TEST, __func__); \
+      else printf("BeginTest=%s\n", __func__); } \
     ACT; \
-    do { printf("EndTest=%s\n", __func__); } while(0)
+    do { if (canary_counting()) canary_write_counts(); \
+      if (canary_trace_file() != NULL) canary_trace_record(CANARY_TRACE_END_TEST, 0); \
+      else printf("EndTest=%s\n", __func__); } while(0)
 
 #define CANARY_TWEET_LOCATION(l)\
-do { printf("Location="CANARY_STR(l)"\n"); } while(0)
+do { if (canary_counting()) { if ((l) < CANARY_COUNTS) ++canary_counts[(l)]; } \
+     else if (canary_trace_file() != NULL) canary_trace_record(CANARY_TRACE_LOCATION, l); \
+     else printf("Location="CANARY_STR(l)"\n"); } while(0)
 
 #define CANARY_TWEET_BEGIN_UNIT(UNIT)\
-do { printf("BeginUnit="CANARY_STR(UNIT)"\n"); } while(0)
+do { if (canary_trace_file() != NULL) canary_trace_named(CANARY_TRACE_BEGIN_UNIT, CANARY_STR(UNIT)); \
+     else printf("BeginUnit="CANARY_STR(UNIT)"\n"); } while(0)
 
 #define CANARY_TWEET_END_UNIT(UNIT)\
-do { printf("EndUnit="CANARY_STR(UNIT)"\n"); } while(0)
+do { if (canary_trace_file() != NULL) canary_trace_record(CANARY_TRACE_END_UNIT, 0); \
+     else printf("EndUnit="CANARY_STR(UNIT)"\n"); } while(0)
 
 #define CANARY_TWEET_PRIMITIVE(VAR)                             \
 do {                                                            \
@@ -0,0 +1,65 @@
+#ifndef CANARY_FORK_SERVER_H
+#define CANARY_FORK_SERVER_H
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <unistd.h>
+#include <sys/types.h>
+#include <sys/wait.h>
+
+// Started with CANARY_FORK_SERVER set, the test program is initialised
+//   once and then forks a child for every run it is asked for. A run is
+//   a line per variable of its environment ("NAME=value"), ended by an
+//   empty line. The child returns to run the tests, the server reports
+//   when it is done. Without CANARY_FORK_SERVER the tests run as usual
+static void canary_fork_server(void) {
+    if (getenv("CANARY_FORK_SERVER") == NULL) return;
+    unsetenv("CANARY_FORK_SERVER");
+    printf("CanaryForkServer=Ready\n");
+    fflush(stdout);
+
+    static char environment[65536];
+    char line[4096];
+    for (;;) {
+        // Step 1: Read the environment of the run, the server is done
+        //   when its input is closed
+        size_t length = 0;
+        int ended = 0;
+        while (fgets(line, sizeof(line), stdin) != NULL) {
+            if (strcmp(line, "\n") == 0) { ended = 1; break; }
+            size_t size = strlen(line);
+            if (length + size < sizeof(environment)) {
+                memcpy(environment + length, line, size);
+                length += size;
+            }
+        }
+        if (!ended) exit(0);
+        environment[length] = '\0';
+
+        // Step 2: Fork the run, which returns to run the tests
+        fflush(stdout);
+        pid_t child = fork();
+        if (child < 0) exit(1);
+        if (child == 0) {
+            for (char *assignment = strtok(environment, "\n"); assignment != NULL; assignment = strtok(NULL, "\n")) {
+                char *value = strchr(assignment, '=');
+                if (value == NULL) continue;
+                *value = '\0';
+                setenv(assignment, value + 1, 1);
+            }
+            printf("CanaryForkServer=Child %d\n", (int)getpid());
+            fflush(stdout);
+            return;
+        }
+
+        // Step 3: Report the end of the run once the child has exited
+        int status = 0;
+        waitpid(child, &status, 0);
+        printf("CanaryForkServer=Done %d\n", status);
+        fflush(stdout);
+    }
+}
+
+#define CANARY_FORK_SERVER() canary_fork_server()
+#endif
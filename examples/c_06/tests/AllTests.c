@@ -4,6 +4,7 @@
 #include "CuTest.h"
 #include "CanaryCuTest.h"
 #include "../src/original.h"
+#include "../src/CanaryForkServer.h"
 
 void addTest(CuTest *ct) {
 	int a = 0;
@@ -78,6 +79,7 @@ void RunAllTests(void) {
 	CuSuiteAddSuite(suite, AddSuite());
 	// CuSuiteAddSuite(suite, CuTestSuite());
 	CuSuiteAddSuite(suite, CanarySuites());
+	suite = CanarySelectedTests(suite);
 
 	CuSuiteRun(suite);
 	CuSuiteSummary(suite, output);
@@ -86,5 +88,6 @@ void RunAllTests(void) {
 }
 
 int main(void) {
+	CANARY_FORK_SERVER();
 	RunAllTests();
 }
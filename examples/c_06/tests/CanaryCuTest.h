@@ -1,10 +1,30 @@
 #ifndef CANARY_CUTEST
 #define CANARY_CUTEST
 
+#include <stdlib.h>
+#include <string.h>
 #include "CuTest.h"
 
 CuSuite *CanarySuites() {
     CuSuite *suite = CuSuiteNew();
     return suite;
 }
-#endif
\ No newline at end of file
+
+int CanaryIsSelected(const char *name, const char *tests) {
+    size_t length = strlen(name);
+    for (const char *at = strstr(tests, name); at != NULL; at = strstr(at + 1, name)) {
+        if ((at == tests || at[-1] == ' ') && (at[length] == '\0' || at[length] == ' ')) return 1;
+    }
+    return 0;
+}
+
+CuSuite *CanarySelectedTests(CuSuite *suite) {
+    const char *tests = getenv("CANARY_TESTS");
+    if (tests == NULL) return suite;
+    CuSuite *selected = CuSuiteNew();
+    for (int idx = 0; idx < suite->count; ++idx) {
+        if (CanaryIsSelected(suite->list[idx]->name, tests)) CuSuiteAdd(selected, suite->list[idx]);
+    }
+    return selected;
+}
+#endif
@@ -1,3 +1,4 @@
+import sys
 from utilities import (
     ArgumentParser,
     setupCommandLine,
@@ -5,7 +6,9 @@ from utilities import (
 from commands import (
     generate_tests,
     create_cfg,
-    mutation_analysis
+    mutation_analysis,
+    work,
+    benchmark,
 )
 
 def main():
@@ -31,7 +34,51 @@ def main():
             args.mutation_strategy,
             args.unit_whitelist,
             args.unit_blacklist,
+            args.jobs,
+            args.schemata,
+            args.incremental_build,
+            args.keep_test_results,
+            args.result_cache,
+            args.deduplicate,
+            args.compiler_equivalence,
+            args.full_traces,
+            args.timeout_factor,
+            args.timeout_constant,
+            args.select_tests,
+            args.fork_server,
+            args.binary_trace,
+            args.coverage_counts,
+            args.batch_units,
+            args.file_jobs,
+            args.work_queue,
+            args.checkpoint,
+            args.resume,
+            args.parquet,
+            args.profile,
         )
+    elif args.action == "work":
+        work(
+            args.work_queue,
+            args.build_command,
+            args.test_command,
+            args.out,
+            args.base,
+            args.testing_backend,
+            args.idle_timeout,
+        )
+    elif args.action == "benchmark":
+        regressions = benchmark(
+            args.file,
+            args.out,
+            args.base,
+            args.repeat,
+            args.synthetic_functions,
+            args.trace_lines,
+            args.baseline,
+            args.regression_threshold,
+        )
+        if len(regressions) > 0:
+            sys.exit(1)
 
 if __name__ == "__main__":
     main()
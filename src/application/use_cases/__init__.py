@@ -12,6 +12,10 @@ from .create_cfg import *
 from .create_symbol_table import *
 from .parse_file import *
 from .unit_analyse_tree import *
+from .mutation_test_options import *
 from .mutate_along_all_traces import *
 from .mutate_randomly import *
+from .build_mutant_schemata import *
+from .build_incrementally import *
+from .learn_incremental_build import *
 from .mutate_all_candidates import *
\ No newline at end of file
@@ -0,0 +1,98 @@
+import subprocess
+import time
+from incremental_build import IncrementalBuild
+from .use_case import *
+from .run_subprocess import RunSubsystemRequest, RunSubsystemUseCase, DEFAULT_TIMEOUT
+
+class BuildIncrementallyRequest(UseCaseRequest):
+    def __init__(
+        self,
+        incremental_build: IncrementalBuild,
+        build_command: str,
+        cwd: str = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        self._incremental_build = incremental_build
+        self._build_command = build_command
+        self._cwd = cwd
+        self._timeout = timeout
+        super().__init__()
+
+    @property
+    def incremental_build(self) -> IncrementalBuild:
+        return self._incremental_build
+
+    @property
+    def build_command(self) -> str:
+        return self._build_command
+
+    @property
+    def cwd(self) -> str:
+        return self._cwd
+
+    @property
+    def timeout(self) -> float:
+        # For all of the commands together, None if there is no limit
+        return self._timeout
+
+class BuildIncrementallyResponse(UseCaseResponse):
+    def __init__(self, built: bool, timed_out: bool = False) -> None:
+        self._built = built
+        self._timed_out = timed_out
+        super().__init__()
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    @property
+    def timed_out(self) -> bool:
+        # Whether a command was killed for running out of time, in
+        #   which case it is not built either
+        return self._timed_out
+
+class BuildIncrementallyUseCase(
+    UseCase[BuildIncrementallyRequest, BuildIncrementallyResponse]
+):
+    def do(self, request: BuildIncrementallyRequest) -> BuildIncrementallyResponse:
+        runner = RunSubsystemUseCase()
+        deadline = None
+        if request.timeout is not None:
+            deadline = time.perf_counter() + request.timeout
+
+        # Step 1: Recompile the changed translation units, and link
+        #   them if we know how to
+        for command in request.incremental_build.commands:
+            response = runner.do(
+                RunSubsystemRequest(
+                    command.command,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    cwd=command.directory,
+                    timeout=self._remaining(deadline),
+                )
+            )
+            if response.returncode != 0:
+                return BuildIncrementallyResponse(False, response.timed_out)
+
+        # Step 2: Otherwise the build system has to link, which at
+        #   this point only has the new objects to pick up
+        if request.incremental_build.link_commands is None and \
+            request.build_command is not None:
+            response = runner.do(
+                RunSubsystemRequest(
+                    request.build_command,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    cwd=request.cwd,
+                    timeout=self._remaining(deadline),
+                )
+            )
+            return BuildIncrementallyResponse(response.returncode == 0, response.timed_out)
+        return BuildIncrementallyResponse(True)
+
+    def _remaining(self, deadline: float) -> float:
+        if deadline is None:
+            return None
+        # A command past the deadline times out at once
+        return max(deadline - time.perf_counter(), 0.001)
@@ -0,0 +1,90 @@
+import subprocess
+from incremental_build import IncrementalBuild
+from mutator import MutantSchemata
+from .use_case import *
+from .run_subprocess import RunSubsystemRequest, RunSubsystemUseCase, DEFAULT_TIMEOUT
+from .build_incrementally import BuildIncrementallyRequest, BuildIncrementallyUseCase
+
+class BuildMutantSchemataRequest(UseCaseRequest):
+    def __init__(
+        self,
+        schemata: MutantSchemata,
+        file_path: str,
+        build_command: str,
+        cwd: str = None,
+        incremental_build: IncrementalBuild = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        self._schemata = schemata
+        self._file_path = file_path
+        self._build_command = build_command
+        self._cwd = cwd
+        self._incremental_build = incremental_build
+        self._timeout = timeout
+        super().__init__()
+
+    @property
+    def schemata(self) -> MutantSchemata:
+        return self._schemata
+
+    @property
+    def file_path(self) -> str:
+        return self._file_path
+
+    @property
+    def build_command(self) -> str:
+        return self._build_command
+
+    @property
+    def cwd(self) -> str:
+        return self._cwd
+
+    @property
+    def incremental_build(self) -> IncrementalBuild:
+        return self._incremental_build
+
+    @property
+    def timeout(self) -> float:
+        return self._timeout
+
+class BuildMutantSchemataResponse(UseCaseResponse):
+    def __init__(self, built: bool) -> None:
+        self._built = built
+        super().__init__()
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+class BuildMutantSchemataUseCase(
+    UseCase[BuildMutantSchemataRequest, BuildMutantSchemataResponse]
+):
+    def do(self, request: BuildMutantSchemataRequest) -> BuildMutantSchemataResponse:
+        # Step 1: Write the schemata, which contains all its mutants, to file
+        file = open(request.file_path, "w+")
+        file.write(request.schemata.text)
+        file.close()
+
+        # Step 2: Build it once for all the mutants
+        if request.incremental_build is not None:
+            build_response = BuildIncrementallyUseCase().do(
+                BuildIncrementallyRequest(
+                    request.incremental_build,
+                    request.build_command,
+                    request.cwd,
+                    request.timeout,
+                )
+            )
+            return BuildMutantSchemataResponse(build_response.built)
+        if request.build_command is None:
+            return BuildMutantSchemataResponse(True)
+        build_response = RunSubsystemUseCase().do(
+            RunSubsystemRequest(
+                request.build_command,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                cwd=request.cwd,
+                timeout=request.timeout,
+            )
+        )
+        return BuildMutantSchemataResponse(build_response.returncode == 0)
@@ -1,4 +1,5 @@
 
+from typing import List
 from cfa import (
     CCFAFactory
 )
@@ -23,7 +24,8 @@ class InfestProgramRequest(UseCaseRequest):
         unit_function: Node,
         filepath: str,
         save_graph: bool = True,
-        save_graph_directory: str = "/"
+        save_graph_directory: str = "/",
+        unit_functions: List[Node] = None,
     ) -> None:
         self._parser = parser
         self._tree = tree
@@ -31,6 +33,7 @@ class InfestProgramRequest(UseCaseRequest):
         self._filepath = filepath
         self._save_graph = save_graph
         self._save_graph_directory = save_graph_directory
+        self._unit_functions = unit_functions
         super().__init__()
 
     @property
@@ -57,6 +60,14 @@ class InfestProgramRequest(UseCaseRequest):
     def save_graph_directory(self) -> str:
         return self._save_graph_directory
 
+    @property
+    def unit_functions(self) -> List[Node]:
+        # All the units instrumented in the same pass, which share the
+        #   locations. Only the unit function by default
+        if self._unit_functions is None:
+            return [ self._unit_function ]
+        return self._unit_functions
+
 class InfestProgramResponse(UseCaseResponse):
     def __init__(
         self,
@@ -73,26 +84,27 @@ class InfestProgramUseCase(
     UseCase[InfestProgramRequest, InfestProgramResponse]
 ):
     def do(self, request: InfestProgramRequest) -> InfestProgramResponse:
-        # Step 1: Create CFA for the unit function
-        cfa_factory = CCFAFactory(request.tree)
-        unit_function_body = request.unit_function.child_by_field(
-            CField.BODY
-        )
-        cfa = cfa_factory.create(unit_function_body)
-        if request.save_graph:
-            graph = cfa.draw(request.tree, "cfg")
-            graph.save(directory=request.save_graph_directory)
+        # Step 1: Create CFA for the unit functions
+        cfas = list()
+        for unit_function in request.unit_functions:
+            cfa_factory = CCFAFactory(request.tree)
+            unit_function_body = unit_function.child_by_field(
+                CField.BODY
+            )
+            cfa = cfa_factory.create(unit_function_body)
+            if request.save_graph and unit_function == request.unit_function:
+                graph = cfa.draw(request.tree, "cfg")
+                graph.save(directory=request.save_graph_directory)
+            cfas.append(cfa)
 
         # Step 2: Instrument
         canary_factory = CCanaryFactory()
         infestator = CTreeInfestator(request.parser, canary_factory)
-        instrumented_tree = infestator.infect(request.tree, cfa)
+        instrumented_tree = infestator.infect_all(request.tree, cfas)
 
         # Step 3: Write the instrumented file
         file = open(request.filepath, "w+")
         file.write(instrumented_tree.text)
         file.close()
 
-        return InfestProgramResponse(
-            request.parser.parse(instrumented_tree.text)
-        )
+        return InfestProgramResponse(instrumented_tree)
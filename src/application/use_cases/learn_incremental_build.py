@@ -0,0 +1,100 @@
+import os
+import subprocess
+from incremental_build import CompilationDatabase, CompileCommand, IncrementalBuild
+from .use_case import *
+from .run_subprocess import RunSubsystemRequest, RunSubsystemUseCase
+
+class LearnIncrementalBuildRequest(UseCaseRequest):
+    def __init__(
+        self,
+        build_command: str,
+        file_path: str,
+        base: str = "",
+        cwd: str = None,
+    ) -> None:
+        self._build_command = build_command
+        self._file_path = file_path
+        self._base = base
+        self._cwd = cwd
+        super().__init__()
+
+    @property
+    def build_command(self) -> str:
+        return self._build_command
+
+    @property
+    def file_path(self) -> str:
+        return self._file_path
+
+    @property
+    def base(self) -> str:
+        return self._base
+
+    @property
+    def cwd(self) -> str:
+        return self._cwd
+
+class LearnIncrementalBuildResponse(UseCaseResponse):
+    def __init__(self, incremental_build: IncrementalBuild) -> None:
+        self._incremental_build = incremental_build
+        super().__init__()
+
+    @property
+    def incremental_build(self) -> IncrementalBuild:
+        # None if it could not be learned, then the full build is used
+        return self._incremental_build
+
+class LearnIncrementalBuildUseCase(
+    UseCase[LearnIncrementalBuildRequest, LearnIncrementalBuildResponse]
+):
+    def do(self, request: LearnIncrementalBuildRequest) -> LearnIncrementalBuildResponse:
+        cwd = request.cwd or os.getcwd()
+        file_path = os.path.abspath(request.file_path)
+
+        # Step 1: Find the compile commands, either from a compilation
+        #   database or from a dry run of the build
+        database: CompilationDatabase = None
+        for directory in [ request.base, f'{request.base}/build', cwd ]:
+            path = os.path.join(directory or ".", "compile_commands.json")
+            if os.path.isfile(path):
+                database = CompilationDatabase.from_json(path)
+                break
+        if database is None and request.build_command is not None and \
+            os.path.basename(request.build_command.split()[0]) in [ "make", "gmake" ]:
+            dry_run_response = RunSubsystemUseCase().do(
+                RunSubsystemRequest(
+                    f'{request.build_command} --dry-run --always-make --print-directory',
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    cwd=request.cwd,
+                )
+            )
+            database = CompilationDatabase.from_dry_run(dry_run_response.stdout or "", cwd)
+        if database is None:
+            return LearnIncrementalBuildResponse(None)
+
+        # Step 2: Find the translation units which has to be recompiled,
+        #   a header requires scanning the includes of every unit
+        compile_commands = database.commands_for(file_path)
+        if len(compile_commands) == 0:
+            for compile_command in database.compile_commands:
+                scan_response = RunSubsystemUseCase().do(
+                    RunSubsystemRequest(
+                        compile_command.dependency_scan().command,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.DEVNULL,
+                        cwd=compile_command.directory,
+                    )
+                )
+                dependencies = [
+                    compile_command.path(dependency) for dependency in
+                        CompileCommand.parse_dependencies(scan_response.stdout or "")
+                ]
+                if file_path in dependencies:
+                    compile_commands.append(compile_command)
+        if len(compile_commands) == 0:
+            return LearnIncrementalBuildResponse(None)
+
+        return LearnIncrementalBuildResponse(
+            IncrementalBuild(compile_commands, database.link_commands)
+        )
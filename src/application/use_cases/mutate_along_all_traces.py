@@ -1,11 +1,13 @@
-from typing import Dict, List, Tuple
-from instrumentation_trace import Trace
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+from instrumentation_trace import Coverage, Trace
 from mutator import MutationStrategy
 from cfa import LocalisedCFA, LocalisedNode
 from test_results_parsing import ResultsParser
 from ts import Tree, Parser
 from .use_case import *
 from .mutate_randomly import MutateRandomlyRequest, MutateRandomlyResponse, MutateRandomlyUseCase
+from .mutation_test_options import MutationTestOptions
 
 class MutateAlongAllTracesRequest(UseCaseRequest):
     def __init__(
@@ -20,7 +22,8 @@ class MutateAlongAllTracesRequest(UseCaseRequest):
         test_results_parser: ResultsParser,
         full_file_path: str,
         out: str = "",
-        base: str = ""
+        base: str = "",
+        options: MutationTestOptions = None,
     ) -> None:
         self._traces = traces
         self._localised_cfg = localised_cfg
@@ -33,6 +36,7 @@ class MutateAlongAllTracesRequest(UseCaseRequest):
         self._full_file_path = full_file_path
         self._out = out
         self._base = base
+        self._options = options or MutationTestOptions()
         super().__init__()
 
     @property
@@ -79,6 +83,10 @@ class MutateAlongAllTracesRequest(UseCaseRequest):
     def base(self) -> str:
         return self._base
 
+    @property
+    def options(self) -> MutationTestOptions:
+        return self._options
+
 class MutateAlongAllTracesResponse(UseCaseResponse):
     def __init__(
         self,
@@ -93,7 +101,7 @@ class MutateAlongAllTracesResponse(UseCaseResponse):
         unvisited_mutations: int,
         visited_candidates: int,
         visited_mutations: int,
-        amount_visited_locations: Dict[str, int],
+        amount_visited_locations: Coverage,
         trace_count: int
     ) -> None:
         self._visited_locations = visited_locations
@@ -112,7 +120,7 @@ class MutateAlongAllTracesResponse(UseCaseResponse):
         super().__init__()
 
     @property
-    def amount_visited_locations(self) -> Dict[str, int]:
+    def amount_visited_locations(self) -> Coverage:
         return self._amount_visited_locations
 
     @property
@@ -168,16 +176,13 @@ class MutateAlongAllTracesUseCase(
 ):
     def do(self, request: MutateAlongAllTracesRequest) -> MutateAlongAllTracesResponse:
         # Step 1: Find all unique visited locations from all the traces
-        visited_locations: List[str] = list()
-        for trace in request.traces:
-            for location in trace.sequence:
-                if location.id not in visited_locations:
-                    visited_locations.append(location.id)
+        coverage = Coverage.merged(trace.coverage for trace in request.traces)
+        visited_locations: List[str] = coverage.visited
 
         unvisited_locations: List[str] = list()
         
         for cfg_node in request.localised_cfg.nodes:
-            if cfg_node.location not in visited_locations and \
+            if cfg_node.location not in coverage and \
                 cfg_node.location not in unvisited_locations:
                     unvisited_locations.append(cfg_node.location)
 
@@ -185,7 +190,7 @@ class MutateAlongAllTracesUseCase(
         visited_nodes: List[LocalisedNode] = list()
         unvisited_nodes: List[LocalisedNode] = list()
         for cfa_node in request.localised_cfg.nodes:
-            if cfa_node.location in visited_locations:
+            if cfa_node.location in coverage:
                 visited_nodes.append(cfa_node)
             elif cfa_node.location in unvisited_locations:
                 unvisited_nodes.append(cfa_node)
@@ -213,12 +218,12 @@ class MutateAlongAllTracesUseCase(
                 ))
 
         # Step 4: Randomly mutate on all nodes we visited
-        amount_visited_locations: Dict[str, int] = dict()
+        amount_visited_locations = Coverage()
         amount_killed = 0
         amount_survived = 0
         random_mutations_runs: List[MutateRandomlyResponse] = list()
-        for visited_node in visited_nodes:
-            mutate_randomly_request = MutateRandomlyRequest(
+        mutate_randomly_requests: List[MutateRandomlyRequest] = [
+            MutateRandomlyRequest(
                 visited_node.node,
                 request.tree,
                 request.parser,
@@ -229,16 +234,46 @@ class MutateAlongAllTracesUseCase(
                 request.full_file_path,
                 request.out,
                 request.base,
+                options=request.options,
+                localised_cfg=request.localised_cfg,
+            ) for visited_node in visited_nodes
+        ]
+        if (request.options.schemata or request.options.work_queue is not None) and \
+            len(mutate_randomly_requests) > 0:
+            # The mutants of all the nodes are tested together, such
+            #   that the unit is built once per schemata, or such that
+            #   the workers of the queue get all of them at once
+            mutate_randomly = MutateRandomlyUseCase()
+            node_mutants = [
+                mutate_randomly.mutants(mutate_randomly_request)
+                    for mutate_randomly_request in mutate_randomly_requests
+            ]
+            mutation_tests = mutate_randomly.test(
+                mutate_randomly_requests[0],
+                [ mutant for mutants in node_mutants for mutant in mutants ]
             )
-            mutate_randomly_response = MutateRandomlyUseCase().do(
-                mutate_randomly_request
-            )
+            mutate_randomly_responses = list()
+            for mutants in node_mutants:
+                mutate_randomly_responses.append(
+                    mutate_randomly.summarise(mutation_tests[:len(mutants)])
+                )
+                mutation_tests = mutation_tests[len(mutants):]
+        elif request.options.workspaces is None:
+            mutate_randomly_responses = [
+                MutateRandomlyUseCase().do(mutate_randomly_request)
+                    for mutate_randomly_request in mutate_randomly_requests
+            ]
+        else:
+            # The nodes are handed out concurrently such that the
+            #   workspaces are kept busy across node boundaries
+            with ThreadPoolExecutor(request.options.workspaces.size) as executor:
+                mutate_randomly_responses = list(executor.map(
+                    MutateRandomlyUseCase().do, mutate_randomly_requests
+                ))
 
+        for visited_node, mutate_randomly_response in zip(visited_nodes, mutate_randomly_responses):
             for mutation_test in mutate_randomly_response.mutation_tests:
-                for location in mutation_test.test_results.trace.sequence:
-                    if location.id not in amount_visited_locations:
-                        amount_visited_locations[location.id] = 1
-                    else: amount_visited_locations[location.id] += 1
+                amount_visited_locations.update(mutation_test.location_visitations)
 
             random_mutations_runs.append((visited_node, mutate_randomly_response))
             amount_killed += mutate_randomly_response.amount_killed
@@ -1,10 +1,17 @@
-from typing import List
-from mutator import MutationStrategy
-from test_results_parsing import ResultsParser
+import os
+from typing import Dict, List, Set, Tuple
+from cfa import LocalisedCFA
+from fork_server import ForkServerRunner
+from instrumentation_trace import CANARY_COVERAGE
+from mutator import Mutation, MutationStrategy, MutantSchemata, MutantSchemataFactory, MutantState
+from test_results_parsing import ResultsParser, TestResults
 from ts import Tree, Parser, Node
+from work_queue import MutantJob
+from workspace import Workspace
 from .run_mutation_test import RunMutationTestRequest, RunMutationTestResponse, RunMutationTestUseCase
 from .run_test import RunTestRequest
-from .parse_test_result import ParseTestResultRequest
+from .mutation_test_options import MutationTestOptions
+from .build_mutant_schemata import BuildMutantSchemataRequest, BuildMutantSchemataUseCase
 from .use_case import UseCaseRequest, UseCaseResponse, UseCase
 
 class MutateRandomlyRequest(UseCaseRequest):
@@ -20,6 +27,8 @@ class MutateRandomlyRequest(UseCaseRequest):
         full_file_path: str,
         out: str = "",
         base: str = "",
+        options: MutationTestOptions = None,
+        localised_cfg: LocalisedCFA = None,
     ) -> None:
         self._build_command = build_command
         self._test_command = test_command
@@ -31,6 +40,8 @@ class MutateRandomlyRequest(UseCaseRequest):
         self._full_file_path = full_file_path
         self._out = out
         self._base = base
+        self._options = options or MutationTestOptions()
+        self._localised_cfg = localised_cfg
         super().__init__()
 
     @property
@@ -73,6 +84,15 @@ class MutateRandomlyRequest(UseCaseRequest):
     def base(self) -> str:
         return self._base
 
+    @property
+    def options(self) -> MutationTestOptions:
+        return self._options
+
+    @property
+    def localised_cfg(self) -> LocalisedCFA:
+        # Locates the mutants in the coverage map
+        return self._localised_cfg
+
 class MutateRandomlyResponse(UseCaseResponse):
     def __init__(
         self,
@@ -101,44 +121,378 @@ class MutateRandomlyUseCase(
     UseCase[MutateRandomlyRequest, MutateRandomlyResponse]
 ):
     def do(self, request: MutateRandomlyRequest) -> MutateRandomlyResponse:
-        amount_killed = 0
-        amount_survived = 0
-        mutation_tests: List[RunMutationTestResponse] = list()
+        # Step 1: Enumerate the mutants in a fixed order
+        mutants = self.mutants(request)
+
+        # Step 2: Test the mutants
+        mutation_tests = self.test(request, mutants)
+
+        return self.summarise(mutation_tests)
+
+    def mutants(self, request: MutateRandomlyRequest) -> List[Tuple[int, int, Mutation]]:
+        mutants: List[Tuple[int, int, Mutation]] = list()
         candidates = request.strategy.capture(
             request.node
         )
         for c_idx, candidate in enumerate(candidates):
-
             mutations = request.strategy.mutations(
                 request.parser, request.tree, candidate
             )
             for m_idx, mutation in enumerate(mutations):
-                test_results_path = f'{request.base}/{request.out}/mutant_{c_idx}_{m_idx}_test_results.txt'
-                run_mutation_test_request = RunMutationTestRequest(
-                    mutation,
-                    request.full_file_path,
-                    RunTestRequest(
-                        request.build_command,
-                        request.test_command,
-                        test_results_path
-                    ),
-                    ParseTestResultRequest(
-                        test_results_path,
-                        request.test_results_parser
-                    )
+                mutants.append((c_idx, m_idx, mutation))
+        return mutants
+
+    def test(
+        self,
+        request: MutateRandomlyRequest,
+        mutants: List[Tuple[int, int, Mutation]],
+    ) -> List[RunMutationTestResponse]:
+        # The tests which can observe each mutant, None if all of them
+        tests: Dict[int, Set[str]] = {
+            id(mutation): self._tests_of(request, mutation) for _, _, mutation in mutants
+        }
+
+        # Mutants which no test visits cannot be killed, so they are not tested,
+        #   nor are those tested before the analysis was interrupted
+        results: Dict[int, RunMutationTestResponse] = dict()
+        covered: List[Tuple[int, int, Mutation]] = list()
+        for mutant in mutants:
+            mutant_tests = tests[id(mutant[2])]
+            if mutant_tests is not None and len(mutant_tests) == 0:
+                results[id(mutant[2])] = RunMutationTestResponse(
+                    mutant[2].node, mutant[2], None, state=MutantState.NOT_COVERED
                 )
-                run_mutation_test_response = RunMutationTestUseCase().do(
-                    run_mutation_test_request
+                continue
+            checkpoint = self._checkpoint(request, mutant[2])
+            if checkpoint is not None:
+                results[id(mutant[2])] = RunMutationTestResponse(
+                    mutant[2].node, mutant[2], checkpoint[1], cached=True, state=checkpoint[0]
                 )
-                mutation_tests.append(run_mutation_test_response)
+            else: covered.append(mutant)
+
+        responses = self._test_covered(request, covered, tests)
+        for (_, _, mutation), response in zip(covered, responses):
+            results[id(mutation)] = response
+        return [ results[id(mutation)] for _, _, mutation in mutants ]
+
+    def _tests_of(self, request: MutateRandomlyRequest, mutation: Mutation) -> Set[str]:
+        if request.options.coverage_map is None or request.localised_cfg is None:
+            return None
+        location = request.localised_cfg.location_of(mutation.node)
+        if location is None:
+            return None
+        return request.options.coverage_map.tests_of([ location ])
+
+    def _test_covered(
+        self,
+        request: MutateRandomlyRequest,
+        mutants: List[Tuple[int, int, Mutation]],
+        tests: Dict[int, Set[str]],
+    ) -> List[RunMutationTestResponse]:
+        if request.options.work_queue is not None:
+            return self._test_queued(request, mutants, tests)
+        if not request.options.schemata:
+            return self._test_all(request, mutants, None, tests)
+
+        # Mutants selectable at runtime are built once per schemata,
+        #   the rest (or all of a schemata which fails to build)
+        #   are built one at a time
+        schematas, unsupported = MutantSchemataFactory(request.parser).create(
+            request.tree, [ mutation for _, _, mutation in mutants ]
+        )
+        unsupported_ids = set(id(mutation) for mutation in unsupported)
+        remaining = [ mutant for mutant in mutants if id(mutant[2]) in unsupported_ids ]
+
+        results: Dict[int, RunMutationTestResponse] = dict()
+        for schemata in schematas:
+            schemata_mutants = [ mutant for mutant in mutants if mutant[2] in schemata ]
+            if not self._build(request, schemata):
+                remaining.extend(schemata_mutants)
+                continue
+            # A fork server per workspace, they are stopped before the
+            #   next schemata is built
+            fork_servers: Dict[Workspace, ForkServerRunner] = None
+            if request.options.fork_server:
+                fork_servers = dict()
+            try:
+                responses = self._test_all(request, schemata_mutants, schemata, tests, fork_servers)
+            finally:
+                for fork_server in (fork_servers or dict()).values():
+                    fork_server.close()
+            for (_, _, mutation), response in zip(schemata_mutants, responses):
+                results[id(mutation)] = response
+
+        responses = self._test_all(request, remaining, None, tests)
+        for (_, _, mutation), response in zip(remaining, responses):
+            results[id(mutation)] = response
+
+        return [ results[id(mutation)] for _, _, mutation in mutants ]
+
+    def summarise(self, mutation_tests: List[RunMutationTestResponse]) -> MutateRandomlyResponse:
+        amount_killed = 0
+        amount_survived = 0
+        for run_mutation_test_response in mutation_tests:
+            # Equivalent, duplicate and uncovered mutants are neither, a mutant
+            #   which makes the tests time out is killed
+            state = run_mutation_test_response.state
+            if state in [ MutantState.KILLED, MutantState.TIMEOUT ]:
+                amount_killed += 1
+            elif state is MutantState.SURVIVED:
+                amount_survived += 1
 
-                summary = run_mutation_test_response.test_results.summary
-                if summary.failure_count > 0:
-                    amount_killed += 1
-                else: amount_survived += 1
-        
         return MutateRandomlyResponse(
             amount_killed,
             amount_survived,
             mutation_tests
         )
+
+    def _test_all(
+        self,
+        request: MutateRandomlyRequest,
+        mutants: List[Tuple[int, int, Mutation]],
+        schemata: MutantSchemata,
+        tests: Dict[int, Set[str]],
+        fork_servers: Dict[Workspace, ForkServerRunner] = None,
+    ) -> List[RunMutationTestResponse]:
+        # In parallel if we have workspaces
+        if request.options.workspaces is None:
+            return [
+                self._test(None, request, c_idx, m_idx, mutation, schemata, tests[id(mutation)], fork_servers)
+                    for c_idx, m_idx, mutation in mutants
+            ]
+        futures = [
+            request.options.workspaces.submit(
+                self._test, request, c_idx, m_idx, mutation, schemata, tests[id(mutation)], fork_servers
+            ) for c_idx, m_idx, mutation in mutants
+        ]
+        return [ future.result() for future in futures ]
+
+    def _test_queued(
+        self,
+        request: MutateRandomlyRequest,
+        mutants: List[Tuple[int, int, Mutation]],
+        tests: Dict[int, Set[str]],
+    ) -> List[RunMutationTestResponse]:
+        # Step 1: Publish the mutants which are not cached, a job only
+        #   holds the edit of the instrumented source in the queue
+        work_queue = request.options.work_queue
+        source = request.tree.source
+        digest = work_queue.put_source(source)
+        file = os.path.relpath(request.full_file_path, request.base)
+        results: Dict[int, RunMutationTestResponse] = dict()
+        keys: Dict[int, str] = dict()
+        jobs: Dict[int, int] = dict()
+        for _, _, mutation in mutants:
+            edit = mutation.edit
+            if request.options.result_cache is not None:
+                keys[id(mutation)] = request.options.result_cache.key(edit.apply_to(source))
+                test_results = request.options.result_cache.get(keys[id(mutation)])
+                if test_results is not None:
+                    results[id(mutation)] = self._record(request, self._of_unit(
+                        request, RunMutationTestResponse(mutation.node, mutation, test_results, cached=True)
+                    ))
+                    continue
+            jobs[id(mutation)] = work_queue.put(MutantJob(
+                file,
+                digest,
+                edit.start_byte,
+                edit.old_end_byte,
+                edit.replacement,
+                self._env(request, tests[id(mutation)]),
+                request.options.abort_on_failure,
+                request.options.build_timeout,
+                request.options.test_timeout,
+                request.options.binary_trace,
+            ))
+
+        # Step 2: Wait for the workers, the jobs of crashed workers are
+        #   handed to the others
+        done = work_queue.wait(jobs.values())
+        for _, _, mutation in mutants:
+            if id(mutation) not in jobs:
+                continue
+            test_results, timed_out, build_failed = done[jobs[id(mutation)]]
+            state: MutantState = None
+            if timed_out: state = MutantState.TIMEOUT
+            elif build_failed: state = MutantState.BUILD_FAILED
+            response = RunMutationTestResponse(
+                mutation.node,
+                mutation,
+                test_results,
+                state=state,
+            )
+            if id(mutation) in keys and \
+                response.state in [ MutantState.KILLED, MutantState.SURVIVED ]:
+                request.options.result_cache.put(keys[id(mutation)], test_results)
+            results[id(mutation)] = self._record(request, self._of_unit(request, response))
+
+        return [ results[id(mutation)] for _, _, mutation in mutants ]
+
+    def _build(self, request: MutateRandomlyRequest, schemata: MutantSchemata) -> bool:
+        if request.options.workspaces is None:
+            return self._build_in(None, request, schemata)
+        return all(request.options.workspaces.each(self._build_in, request, schemata))
+
+    def _build_in(
+        self,
+        workspace: Workspace,
+        request: MutateRandomlyRequest,
+        schemata: MutantSchemata,
+    ) -> bool:
+        full_file_path = request.full_file_path
+        build_command = request.build_command
+        incremental_build = request.options.incremental_build
+        cwd = None
+        if workspace is not None:
+            full_file_path = workspace.path(full_file_path)
+            build_command = workspace.command(build_command)
+            cwd = workspace.cwd
+            if incremental_build is not None:
+                incremental_build = incremental_build.translate(workspace.path)
+        build_response = BuildMutantSchemataUseCase().do(
+            BuildMutantSchemataRequest(
+                schemata, full_file_path, build_command, cwd, incremental_build,
+                request.options.build_timeout,
+            )
+        )
+        return build_response.built
+
+    def _test(
+        self,
+        workspace: Workspace,
+        request: MutateRandomlyRequest,
+        c_idx: int,
+        m_idx: int,
+        mutation: Mutation,
+        schemata: MutantSchemata = None,
+        tests: Set[str] = None,
+        fork_servers: Dict[Workspace, ForkServerRunner] = None,
+    ) -> RunMutationTestResponse:
+        # Kept in the out directory of the base, the copies of it in the
+        #   workspaces are removed with them
+        test_results_path = f'{request.base}/{request.out}/mutant_{c_idx}_{m_idx}_test_results.txt'
+        full_file_path = request.full_file_path
+        build_command = request.build_command
+        test_command = request.test_command
+        incremental_build = request.options.incremental_build
+        cwd = None
+        if workspace is not None:
+            full_file_path = workspace.path(full_file_path)
+            build_command = workspace.command(build_command)
+            test_command = workspace.command(test_command)
+            cwd = workspace.cwd
+            if incremental_build is not None:
+                incremental_build = incremental_build.translate(workspace.path)
+
+        env = self._env(request, tests)
+
+        # A workspace only tests one mutant at a time, so it can keep
+        #   its fork server to itself
+        fork_server: ForkServerRunner = None
+        if fork_servers is not None:
+            fork_server = fork_servers.get(workspace, None)
+            if fork_server is None:
+                fork_server = fork_servers.setdefault(
+                    workspace, ForkServerRunner(test_command, cwd)
+                )
+
+        run_mutation_test_request = RunMutationTestRequest(
+            mutation,
+            full_file_path,
+            RunTestRequest(
+                build_command,
+                test_command,
+                test_results_path if request.options.keep_test_results else None,
+                cwd,
+                env,
+                incremental_build=incremental_build,
+                results_parser=request.test_results_parser,
+                abort_on_failure=request.options.abort_on_failure,
+                build_timeout=request.options.build_timeout,
+                test_timeout=request.options.test_timeout,
+                fork_server=fork_server,
+                binary_trace=request.options.binary_trace,
+            ),
+            None,
+            schemata,
+            request.options.result_cache,
+            request.options.deduplicator,
+        )
+        return self._record(request, self._of_unit(
+            request, RunMutationTestUseCase().do(run_mutation_test_request)
+        ))
+
+    def _checkpoint_key(self, request: MutateRandomlyRequest, mutation: Mutation) -> str:
+        edit = mutation.edit
+        return request.options.checkpoint_journal.key(
+            os.path.relpath(request.full_file_path, request.base),
+            request.tree.source,
+            edit.start_byte,
+            edit.old_end_byte,
+            str(mutation),
+        )
+
+    def _checkpoint(
+        self,
+        request: MutateRandomlyRequest,
+        mutation: Mutation,
+    ) -> Tuple[MutantState, TestResults]:
+        # None if the mutant has not been tested before
+        if request.options.checkpoint_journal is None:
+            return None
+        return request.options.checkpoint_journal.get(self._checkpoint_key(request, mutation))
+
+    def _record(
+        self,
+        request: MutateRandomlyRequest,
+        run_mutation_test_response: RunMutationTestResponse,
+    ) -> RunMutationTestResponse:
+        # Recorded as soon as it is tested, such that it is not lost
+        #   if the analysis is interrupted
+        if request.options.checkpoint_journal is None:
+            return run_mutation_test_response
+        mutation = run_mutation_test_response.mutation
+        edit = mutation.edit
+        request.options.checkpoint_journal.put(
+            self._checkpoint_key(request, mutation),
+            os.path.relpath(request.full_file_path, request.base),
+            edit.start_byte,
+            edit.old_end_byte,
+            str(mutation),
+            run_mutation_test_response.state,
+            run_mutation_test_response.test_results,
+        )
+        return run_mutation_test_response
+
+    def _env(self, request: MutateRandomlyRequest, tests: Set[str]) -> Dict[str, str]:
+        # Only the tests which can observe the mutant are run, if the
+        #   testing backend is able to select them
+        env: Dict[str, str] = None
+        if tests is not None:
+            env = request.test_results_parser.test_filter(tests)
+        if request.options.coverage_counts:
+            env = { **(env or dict()), CANARY_COVERAGE: "1" }
+        return env
+
+    def _of_unit(
+        self,
+        request: MutateRandomlyRequest,
+        run_mutation_test_response: RunMutationTestResponse,
+    ) -> RunMutationTestResponse:
+        # Leaves the locations of other units out of the trace of the mutant
+        test_results = run_mutation_test_response.test_results
+        if not request.options.other_units or test_results is None or \
+            test_results.trace is None:
+            return run_mutation_test_response
+        return RunMutationTestResponse(
+            run_mutation_test_response.candidate,
+            run_mutation_test_response.mutation,
+            TestResults(
+                test_results.summary,
+                test_results.trace.at_locations(request.localised_cfg.locations),
+            ),
+            run_mutation_test_response.cached,
+            run_mutation_test_response.state,
+            run_mutation_test_response.build_duration,
+            run_mutation_test_response.test_duration,
+        )
@@ -0,0 +1,131 @@
+from checkpoint import CheckpointJournal
+from incremental_build import IncrementalBuild
+from instrumentation_trace import CoverageMap
+from result_cache import ResultCache, MutantDeduplicator
+from work_queue import WorkQueue
+from workspace import WorkspacePool
+from .run_subprocess import DEFAULT_TIMEOUT
+
+# How the mutants of a unit are built and tested, shared by the requests
+#   which mutate it. Every option is off unless it is given
+class MutationTestOptions:
+    def __init__(
+        self,
+        workspaces: WorkspacePool = None,
+        schemata: bool = False,
+        incremental_build: IncrementalBuild = None,
+        keep_test_results: bool = False,
+        result_cache: ResultCache = None,
+        deduplicator: MutantDeduplicator = None,
+        abort_on_failure: bool = False,
+        build_timeout: float = DEFAULT_TIMEOUT,
+        test_timeout: float = DEFAULT_TIMEOUT,
+        coverage_map: CoverageMap = None,
+        fork_server: bool = False,
+        binary_trace: bool = False,
+        coverage_counts: bool = False,
+        other_units: bool = False,
+        work_queue: WorkQueue = None,
+        checkpoint_journal: CheckpointJournal = None,
+    ) -> None:
+        self._workspaces = workspaces
+        self._schemata = schemata
+        self._incremental_build = incremental_build
+        self._keep_test_results = keep_test_results
+        self._result_cache = result_cache
+        self._deduplicator = deduplicator
+        self._abort_on_failure = abort_on_failure
+        self._build_timeout = build_timeout
+        self._test_timeout = test_timeout
+        self._coverage_map = coverage_map
+        self._fork_server = fork_server
+        self._binary_trace = binary_trace
+        self._coverage_counts = coverage_counts
+        self._other_units = other_units
+        self._work_queue = work_queue
+        self._checkpoint_journal = checkpoint_journal
+
+    @property
+    def workspaces(self) -> WorkspacePool:
+        return self._workspaces
+
+    @property
+    def schemata(self) -> bool:
+        return self._schemata
+
+    @property
+    def incremental_build(self) -> IncrementalBuild:
+        return self._incremental_build
+
+    @property
+    def keep_test_results(self) -> bool:
+        # The test output is parsed as it is produced, and only written
+        #   to "out" if it has to be kept
+        return self._keep_test_results
+
+    @property
+    def result_cache(self) -> ResultCache:
+        # None if every mutant has to be built and tested
+        return self._result_cache
+
+    @property
+    def deduplicator(self) -> MutantDeduplicator:
+        # None if identical mutants are tested as well
+        return self._deduplicator
+
+    @property
+    def abort_on_failure(self) -> bool:
+        # Whether the tests of a mutant are stopped at the first failure,
+        #   which leaves the traces of killed mutants incomplete
+        return self._abort_on_failure
+
+    @property
+    def build_timeout(self) -> float:
+        # Seconds a mutant may take to build, None if there is no limit
+        return self._build_timeout
+
+    @property
+    def test_timeout(self) -> float:
+        # Seconds the tests of a mutant may take, before it is a timeout
+        return self._test_timeout
+
+    @property
+    def coverage_map(self) -> CoverageMap:
+        # The tests which visit each location of the original program,
+        #   None if every mutant is tested by all tests
+        return self._coverage_map
+
+    @property
+    def fork_server(self) -> bool:
+        # Whether the mutants of a schemata are forked from a test program
+        #   which is started once, instead of starting it for every mutant
+        return self._fork_server
+
+    @property
+    def binary_trace(self) -> bool:
+        # Whether the tests write their trace to a file of its own,
+        #   instead of to stdout
+        return self._binary_trace
+
+    @property
+    def coverage_counts(self) -> bool:
+        # Whether the tests of the mutants only count the visits of each
+        #   location, instead of tracing every visit
+        return self._coverage_counts
+
+    @property
+    def other_units(self) -> bool:
+        # Whether the program also traces the locations of other units,
+        #   which are left out of the traces of the mutants
+        return self._other_units
+
+    @property
+    def work_queue(self) -> WorkQueue:
+        # If set, the mutants are tested by the workers of the queue
+        return self._work_queue
+
+    @property
+    def checkpoint_journal(self) -> CheckpointJournal:
+        # If set, every tested mutant is recorded in it, and those
+        #   already in it are not tested again
+        return self._checkpoint_journal
@@ -1,9 +1,9 @@
-from os import linesep, remove
-from time import sleep
+from os import remove
 from test_results_parsing import (
     TestResults,
     CuTestResultsParser,
-    ResultsParser
+    ResultsParser,
+    read_lines,
 )
 from .use_case import *
 
@@ -42,9 +42,8 @@ class ParseTestResultUseCase(
 ):  
     def do(self, request: ParseTestResultRequest) -> ParseTestResultResponse:
         file = open(request.file_path, "r", errors="replace")
-        contents: str = file.read()
-        lines = contents.split(linesep)
-        test_results = request.parser.parse(lines)
+        test_results = request.parser.parse(read_lines(file))
+        file.close()
 
         remove(request.file_path)
 
@@ -1,10 +1,15 @@
-from typing import Dict
-from mutator import Mutation
+from typing import Any, Dict
+from concurrent.futures import Future
+from incremental_build import IncrementalBuild
+from instrumentation_trace import Coverage
+from mutator import Mutation, MutantSchemata, MutantState, CANARY_MUTANT_ID
+from result_cache import ResultCache, MutantDeduplicator
 from test_results_parsing import TestResults
-from ts import Node
+from ts import Node, Tree
 from .use_case import UseCaseRequest, UseCaseResponse, UseCase
-from .run_test import RunTestRequest, RunTestUseCase
+from .run_test import RunTestRequest, RunTestResponse, RunTestUseCase
 from .parse_test_result import ParseTestResultRequest, ParseTestResultUseCase
+from .build_incrementally import BuildIncrementallyRequest, BuildIncrementallyUseCase
 
 class RunMutationTestRequest(UseCaseRequest):
     def __init__(
@@ -13,11 +18,17 @@ class RunMutationTestRequest(UseCaseRequest):
         file_path: str,
         run_test_request: RunTestRequest,
         parse_test_results_request: ParseTestResultRequest,
+        schemata: MutantSchemata = None,
+        result_cache: ResultCache = None,
+        deduplicator: MutantDeduplicator = None,
     ) -> None:
         self._mutation = mutation
         self._file_path = file_path
         self._run_test_request = run_test_request
         self._parse_test_results_request = parse_test_results_request
+        self._schemata = schemata
+        self._result_cache = result_cache
+        self._deduplicator = deduplicator
         super().__init__()
 
     @property
@@ -36,16 +47,36 @@ class RunMutationTestRequest(UseCaseRequest):
     def parse_test_results_request(self) -> ParseTestResultRequest:
         return self._parse_test_results_request
 
+    @property
+    def schemata(self) -> MutantSchemata:
+        return self._schemata
+
+    @property
+    def result_cache(self) -> ResultCache:
+        return self._result_cache
+
+    @property
+    def deduplicator(self) -> MutantDeduplicator:
+        return self._deduplicator
+
 class RunMutationTestResponse(UseCaseResponse):
     def __init__(
         self,
         candidate: Node,
         mutation: Mutation,
-        test_results: TestResults
+        test_results: TestResults,
+        cached: bool = False,
+        state: MutantState = None,
+        build_duration: float = None,
+        test_duration: float = None,
     ) -> None:
         self._candidate = candidate
         self._test_results = test_results
         self._mutation = mutation
+        self._cached = cached
+        self._state = state
+        self._build_duration = build_duration
+        self._test_duration = test_duration
         super().__init__()
 
     @property
@@ -59,40 +90,256 @@ class RunMutationTestResponse(UseCaseResponse):
     @property
     def test_results(self) -> TestResults:
         return self._test_results
+
+    @property
+    def cached(self) -> bool:
+        # True if the results are those of an earlier run of the same mutant
+        return self._cached
+
+    @property
+    def state(self) -> MutantState:
+        # Equivalent and duplicate mutants are not tested, the results
+        #   are those of the program they are identical to
+        if self._state is not None:
+            return self._state
+        # Tests which do not get to report their results have crashed
+        if self.test_results is None or \
+            self.test_results.summary.failure_count > 0:
+            return MutantState.KILLED
+        return MutantState.SURVIVED
     
     @property
-    def location_visitations(self) -> Dict[str, int]:
-        visitations: Dict[str, int] = dict()
-        for location in self.test_results.trace.sequence:
-            if location.id not in visitations:
-                visitations[location.id] = 0
-            else: visitations[location.id] += 1
-        return visitations
+    def build_duration(self) -> float:
+        # None if the mutant was not built here, such as when its results
+        #   are those of another program
+        return self._build_duration
+
+    @property
+    def test_duration(self) -> float:
+        return self._test_duration
+
+    @property
+    def location_visitations(self) -> Coverage:
+        if self.test_results is None or self.test_results.trace is None:
+            return Coverage()
+        return self.test_results.trace.coverage
 
 class RunMutationTestUseCase(
     UseCase[RunMutationTestRequest, RunMutationTestResponse]
 ):
     def do(self, request: RunMutationTestRequest) -> RunMutationTestResponse:
-        # Step 1: Create the mutated tree
-        mutated_tree = request.mutation.apply()
+        # Step 1: Create the mutated tree, a schemata is already built so
+        #   it is only needed to look the mutant up
+        mutated_tree: Tree = None
+        if request.schemata is None or request.result_cache is not None or \
+            request.deduplicator is not None:
+            mutated_tree = request.mutation.apply()
+
+        # Step 2: Skip mutants with the same text as the original program
+        #   or as a mutant which is already tested
+        deduplicator = request.deduplicator
+        claim: "Future[RunMutationTestResponse]" = None
+        if deduplicator is not None:
+            digest = deduplicator.digest(mutated_tree.source)
+            if deduplicator.is_original(digest):
+                return self._identical(request, deduplicator.original_results, MutantState.EQUIVALENT)
+            claim = Future()
+            claimed = deduplicator.claim(digest, claim)
+            if claimed is not claim:
+                return self._duplicate(request, claimed.result())
+
+        # Step 3: Test the mutant, the identical mutants share its outcome
+        try:
+            response = self._do_mutant(request, mutated_tree, claim)
+        except BaseException as excep:
+            if claim is not None: claim.set_exception(excep)
+            raise
+        if claim is not None: claim.set_result(response)
+        return response
+
+    def profile_args(self, request: RunMutationTestRequest) -> Dict[str, Any]:
+        # The phases of the mutants are told apart by their mutation
+        return {
+            "file": request.file_path,
+            "start_point": list(request.mutation.node.start_point),
+            "mutation": str(request.mutation),
+        }
 
-        # Step 2: Write the mutated tree to file
+    def _do_mutant(
+        self,
+        request: RunMutationTestRequest,
+        mutated_tree: Tree,
+        claim: "Future[RunMutationTestResponse]",
+    ) -> RunMutationTestResponse:
+        # Step 1: Reuse the results of an earlier run of the same mutant
+        key: str = None
+        if request.result_cache is not None:
+            key = request.result_cache.key(mutated_tree.source)
+            test_results = request.result_cache.get(key)
+            if test_results is not None:
+                return RunMutationTestResponse(
+                    request.mutation.node,
+                    request.mutation,
+                    test_results,
+                    cached=True,
+                )
+
+        # Step 2: Test the mutant and remember its results, unless it
+        #   compiled to the same objects as another program
+        if request.schemata is not None:
+            response = self._do_schemata(request)
+        else: response = self._do_file(request, mutated_tree, claim)
+
+        if key is not None and response.state in [ MutantState.KILLED, MutantState.SURVIVED ]:
+            request.result_cache.put(key, response.test_results)
+        return response
+
+    def _do_file(
+        self,
+        request: RunMutationTestRequest,
+        mutated_tree: Tree,
+        claim: "Future[RunMutationTestResponse]",
+    ) -> RunMutationTestResponse:
+        # Step 1: Write the mutated tree to file
         file = open(request.file_path, "w+")
         file.write(mutated_tree.text)
         file.close()
 
+        # Step 2: Compile the mutant, and skip it if the objects are
+        #   identical to the original or to those of a tested mutant
+        run_test_request = request.run_test_request
+        deduplicator = request.deduplicator
+        incremental_build = run_test_request.incremental_build
+        if deduplicator is not None and deduplicator.compiler_equivalence and \
+            incremental_build is not None:
+            compile_response = BuildIncrementallyUseCase().do(
+                BuildIncrementallyRequest(
+                    IncrementalBuild(incremental_build.compile_commands, list()),
+                    None,
+                    timeout=run_test_request.build_timeout,
+                )
+            )
+            if not compile_response.built:
+                return RunMutationTestResponse(
+                    request.mutation.node,
+                    request.mutation,
+                    None,
+                    state=MutantState.TIMEOUT if compile_response.timed_out else MutantState.BUILD_FAILED,
+                )
+            digest = incremental_build.object_digest()
+            if digest is not None:
+                if deduplicator.is_original(digest):
+                    return self._identical(request, deduplicator.original_results, MutantState.EQUIVALENT)
+                claimed = deduplicator.claim(digest, claim)
+                if claimed is not claim:
+                    return self._duplicate(request, claimed.result())
+
+                # The objects are compiled, they only have to be linked
+                run_test_request = RunTestRequest(
+                    run_test_request.build_command,
+                    run_test_request.test_command,
+                    run_test_request.out,
+                    run_test_request.cwd,
+                    run_test_request.env,
+                    IncrementalBuild(list(), incremental_build.link_commands),
+                    run_test_request.results_parser,
+                    run_test_request.abort_on_failure,
+                    run_test_request.build_timeout,
+                    run_test_request.test_timeout,
+                    run_test_request.fork_server,
+                    run_test_request.binary_trace,
+                )
+
         # Step 3: Run tests
-        RunTestUseCase().do(
-            request.run_test_request
-        )
+        run_test_response = RunTestUseCase().do(run_test_request)
 
         # Step 4: Analyse the test results
-        parse_test_results_response = ParseTestResultUseCase().do(
-            request.parse_test_results_request
+        return RunMutationTestResponse(
+            request.mutation.node,
+            request.mutation,
+            self._test_results(request, run_test_response),
+            state=self._mutant_state(run_test_response),
+            build_duration=run_test_response.build_duration,
+            test_duration=run_test_response.test_duration,
         )
 
+    def _identical(
+        self,
+        request: RunMutationTestRequest,
+        test_results: TestResults,
+        state: MutantState,
+    ) -> RunMutationTestResponse:
         return RunMutationTestResponse(
             request.mutation.node,
             request.mutation,
-            parse_test_results_response.test_results,
+            test_results,
+            state=state,
         )
+
+    def _duplicate(
+        self,
+        request: RunMutationTestRequest,
+        twin: RunMutationTestResponse,
+    ) -> RunMutationTestResponse:
+        # A duplicate of a mutant which was not tested, because it timed out,
+        #   did not build or is equivalent, is not tested either
+        state = twin.state
+        if state in [ MutantState.KILLED, MutantState.SURVIVED ]:
+            state = MutantState.DUPLICATE
+        return self._identical(request, twin.test_results, state)
+
+    def _do_schemata(self, request: RunMutationTestRequest) -> RunMutationTestResponse:
+        # Step 1: Run tests, the schemata is already built so the mutant
+        #   is only selected through the environment
+        run_test_request = request.run_test_request
+        run_test_response = RunTestUseCase().do(
+            RunTestRequest(
+                None,
+                run_test_request.test_command,
+                run_test_request.out,
+                run_test_request.cwd,
+                {
+                    **(run_test_request.env or dict()),
+                    CANARY_MUTANT_ID: str(request.schemata.identifier(request.mutation)),
+                },
+                results_parser=run_test_request.results_parser,
+                abort_on_failure=run_test_request.abort_on_failure,
+                test_timeout=run_test_request.test_timeout,
+                fork_server=run_test_request.fork_server,
+                binary_trace=run_test_request.binary_trace,
+            )
+        )
+
+        # Step 2: Analyse the test results
+        return RunMutationTestResponse(
+            request.mutation.node,
+            request.mutation,
+            self._test_results(request, run_test_response),
+            state=self._mutant_state(run_test_response),
+            build_duration=run_test_response.build_duration,
+            test_duration=run_test_response.test_duration,
+        )
+
+    def _mutant_state(self, run_test_response: RunTestResponse) -> MutantState:
+        # A mutant whose build runs out of time is a timeout as well,
+        #   otherwise the state follows from the test results
+        if run_test_response.timed_out or run_test_response.build_timed_out:
+            return MutantState.TIMEOUT
+        if run_test_response.build_failed:
+            return MutantState.BUILD_FAILED
+        return None
+
+    def _test_results(
+        self,
+        request: RunMutationTestRequest,
+        run_test_response: RunTestResponse,
+    ) -> TestResults:
+        # Parsed while the tests ran, otherwise they are read from the output
+        #   file. There are none if the mutant was not built
+        if run_test_response.build_failed:
+            return None
+        if request.run_test_request.results_parser is not None:
+            return run_test_response.test_results
+        return ParseTestResultUseCase().do(
+            request.parse_test_results_request
+        ).test_results
@@ -1,18 +1,25 @@
+import os
+import shlex
 import subprocess
-from typing import IO, Any
+from typing import IO, Any, Dict
 from .use_case import *
 
+# Seconds a command may run, unless the request says otherwise
+DEFAULT_TIMEOUT = 10
+
 class RunSubsystemRequest(UseCaseRequest):
     def __init__(
         self,
         command: str,
         input: Any = None,
         capture_output: bool = False,
-        timeout: int = None,
+        timeout: float = DEFAULT_TIMEOUT,
         check: bool = False,
         stdin: IO[Any] = None,
         stdout: IO[Any] = None,
         stderr: IO[Any] = None,
+        cwd: str = None,
+        env: Dict[str, str] = None,
     ) -> None:
         self._command = command
         self._input = input
@@ -22,6 +29,8 @@ class RunSubsystemRequest(UseCaseRequest):
         self._stdin = stdin
         self._stdout = stdout
         self._stderr = stderr
+        self._cwd = cwd
+        self._env = env
         super().__init__()
 
     @property
@@ -37,7 +46,8 @@ class RunSubsystemRequest(UseCaseRequest):
         return self._capture_output
 
     @property
-    def timeout(self) -> int:
+    def timeout(self) -> float:
+        # None if the command may run for as long as it takes
         return self._timeout
 
     @property
@@ -56,17 +66,55 @@ class RunSubsystemRequest(UseCaseRequest):
     def stderr(self) -> IO[Any]:
         return self._stderr
 
-class RunSubsystemResponse(UseCaseResponse): pass
+    @property
+    def cwd(self) -> str:
+        return self._cwd
+
+    @property
+    def env(self) -> Dict[str, str]:
+        return self._env
+
+class RunSubsystemResponse(UseCaseResponse):
+    def __init__(self, returncode: int, stdout: str = None, timed_out: bool = False) -> None:
+        self._returncode = returncode
+        self._stdout = stdout
+        self._timed_out = timed_out
+        super().__init__()
+
+    @property
+    def returncode(self) -> int:
+        # None if the command timed out
+        return self._returncode
+
+    @property
+    def timed_out(self) -> bool:
+        return self._timed_out
+
+    @property
+    def stdout(self) -> str:
+        return self._stdout
 
 class RunSubsystemUseCase(
     UseCase[RunSubsystemRequest, RunSubsystemResponse]
 ):
     def do(self, request: RunSubsystemRequest) -> RunSubsystemResponse:
-        subprocess.run(
-            # If we dont split it will attempt to open it as a file
-            request.command.split(),
-            stdout=request.stdout,
-            stderr=request.stderr,
-            timeout=10
-        )
-        return RunSubsystemResponse()
+        env = None
+        if request.env is not None:
+            env = { **os.environ, **request.env }
+        try:
+            completed_process = subprocess.run(
+                # If we dont split it will attempt to open it as a file
+                shlex.split(request.command),
+                stdout=request.stdout,
+                stderr=request.stderr,
+                cwd=request.cwd,
+                env=env,
+                timeout=request.timeout
+            )
+        except subprocess.TimeoutExpired:
+            # The command is killed, which is up to the caller to handle
+            return RunSubsystemResponse(None, timed_out=True)
+        stdout = completed_process.stdout
+        if isinstance(stdout, bytes):
+            stdout = stdout.decode("utf-8", errors="replace")
+        return RunSubsystemResponse(completed_process.returncode, stdout)
@@ -1,6 +1,18 @@
-from typing import IO, Any, Union
+import os
+import shlex
+import signal
+import tempfile
+import threading
+import time
+from typing import IO, Any, Dict, Iterator, Tuple, Union
+from fork_server import ForkServerRunner
+from incremental_build import IncrementalBuild
+from instrumentation_trace import BinaryTraceParser, CANARY_TRACE_FILE
+from profiling import PROFILER
+from test_results_parsing import ResultsParser, TestResults, read_lines
 from .use_case import *
 from .run_subprocess import *
+from .build_incrementally import BuildIncrementallyRequest, BuildIncrementallyUseCase
 
 class RunTestRequest(UseCaseRequest):
     def __init__(
@@ -8,10 +20,28 @@ class RunTestRequest(UseCaseRequest):
         build_command: str,
         test_command: str,
         out: Union[str, IO[Any]] = None,
+        cwd: str = None,
+        env: Dict[str, str] = None,
+        incremental_build: IncrementalBuild = None,
+        results_parser: ResultsParser = None,
+        abort_on_failure: bool = False,
+        build_timeout: float = DEFAULT_TIMEOUT,
+        test_timeout: float = DEFAULT_TIMEOUT,
+        fork_server: ForkServerRunner = None,
+        binary_trace: bool = False,
     ) -> None:
         self._build_command = build_command
         self._test_command = test_command
         self._out = out
+        self._cwd = cwd
+        self._env = env
+        self._incremental_build = incremental_build
+        self._results_parser = results_parser
+        self._abort_on_failure = abort_on_failure
+        self._build_timeout = build_timeout
+        self._test_timeout = test_timeout
+        self._fork_server = fork_server
+        self._binary_trace = binary_trace
         super().__init__()
 
     @property
@@ -26,7 +56,99 @@ class RunTestRequest(UseCaseRequest):
     def out(self) -> Union[str, IO[Any]]:
         return self._out
 
-class RunTestResponse(UseCaseResponse): pass
+    @property
+    def cwd(self) -> str:
+        return self._cwd
+
+    @property
+    def env(self) -> Dict[str, str]:
+        return self._env
+
+    @property
+    def incremental_build(self) -> IncrementalBuild:
+        return self._incremental_build
+
+    @property
+    def results_parser(self) -> ResultsParser:
+        # If set, the output is parsed while the tests run and "out"
+        #   only receives a copy of it, which may be None
+        return self._results_parser
+
+    @property
+    def abort_on_failure(self) -> bool:
+        # If set, the tests are killed as soon as the results parser
+        #   finds a failure, leaving the trace up to it
+        return self._abort_on_failure
+
+    @property
+    def build_timeout(self) -> float:
+        # Seconds, None if there is no limit
+        return self._build_timeout
+
+    @property
+    def test_timeout(self) -> float:
+        # Seconds, None if there is no limit
+        return self._test_timeout
+
+    @property
+    def fork_server(self) -> ForkServerRunner:
+        # If set, the tests are forked from the already running test
+        #   program, which is only done if the output is parsed
+        return self._fork_server
+
+    @property
+    def binary_trace(self) -> bool:
+        # If set, the tests write their trace to a file of its own instead
+        #   of to stdout, which is only done if the output is parsed
+        return self._binary_trace
+
+class RunTestResponse(UseCaseResponse):
+    def __init__(
+        self,
+        test_results: TestResults = None,
+        timed_out: bool = False,
+        build_duration: float = None,
+        test_duration: float = None,
+        build_failed: bool = False,
+        build_timed_out: bool = False,
+    ) -> None:
+        self._test_results = test_results
+        self._timed_out = timed_out
+        self._build_duration = build_duration
+        self._test_duration = test_duration
+        self._build_failed = build_failed
+        self._build_timed_out = build_timed_out
+        super().__init__()
+
+    @property
+    def test_results(self) -> TestResults:
+        # Only parsed if the request had a results parser
+        return self._test_results
+
+    @property
+    def timed_out(self) -> bool:
+        # Whether the tests were killed for running out of time
+        return self._timed_out
+
+    @property
+    def build_duration(self) -> float:
+        return self._build_duration
+
+    @property
+    def test_duration(self) -> float:
+        return self._test_duration
+
+    @property
+    def build_failed(self) -> bool:
+        # Whether the build did not succeed, in which case the tests
+        #   are not run, as they would test the program built before
+        return self._build_failed
+
+    @property
+    def build_timed_out(self) -> bool:
+        # Whether the build was killed for running out of time, in which
+        #   case it failed as well
+        return self._build_timed_out
 
 class RunTestUseCase(
     UseCase[RunTestRequest, RunTestResponse]
@@ -37,22 +159,163 @@ class RunTestUseCase(
             test_output = open(request.out, 'w+')
         else: test_output = request.out
 
-        runner = RunSubsystemUseCase()
-        if request.build_command is not None:
-            build_request = RunSubsystemRequest(
-                request.build_command,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
+        # Step 1: Build the program
+        build_start = time.perf_counter()
+        build_failed = False
+        build_timed_out = False
+        with PROFILER.span("build"):
+            runner = RunSubsystemUseCase()
+            if request.incremental_build is not None:
+                build_response = BuildIncrementallyUseCase().do(
+                    BuildIncrementallyRequest(
+                        request.incremental_build,
+                        request.build_command,
+                        request.cwd,
+                        request.build_timeout,
+                    )
+                )
+                build_failed = not build_response.built
+                build_timed_out = build_response.timed_out
+            elif request.build_command is not None:
+                build_request = RunSubsystemRequest(
+                    request.build_command,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    cwd=request.cwd,
+                    timeout=request.build_timeout,
+                )
+                build_response = runner.do(build_request)
+                build_failed = build_response.returncode != 0
+                build_timed_out = build_response.timed_out
+        build_duration = time.perf_counter() - build_start
+
+        # The program on disk is the one built before, so it is not tested
+        if build_failed:
+            if test_output is not None:
+                test_output.close()
+            return RunTestResponse(
+                None, False, build_duration, None, True, build_timed_out
+            )
+
+        # Step 2: Run the tests
+        test_start = time.perf_counter()
+        with PROFILER.span("test"):
+            env = request.env
+            trace_path: str = None
+            if request.results_parser is not None and request.binary_trace:
+                # The file is created by the tests once they trace something
+                handle, trace_path = tempfile.mkstemp(prefix="canary_trace_")
+                os.close(handle)
+                os.remove(trace_path)
+                env = { **(env or dict()), CANARY_TRACE_FILE: trace_path }
+
+            forked: Tuple[TestResults, bool] = None
+            if request.results_parser is not None and request.fork_server is not None:
+                forked = request.fork_server.run(
+                    env,
+                    request.results_parser,
+                    request.abort_on_failure,
+                    request.test_timeout,
+                    test_output,
+                )
+            if request.results_parser is not None:
+                if forked is not None:
+                    test_results, timed_out = forked
+                else: test_results, timed_out = self._stream(request, env, test_output)
+                if test_output is not None:
+                    test_output.close()
+                if trace_path is not None:
+                    test_results = self._binary_trace(test_results, trace_path)
+                return RunTestResponse(
+                    test_results, timed_out, build_duration, time.perf_counter() - test_start
+                )
+
+            test_request = RunSubsystemRequest(
+                request.test_command,
+                stdout=test_output,
+                stderr=test_output,
+                cwd=request.cwd,
+                env=request.env,
+                timeout=request.test_timeout,
+            )
+            test_response = runner.do(test_request)
+
+            test_output.close()
+
+            return RunTestResponse(
+                None, test_response.timed_out, build_duration, time.perf_counter() - test_start
             )
-            runner.do(build_request)
 
-        test_request = RunSubsystemRequest(
-            request.test_command,
-            stdout=test_output,
-            stderr=test_output,
+    def _stream(
+        self,
+        request: RunTestRequest,
+        env: Dict[str, str],
+        test_output: IO[Any],
+    ) -> Tuple[TestResults, bool]:
+        if env is not None:
+            env = { **os.environ, **env }
+        process = subprocess.Popen(
+            shlex.split(request.test_command),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            cwd=request.cwd,
+            env=env,
+            text=True,
+            errors="replace",
+            # The tests may start processes of their own, which are
+            #   killed along with them
+            start_new_session=True,
         )
-        runner.do(test_request)
 
-        test_output.close()
+        # Same limit as a test run writing to a file
+        timed_out = threading.Event()
+        def kill() -> None:
+            timed_out.set()
+            self._kill(process)
+        timer: threading.Timer = None
+        if request.test_timeout is not None:
+            timer = threading.Timer(request.test_timeout, kill)
+            timer.start()
+        try:
+            lines = self._tee(process.stdout, test_output)
+            test_results = request.results_parser.parse(
+                lines, request.abort_on_failure
+            )
+
+            # A failure is all it takes to kill the mutant, the rest
+            #   of the tests need not run
+            if request.abort_on_failure and test_results is not None and \
+                (test_results.summary.failure_count or 0) > 0:
+                self._kill(process)
+
+            # The parser may stop at the summary, the rest of the output
+            #   is still read such that the tests are not blocked by the pipe
+            for _ in lines: pass
+            process.wait()
+        finally:
+            if timer is not None: timer.cancel()
+            process.stdout.close()
+        # The results are those up to the point the tests were killed
+        return test_results, timed_out.is_set()
+
+    def _binary_trace(self, test_results: TestResults, trace_path: str) -> TestResults:
+        # Tests built without the binary trace still write it to stdout
+        trace = BinaryTraceParser().parse_file(trace_path)
+        if trace is None:
+            return test_results
+        os.remove(trace_path)
+        if test_results is None:
+            return None
+        return TestResults(test_results.summary, trace)
+
+    def _kill(self, process: subprocess.Popen) -> None:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
 
-        return RunTestResponse()
+    def _tee(self, stream: IO[str], test_output: IO[Any]) -> Iterator[str]:
+        for line in read_lines(stream):
+            if test_output is not None:
+                test_output.write(line + "\n")
+            yield line
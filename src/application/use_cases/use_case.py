@@ -1,5 +1,7 @@
+import functools
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic
+from typing import Any, Dict, TypeVar, Generic
+from profiling import PROFILER
 
 class UseCaseRequest(ABC): pass
 class UseCaseResponse(ABC): pass
@@ -7,6 +9,25 @@ class UseCaseResponse(ABC): pass
 TRequest = TypeVar("TRequest", bound=UseCaseRequest)
 TResponse = TypeVar("TResponse", bound=UseCaseRequest)
 class UseCase(Generic[TRequest, TResponse], ABC):
+    def __init_subclass__(cls, **kwargs) -> None:
+        # Every use case is a phase of the profiler, named after it
+        super().__init_subclass__(**kwargs)
+        do = cls.__dict__.get("do", None)
+        if do is None or getattr(do, "__isabstractmethod__", False):
+            return
+
+        @functools.wraps(do)
+        def profiled_do(self: "UseCase", request: TRequest) -> TResponse:
+            if not PROFILER.enabled:
+                return do(self, request)
+            with PROFILER.span(type(self).__name__, "use_case", self.profile_args(request)):
+                return do(self, request)
+        cls.do = profiled_do
+
     @abstractmethod
     def do(self, request: TRequest) -> TResponse:
-        pass
\ No newline at end of file
+        pass
+
+    def profile_args(self, _request: TRequest) -> Dict[str, Any]:
+        # What tells the runs of the use case apart in a profile, if anything
+        return None
\ No newline at end of file
@@ -0,0 +1,113 @@
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+# Times stages of the analysis, each run a number of times with the garbage
+#   collector disabled as timeit does, and keeps the results by name such
+#   that they can be stored and compared with those of another commit
+class Benchmark:
+    def __init__(self, repeat: int = 5) -> None:
+        self._repeat = repeat
+        self._results: Dict[str, Dict[str, Any]] = dict()
+
+    @property
+    def repeat(self) -> int:
+        return self._repeat
+
+    @property
+    def results(self) -> Dict[str, Dict[str, Any]]:
+        return self._results
+
+    def measure(
+        self,
+        name: str,
+        stage: Callable[[], Any],
+        items: int = None,
+        setup: Callable[[], Any] = None,
+    ) -> Any:
+        # The setup runs before every run of the stage, outside of the
+        #   timing, and its result is what the stage gets. The items are
+        #   what the stage handles per run, such as lines or units
+        seconds: List[float] = list()
+        result: Any = None
+        for _ in range(self._repeat):
+            argument = setup() if setup is not None else None
+            enabled = gc.isenabled()
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                result = stage(argument) if setup is not None else stage()
+                seconds.append(time.perf_counter() - start)
+            finally:
+                if enabled: gc.enable()
+        self._results[name] = {
+            "seconds": seconds,
+            "min": min(seconds),
+            "median": statistics.median(seconds),
+            "mean": statistics.mean(seconds),
+            "items": items,
+        }
+        return result
+
+    def error(self, name: str, excep: BaseException) -> None:
+        # A stage which fails on an input is kept, such that it shows
+        #   when it starts or stops failing
+        self._results[name] = { "error": f'{type(excep).__name__}: {excep}' }
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "metadata": {
+                "commit": _commit(),
+                "created": datetime.now(timezone.utc).isoformat(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "repeat": self._repeat,
+            },
+            "benchmarks": self._results,
+        }
+
+    def write(self, path: str) -> None:
+        file = open(path, "w+")
+        json.dump(self.to_json(), file, indent=2)
+        file.close()
+
+def compare(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = 0.1,
+    noise: float = 0.001,
+) -> List[Dict[str, Any]]:
+    # The benchmarks of both, by how much slower the fastest run got, as
+    #   the slower runs are slowed down by the rest of the machine. A
+    #   benchmark is a regression if it got slower by more than the
+    #   threshold, and by more seconds than the noise of the timer
+    rows: List[Dict[str, Any]] = list()
+    for name, current in results["benchmarks"].items():
+        earlier = baseline["benchmarks"].get(name, None)
+        if earlier is None or "min" not in earlier or "min" not in current:
+            continue
+        ratio = current["min"] / earlier["min"] if earlier["min"] > 0 else 1.0
+        rows.append({
+            "name": name,
+            "baseline": earlier["min"],
+            "current": current["min"],
+            "ratio": ratio,
+            "regression": ratio > 1.0 + threshold and current["min"] - earlier["min"] > noise,
+        })
+    return rows
+
+def _commit() -> str:
+    # None outside of a git checkout
+    try:
+        return subprocess.run(
+            [ "git", "rev-parse", "HEAD" ],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
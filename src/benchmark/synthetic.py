@@ -0,0 +1,94 @@
+import random
+from typing import Iterator, List, Tuple
+from cfa import LocalisedCFA, LocalisedNode
+
+ARITHMETIC_OPERATORS = [ "+", "-", "*", "^", "|", "&" ]
+RELATIONAL_OPERATORS = [ "<", "<=", ">", ">=", "==", "!=" ]
+
+def synthetic_c_source(functions: int, blocks: int = 8, seed: int = 0) -> str:
+    # A C file of units made of the constructs the instrumentation and the
+    #   mutation operators handle, the same for the same seed
+    generator = random.Random(seed)
+    text = ""
+    for f_idx in range(functions):
+        text += f"int unit_{f_idx}(int a, int b) {{\n"
+        text += "    int result = 0;\n"
+        for _ in range(blocks):
+            text += _block(generator)
+        text += "    return result;\n"
+        text += "}\n\n"
+    return text
+
+def _block(generator: random.Random) -> str:
+    arithmetic = lambda: generator.choice(ARITHMETIC_OPERATORS)
+    relational = lambda: generator.choice(RELATIONAL_OPERATORS)
+    constant = lambda: generator.randint(1, 100)
+    kind = generator.randrange(5)
+    if kind == 0:
+        return (
+            f"    if (result {relational()} {constant()}) {{\n"
+            f"        result = result {arithmetic()} a;\n"
+            f"    }} else {{\n"
+            f"        result = result {arithmetic()} b;\n"
+            f"    }}\n"
+        )
+    if kind == 1:
+        return (
+            f"    for (int i = 0; i {relational()} {constant()}; i++) {{\n"
+            f"        result = result {arithmetic()} i;\n"
+            f"    }}\n"
+        )
+    if kind == 2:
+        return (
+            f"    while (b {relational()} {constant()}) {{\n"
+            f"        b = b {arithmetic()} 1;\n"
+            f"        result = result {arithmetic()} b;\n"
+            f"    }}\n"
+        )
+    if kind == 3:
+        return (
+            f"    switch (a % 3) {{\n"
+            f"        case 0: result = result {arithmetic()} {constant()}; break;\n"
+            f"        case 1: result = result {arithmetic()} {constant()}; break;\n"
+            f"        default: result = result {arithmetic()} a;\n"
+            f"    }}\n"
+        )
+    return f"    result = (a {arithmetic()} b) {arithmetic()} (result {arithmetic()} {constant()});\n"
+
+def random_walk(
+    cfa: LocalisedCFA,
+    generator: random.Random,
+    max_steps: int = 1000,
+) -> Iterator[str]:
+    # The locations of a run of the unit, from its root to one of its
+    #   finals along random edges. Nodes of the same location are one visit
+    current: LocalisedNode = cfa.root
+    location: str = None
+    for _ in range(max_steps):
+        if current.location is not None and current.location != location:
+            location = current.location
+            yield location
+        outgoing = cfa.outgoing(current)
+        if len(outgoing) == 0:
+            return
+        current = generator.choice(outgoing)
+
+def synthetic_trace_lines(
+    units: List[Tuple[str, LocalisedCFA]],
+    lines: int,
+    seed: int = 0,
+) -> List[str]:
+    # The output of tests which each run one of the units, in turn, until
+    #   there are as many lines as asked for
+    generator = random.Random(seed)
+    result: List[str] = list()
+    test = 0
+    while len(result) < lines and len(units) > 0:
+        name, cfa = units[test % len(units)]
+        result.append(f"BeginTest=test_{test}")
+        result.append(f"BeginUnit={name}")
+        result.extend(f"Location={location}" for location in random_walk(cfa, generator))
+        result.append("EndUnit")
+        result.append("EndTest")
+        test += 1
+    return result[:lines] if len(result) > lines else result
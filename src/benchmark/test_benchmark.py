@@ -0,0 +1,120 @@
+import json
+import os
+import random
+import tempfile
+from unittest import TestCase
+from cfa import CCFAFactory
+from decorators import LocationDecorator
+from instrumentation_trace import TraceParser, TraceTreeBuilder
+from instrumentor import CCanaryFactory, CTreeInfestator
+from ts import (
+    CField,
+    LanguageLibrary,
+    Parser,
+)
+from . import *
+
+class TestBenchmark(TestCase):
+    def test_measure(self) -> None:
+        bench = Benchmark(3)
+        result = bench.measure("sum", lambda: sum(range(1000)), 1000)
+        self.assertEqual(result, sum(range(1000)))
+        measured = bench.results["sum"]
+        self.assertEqual(len(measured["seconds"]), 3)
+        self.assertLessEqual(measured["min"], measured["median"])
+        self.assertEqual(measured["items"], 1000)
+
+    def test_measure_setup(self) -> None:
+        bench = Benchmark(2)
+        lists = list()
+        def setup() -> list:
+            lists.append(list(range(10)))
+            return lists[-1]
+        bench.measure("reverse", lambda values: values.reverse(), setup=setup)
+        self.assertEqual([ values[0] for values in lists ], [ 9, 9 ])
+
+    def test_write(self) -> None:
+        bench = Benchmark(1)
+        bench.measure("sum", lambda: sum(range(10)))
+        bench.error("fails", ValueError("else if"))
+        path = os.path.join(tempfile.mkdtemp(), "benchmark.json")
+        bench.write(path)
+
+        file = open(path)
+        written = json.load(file)
+        file.close()
+        self.assertEqual(written["metadata"]["repeat"], 1)
+        self.assertIn("python", written["metadata"])
+        self.assertEqual(written["benchmarks"]["fails"], { "error": "ValueError: else if" })
+        self.assertEqual(len(written["benchmarks"]["sum"]["seconds"]), 1)
+
+    def test_compare(self) -> None:
+        baseline = { "benchmarks": {
+            "parse": { "min": 1.0 },
+            "infect": { "min": 1.0 },
+            "tiny": { "min": 0.00001 },
+            "removed": { "min": 1.0 },
+        } }
+        results = { "benchmarks": {
+            "parse": { "min": 1.05 },
+            "infect": { "min": 1.5 },
+            "tiny": { "min": 0.00005 },
+            "added": { "min": 1.0 },
+            "fails": { "error": "ValueError" },
+        } }
+        rows = { row["name"]: row for row in compare(results, baseline, 0.1) }
+        self.assertEqual(sorted(rows.keys()), [ "infect", "parse", "tiny" ])
+        self.assertFalse(rows["parse"]["regression"])
+        self.assertTrue(rows["infect"]["regression"])
+        self.assertAlmostEqual(rows["infect"]["ratio"], 1.5)
+        # Five times as slow, but within the noise of the timer
+        self.assertFalse(rows["tiny"]["regression"])
+
+class TestSynthetic(TestCase):
+    def setUp(self) -> None:
+        LanguageLibrary.build()
+        self._parser = Parser.c()
+        return super().setUp()
+
+    def test_synthetic_c_source(self) -> None:
+        source = synthetic_c_source(5, seed=1)
+        self.assertEqual(source, synthetic_c_source(5, seed=1))
+        self.assertNotEqual(source, synthetic_c_source(5, seed=2))
+        self.assertNotIn("else if", source)
+        tree = self._parser.parse(source)
+        self.assertFalse(tree.root.has_error)
+        self.assertEqual(source.count("int unit_"), 5)
+
+    def test_synthetic_trace_lines(self) -> None:
+        tree = self._parser.parse(synthetic_c_source(2))
+        definitions = tree.root.named_children
+        cfas = [ CCFAFactory(tree).create(definition.child_by_field(CField.BODY)) for definition in definitions ]
+        instrumented = CTreeInfestator(self._parser, CCanaryFactory()).infect_all(tree, cfas)
+        units = [
+            (f'unit_{d_idx}', LocationDecorator(instrumented).decorate(CCFAFactory(instrumented).create(definition)))
+                for d_idx, definition in enumerate(instrumented.root.named_children)
+                    if definition.type == "function_definition"
+        ]
+
+        lines = synthetic_trace_lines(units, 500)
+        self.assertEqual(len(lines), 500)
+        self.assertEqual(lines[:2], [ "BeginTest=test_0", "BeginUnit=unit_0" ])
+
+        trace_parser = TraceParser(TraceTreeBuilder())
+        self.assertTrue(trace_parser.parse(lines))
+        trace = trace_parser.finish()
+        name, cfa = units[0]
+        self.assertTrue(all(location in cfa.locations for location in trace.in_unit(name).ids))
+        self.assertGreater(len(list(cfa.follow(name, trace))), 0)
+
+    def test_random_walk(self) -> None:
+        tree = self._parser.parse("int unit(int a) { while (a > 0) { a = a - 1; } return a; }")
+        definition = tree.root.named_children[0]
+        cfa = CCFAFactory(tree).create(definition.child_by_field(CField.BODY))
+        instrumented = CTreeInfestator(self._parser, CCanaryFactory()).infect(tree, cfa)
+        localised = LocationDecorator(instrumented).decorate(
+            CCFAFactory(instrumented).create(instrumented.root.named_children[-1])
+        )
+        walk = list(random_walk(localised, random.Random(0)))
+        self.assertEqual(walk[0], localised.root.location)
+        self.assertIn(walk[-1], localised.final_locations)
@@ -1,4 +1,4 @@
-from typing import Dict, Generic, List, Iterable, Tuple
+from typing import Dict, Generic, List, Iterable, Set, Tuple
 from queue import Queue
 from graphviz import Digraph
 
@@ -9,19 +9,25 @@ from ts import Tree
 
 class CFA(Generic[TCFANode]):
     _root: TCFANode
-    _nodes: List[TCFANode]
+    _nodes: Dict[TCFANode, int]
+    _node_list: List[TCFANode]
+    _next_id: int
     _outgoing_edges: Dict[TCFANode, List[CFAEdge[TCFANode]]]
     _ingoing_edges: Dict[TCFANode, List[CFAEdge[TCFANode]]]
     _additional_finals: List[Tuple[TCFANode, str]]
+    _finals: List[Tuple[TCFANode, str]]
 
     def __init__(self, root: TCFANode) -> None:
         self._root = root
-        self._nodes = [ root ]
+        # Maps each node to its id, in the order they were added
+        self._nodes = dict()
+        self._node_list = None
+        self._next_id = 0
         self._outgoing_edges = dict()
-        self._outgoing_edges[root] = list()
         self._ingoing_edges = dict()
-        self._ingoing_edges[root] = list()
         self._additional_finals = list()
+        self._finals = None
+        self._add_node(root)
 
     def __contains__(self, node: TCFANode) -> bool:
         return node in self._nodes
@@ -32,7 +38,11 @@ class CFA(Generic[TCFANode]):
 
     @property
     def nodes(self) -> List[TCFANode]:
-        return self._nodes
+        # A new list is created whenever the nodes change, so a
+        #   list which has been handed out is never modified
+        if self._node_list is None:
+            self._node_list = list(self._nodes)
+        return self._node_list
 
     @property
     def root(self) -> TCFANode:
@@ -40,27 +50,34 @@ class CFA(Generic[TCFANode]):
 
     @property
     def finals(self) -> List[Tuple[TCFANode, str]]:
+        if self._finals is None:
+            self._finals = self._find_finals()
+        return self._finals
+
+    def _find_finals(self) -> List[Tuple[TCFANode, str]]:
         finals: List[Tuple[TCFANode, str]] = list()
         for node_label in self._nodes:
-            if len(self.outgoing_edges(node_label)) is 0:
+            if len(self._outgoing_edges[node_label]) == 0:
                 finals.append((node_label, None))
         for node_label in self._additional_finals:
             if node_label not in finals:
                 finals.append(node_label)
         return finals
 
+    def id_of(self, node: TCFANode) -> int:
+        # The id stays the same for as long as the node is in the CFA
+        return self._nodes.get(node, None)
+
     def add_final(self, final: TCFANode, label: str = None) -> bool:
         if final not in self._nodes: return False
         self._additional_finals.append((final, label))
+        self._changed()
         return True
 
     def outgoing(self, source: TCFANode) -> List[TCFANode]:
         if source not in self._outgoing_edges:
             return list()
-        children: List[TCFANode] = list()
-        for edge in self._outgoing_edges[source]:
-            children.append(edge.destination)
-        return children
+        return [ edge.destination for edge in self._outgoing_edges[source] ]
 
     def outgoing_edges(self, source: TCFANode) -> List[CFAEdge[TCFANode]]:
         if source not in self._nodes:
@@ -70,68 +87,77 @@ class CFA(Generic[TCFANode]):
     def ingoing(self, destination: TCFANode) -> List[TCFANode]:
         if destination not in self._nodes:
             return list()
-        children: List[TCFANode] = list()
-        for edge in self._ingoing_edges[destination]:
-            children.append(edge.source)
-        return children
+        return [ edge.source for edge in self._ingoing_edges[destination] ]
 
     def ingoing_edges(self, source: TCFANode) -> List[CFAEdge[TCFANode]]:
         return self._ingoing_edges[source]
 
+    def _changed(self) -> None:
+        # Drops everything derived from the graph, it is
+        #   computed again the next time it is read
+        self._node_list = None
+        self._finals = None
+
+    def _add_node(self, node: TCFANode) -> None:
+        self._nodes[node] = self._next_id
+        self._next_id += 1
+        self._outgoing_edges[node] = list()
+        self._ingoing_edges[node] = list()
+        self._changed()
+
     def branch(self, source: TCFANode, destination: TCFANode, label: str = None) -> None:
         if source not in self._nodes:
-            self._nodes.append(source)
-            self._outgoing_edges[source] = list()
-            self._ingoing_edges[source] = list()
+            self._add_node(source)
         if destination not in self._nodes:
-            self._nodes.append(destination)
-            self._outgoing_edges[destination] = list()
-            self._ingoing_edges[destination] = list()
+            self._add_node(destination)
 
         edge: CFAEdge[TCFANode] = CFAEdge(source, destination, label)
         self._outgoing_edges[source].append(edge)
         self._ingoing_edges[destination].append(edge)
+        self._changed()
 
     def _remove_edge(self, edge: CFAEdge[TCFANode]) -> None:
         # b -> a
         self._outgoing_edges[edge.source].remove(edge)
         self._ingoing_edges[edge.destination].remove(edge)
+        self._changed()
 
     def remove(self, source: TCFANode) -> None:
         # b -> s -> a
         # b -> a
-        for ingoing in self._ingoing_edges[source]:
-            for outgoing in self._outgoing_edges[source]:
+        for ingoing in list(self._ingoing_edges[source]):
+            for outgoing in list(self._outgoing_edges[source]):
                 self.branch(ingoing.source, outgoing.destination, ingoing.label)
 
-        for node in self._ingoing_edges:
-            for edge in self._ingoing_edges[node]:
-                if edge.source is source or edge.destination is source:
-                    self._remove_edge(edge)
-        
-        for node in self._outgoing_edges:
-            for edge in self._outgoing_edges[node]:
-                if edge.source is source or edge.destination is source:
-                    self._remove_edge(edge)
-
-        self._nodes.remove(source)
+        # Only the edges of the node itself can refer to it
+        removed: Dict[int, CFAEdge[TCFANode]] = dict()
+        for edge in self._ingoing_edges[source] + self._outgoing_edges[source]:
+            removed[id(edge)] = edge
+        for edge in removed.values():
+            self._remove_edge(edge)
+
+        del self._nodes[source]
         del self._ingoing_edges[source]
         del self._outgoing_edges[source]
 
-        for final in self._additional_finals:
-            if final[0] is source: self._additional_finals.remove(final)
+        self._additional_finals = [
+            final for final in self._additional_finals if final[0] is not source
+        ]
+        self._changed()
 
     def replace(self, before: TCFANode, after: TCFANode) -> None:
         for ingoing in self._ingoing_edges[before]:
             ingoing.destination = after
         for outgoing in self._outgoing_edges[before]:
             outgoing.source = after
-        self._nodes.remove(before)
-        self._nodes.append(after)
+        del self._nodes[before]
+        self._nodes[after] = self._next_id
+        self._next_id += 1
         self._ingoing_edges[after] = self._ingoing_edges[before]
         self._outgoing_edges[after] = self._outgoing_edges[before]
         del self._ingoing_edges[before]
         del self._outgoing_edges[before]
+        self._changed()
 
     def _cfa_node_name(self, tree: Tree, cfa_node: CFANode) -> str:
         if cfa_node is None: return f'CFA node is None'
@@ -166,9 +192,9 @@ class CFA(Generic[TCFANode]):
 
     def breadth_first_traverse(self) -> Iterable[TCFANode]:
         queue: Queue[TCFANode] = Queue()
-        visited: List[TCFANode] = list()
+        visited: Set[TCFANode] = set()
         queue.put(self.root)
-        visited.append(self.root)
+        visited.add(self.root)
 
         while not queue.empty():
             current: TCFANode = queue.get()
@@ -176,15 +202,16 @@ class CFA(Generic[TCFANode]):
             for outgoing in self._outgoing_edges[current]:
                 if outgoing.destination not in visited:
                     queue.put(outgoing.destination)
-                    visited.append(outgoing.destination)
+                    visited.add(outgoing.destination)
 
     def all_paths(self) -> List[List[TCFANode]]:
-        visited: List[TCFANode] = list()
+        visited: Set[TCFANode] = set()
         paths: List[List[TCFANode]] = list()
         path: List[TCFANode] = list()
+        finals = self.finals
 
         frontier: List[TCFANode] = self.outgoing(self.root)
-        visited.append(self.root)
+        visited.add(self.root)
 
         while len(frontier) > 0:
             # Step 1: Pop from the "stack"
@@ -199,13 +226,13 @@ class CFA(Generic[TCFANode]):
             path.append(source)
 
             # Step 3: Add path if we are at a final
-            if source in self.finals:
+            if source in finals:
                 paths.append(path)
 
             # Step 4: Add all un-visited neightbours to frontier
             for destination in self.outgoing(source):
                 if destination not in visited:
                     frontier.append(destination)
-                    visited.append(destination)
+                    visited.add(destination)
 
         return paths
\ No newline at end of file
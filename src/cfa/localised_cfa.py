@@ -1,19 +1,75 @@
-from typing import Iterable, List
+from typing import Dict, Iterable, List, Set
 from graphviz import Digraph
-from instrumentation_trace import Trace, Location
-from ts import Tree
+from instrumentation_trace import Trace
+from ts import Node, Tree
 from .cfa import CFA
 from .localised_node import LocalisedNode
 
 class LocalisedCFA(CFA[LocalisedNode]):
+    _final_locations: Set[str]
+    _locations: Set[str]
+    _location_index: Dict[str, List[LocalisedNode]]
+
     def __init__(self, root: LocalisedNode) -> None:
+        self._final_locations = None
+        self._locations = None
+        self._location_index = None
         super().__init__(root)
 
+    @property
+    def final_locations(self) -> Set[str]:
+        if self._final_locations is None:
+            self._final_locations = set(
+                node[0].location for node in self.finals
+            )
+        return self._final_locations
+
+    @property
+    def locations(self) -> Set[str]:
+        if self._locations is None:
+            self._locations = set(
+                node.location for node in self.nodes if node.location is not None
+            )
+        return self._locations
+
+    def nodes_at(self, location: str) -> List[LocalisedNode]:
+        if self._location_index is None:
+            self._location_index = dict()
+            for node in self.nodes:
+                self._location_index.setdefault(node.location, list()).append(node)
+        return self._location_index.get(location, list())
+
+    def location_of(self, node: Node) -> str:
+        # The location of the innermost node containing the node, None
+        #   if no node of the CFA contains it
+        location: str = None
+        length: int = None
+        for cfa_node in self.nodes:
+            outer = cfa_node.node
+            if outer is None or cfa_node.location is None or \
+                outer.start_byte > node.start_byte or outer.end_byte < node.end_byte:
+                continue
+            if length is None or outer.end_byte - outer.start_byte < length:
+                location = cfa_node.location
+                length = outer.end_byte - outer.start_byte
+        return location
+
+    def locations_changed(self) -> None:
+        # The locations are assigned to the nodes after the graph is
+        #   built, so whoever assigns them has to drop the indices
+        self._changed()
+
+    def _changed(self) -> None:
+        super()._changed()
+        self._final_locations = None
+        self._locations = None
+        self._location_index = None
+
     def follow(self, unit_name: str, trace: Trace) -> Iterable[LocalisedNode]:
         if unit_name is not None:
-            locations = [ location.id for location in trace.in_unit(unit_name) ]
+            locations = trace.in_unit(unit_name).ids
         else:
-            locations = [ location.id for location in trace.sequence ]
+            locations = trace.ids
 
         current = self.root
 
@@ -58,17 +114,7 @@ class LocalisedCFA(CFA[LocalisedNode]):
                     found_end = False
 
     def split_on_finals(self, trace: Trace) -> List["Trace"]:
-        finals = [ node[0].location for node in self.finals ]
-        
-        traces: List["Trace"] = list()
-        sequence: List[Location] = list()
-        for curr in trace.sequence:
-            sequence.append(curr)
-            if curr.id in finals:
-                if sequence is not None:
-                    traces.append(Trace(sequence))
-                sequence = list()
-        return traces
+        return trace.split_after(self.final_locations)
 
     def draw_along_paths(
         self,
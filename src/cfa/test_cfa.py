@@ -1,4 +1,5 @@
 from unittest import TestCase
+from ts import Parser, Tree
 from . import *
 
 class TestCFA(TestCase):
@@ -139,4 +140,83 @@ class TestCFA(TestCase):
 
         outgoing: List[CFANode] = cfa.outgoing(root)
         self.assertEqual(len(outgoing), 1)
-        self.assertTrue(node_2 in outgoing)
\ No newline at end of file
+        self.assertTrue(node_2 in outgoing)
+    def test_remove_parallel_edges(self) -> None:
+        root: CFANode = CFANode(None)
+        node_1: CFANode = CFANode(None)
+        node_2: CFANode = CFANode(None)
+        cfa: CFA[CFANode] = CFA(root)
+
+        cfa.branch(root, node_1, "T")
+        cfa.branch(root, node_1, "F")
+        cfa.branch(node_1, node_2)
+        cfa.remove(node_1)
+
+        self.assertFalse(node_1 in cfa)
+        self.assertEqual(cfa.nodes, [ root, node_2 ])
+        self.assertEqual(
+            [ edge.label for edge in cfa.outgoing_edges(root) ], [ "T", "F" ]
+        )
+        self.assertEqual(cfa.ingoing(node_2), [ root, root ])
+
+    def test_node_ids(self) -> None:
+        root: CFANode = CFANode(None)
+        node_1: CFANode = CFANode(None)
+        node_2: CFANode = CFANode(None)
+        cfa: CFA[CFANode] = CFA(root)
+
+        cfa.branch(root, node_1)
+        nodes = cfa.nodes
+        cfa.replace(node_1, node_2)
+
+        self.assertEqual(nodes, [ root, node_1 ])
+        self.assertEqual(cfa.nodes, [ root, node_2 ])
+        self.assertEqual(cfa.id_of(root), 0)
+        self.assertIsNone(cfa.id_of(node_1))
+        self.assertNotEqual(cfa.id_of(node_2), cfa.id_of(root))
+
+    def test_finals_follow_changes(self) -> None:
+        root: CFANode = CFANode(None)
+        node_1: CFANode = CFANode(None)
+        node_2: CFANode = CFANode(None)
+        cfa: CFA[CFANode] = CFA(root)
+
+        cfa.branch(root, node_1)
+        self.assertEqual(cfa.finals, [ (node_1, None) ])
+        cfa.branch(node_1, node_2)
+        self.assertEqual(cfa.finals, [ (node_2, None) ])
+        cfa.add_final(node_1, "return")
+        self.assertEqual(cfa.finals, [ (node_2, None), (node_1, "return") ])
+
+    def test_localised_indices(self) -> None:
+        root: LocalisedNode = LocalisedNode(None, "0")
+        node_1: LocalisedNode = LocalisedNode(None, "1")
+        node_2: LocalisedNode = LocalisedNode(None, "1")
+        cfa: LocalisedCFA = LocalisedCFA(root)
+
+        cfa.branch(root, node_1)
+        cfa.branch(node_1, node_2)
+        self.assertEqual(cfa.nodes_at("1"), [ node_1, node_2 ])
+        self.assertEqual(cfa.nodes_at("2"), [ ])
+        self.assertEqual(cfa.final_locations, { "1" })
+
+        node_2.location = "2"
+        cfa.locations_changed()
+        self.assertEqual(cfa.nodes_at("1"), [ node_1 ])
+        self.assertEqual(cfa.final_locations, { "2" })
+
+    def test_location_of(self) -> None:
+        tree: Tree = Parser.c().parse("int a = 1 + 2; int b = 3;")
+        declarations = tree.root.named_children
+        addition = declarations[0].named_children[1].named_children[1]
+        root: LocalisedNode = LocalisedNode(tree.root, "0")
+        node_1: LocalisedNode = LocalisedNode(declarations[0], "1")
+        node_2: LocalisedNode = LocalisedNode(declarations[1], "2")
+        cfa: LocalisedCFA = LocalisedCFA(root)
+
+        cfa.branch(root, node_1)
+        cfa.branch(node_1, node_2)
+        self.assertEqual(cfa.location_of(addition), "1")
+        self.assertEqual(cfa.location_of(declarations[1]), "2")
+        self.assertEqual(cfa.location_of(tree.root), "0")
+        self.assertEqual(cfa.locations, { "0", "1", "2" })
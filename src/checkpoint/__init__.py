@@ -0,0 +1 @@
+from .checkpoint_journal import *
@@ -0,0 +1,124 @@
+import hashlib
+import os
+import sqlite3
+from threading import Lock
+from typing import List, Tuple
+from mutator import MutantState
+from result_cache import ResultCache
+from test_results_parsing import TestResults
+
+# The mutants of an analysis which have been tested, recorded as soon as
+#   they are, such that an interrupted analysis can be resumed without
+#   testing them again. It also keeps the pristine source of the files
+#   being analysed, which may be left mutated or instrumented when the
+#   analysis is killed
+class CheckpointJournal:
+    def __init__(self, path: str) -> None:
+        self._path = path
+        # Mutants are tested from the threads of a workspace pool
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS sources ("
+            "file TEXT PRIMARY KEY, text BLOB)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "key TEXT PRIMARY KEY, file TEXT, start_byte INTEGER, end_byte INTEGER, "
+            "mutation TEXT, state TEXT)"
+        )
+        self._connection.commit()
+        # The results of the mutants are stored as those of the result cache
+        self._results = ResultCache(path, "")
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def key(
+        self,
+        file: str,
+        source: bytes,
+        start_byte: int,
+        end_byte: int,
+        mutation: str,
+    ) -> str:
+        # The source is the instrumented one the mutant applies to, such
+        #   that a changed file or unit does not match the earlier mutants
+        digest = hashlib.sha256(bytes(f'{file}\0{start_byte}\0{end_byte}\0{mutation}\0', "utf8"))
+        digest.update(source)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Tuple[MutantState, TestResults]:
+        # None if the mutant has not been tested
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT state FROM checkpoints WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return MutantState(row[0]), self._results.get(key)
+
+    def put(
+        self,
+        key: str,
+        file: str,
+        start_byte: int,
+        end_byte: int,
+        mutation: str,
+        state: MutantState,
+        test_results: TestResults,
+    ) -> None:
+        # The results are stored first, a checkpoint is only there once they are
+        self._results.put(key, test_results)
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?)",
+                (key, file, start_byte, end_byte, mutation, state.value)
+            )
+            self._connection.commit()
+
+    def put_source(self, file: str, source: bytes) -> None:
+        # The first source of a file is kept, the file may already be
+        #   mutated when an analysis is resumed
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO sources VALUES (?, ?)", (file, source)
+            )
+            self._connection.commit()
+
+    def finish_source(self, file: str) -> None:
+        # The file is pristine again, so it is not restored on resume
+        with self._lock:
+            self._connection.execute("DELETE FROM sources WHERE file = ?", (file,))
+            self._connection.commit()
+
+    def restore(self, base: str) -> List[str]:
+        # Writes back the pristine source of the files whose analysis
+        #   was interrupted, returning them
+        with self._lock:
+            rows = self._connection.execute("SELECT file, text FROM sources").fetchall()
+        for file, text in rows:
+            handle = open(os.path.join(base, file), "wb")
+            handle.write(text)
+            handle.close()
+        return [ file for file, _ in rows ]
+
+    def clear(self) -> None:
+        # Starts a new analysis, forgetting the mutants of the last one
+        with self._lock:
+            self._connection.execute("DELETE FROM sources")
+            self._connection.execute("DELETE FROM checkpoints")
+            self._connection.execute("DELETE FROM results")
+            self._connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM checkpoints"
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        self._results.close()
+        with self._lock:
+            self._connection.close()
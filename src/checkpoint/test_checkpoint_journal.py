@@ -0,0 +1,60 @@
+import os
+import tempfile
+from unittest import TestCase
+from instrumentation_trace import TraceTreeBuilder
+from mutator import MutantState
+from test_results_parsing import TestResults, TestSummary
+from . import *
+
+class TestCheckpointJournal(TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.mkdtemp()
+        self._path = os.path.join(self._directory, "checkpoint.sqlite3")
+        return super().setUp()
+
+    def test_key(self) -> None:
+        journal = CheckpointJournal(self._path)
+        key = journal.key("src/a.c", b"int a = b < c;", 10, 11, "'<' --> '<='")
+        self.assertEqual(journal.key("src/a.c", b"int a = b < c;", 10, 11, "'<' --> '<='"), key)
+        self.assertNotEqual(journal.key("src/a.c", b"int a = b < c;", 10, 11, "'<' --> '>'"), key)
+        self.assertNotEqual(journal.key("src/b.c", b"int a = b < c;", 10, 11, "'<' --> '<='"), key)
+        self.assertNotEqual(journal.key("src/a.c", b"int a = c < b;", 10, 11, "'<' --> '<='"), key)
+
+    def test_put_get(self) -> None:
+        builder = TraceTreeBuilder()
+        builder.start_test("test").enter_location("1").end_test()
+        journal = CheckpointJournal(self._path)
+        killed = journal.key("src/a.c", b"int a;", 0, 3, "'int' --> 'long'")
+        timed_out = journal.key("src/a.c", b"int a;", 0, 3, "'int' --> 'char'")
+        journal.put(
+            killed, "src/a.c", 0, 3, "'int' --> 'long'",
+            MutantState.KILLED, TestResults(TestSummary(1, 1, 0), builder.build())
+        )
+        journal.put(timed_out, "src/a.c", 0, 3, "'int' --> 'char'", MutantState.TIMEOUT, None)
+        journal.close()
+
+        journal = CheckpointJournal(self._path)
+        state, test_results = journal.get(killed)
+        self.assertEqual(state, MutantState.KILLED)
+        self.assertEqual(test_results.trace.ids, [ "1" ])
+        self.assertEqual(journal.get(timed_out), (MutantState.TIMEOUT, None))
+        self.assertIsNone(journal.get(journal.key("src/a.c", b"int a;", 0, 3, "'int' --> 'short'")))
+        self.assertEqual(len(journal), 2)
+
+        journal.clear()
+        self.assertIsNone(journal.get(killed))
+        self.assertEqual(len(journal), 0)
+
+    def test_restore(self) -> None:
+        os.makedirs(os.path.join(self._directory, "src"))
+        journal = CheckpointJournal(self._path)
+        journal.put_source("src/a.c", b"int a;")
+        journal.put_source("src/a.c", b"long a;")
+        journal.put_source("src/b.c", b"int b;")
+        journal.finish_source("src/b.c")
+
+        self.assertEqual(journal.restore(self._directory), [ "src/a.c" ])
+        file = open(os.path.join(self._directory, "src/a.c"), "rb")
+        self.assertEqual(file.read(), b"int a;")
+        file.close()
+        self.assertFalse(os.path.exists(os.path.join(self._directory, "src/b.c")))
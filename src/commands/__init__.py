@@ -1,3 +1,5 @@
 from .generate_tests import *
 from .create_cfg import *
 from .mutation_analysis import *
+from .work import *
+from .benchmark import *
@@ -0,0 +1,206 @@
+import glob
+import json
+import os
+from typing import Any, Dict, List, Tuple
+from application import (
+    InitializeSystemRequest,
+    InitializeSystemUseCase,
+    UnitAnalyseTreeRequest,
+    UnitAnalyseTreeUseCase,
+)
+from benchmark import (
+    Benchmark,
+    compare,
+    synthetic_c_source,
+    synthetic_trace_lines,
+)
+from cfa import CCFAFactory, LocalisedCFA
+from decorators import LocationDecorator
+from instrumentation_trace import TraceParser, TraceTreeBuilder
+from instrumentor import CCanaryFactory, CTreeInfestator
+from mutator import MutationStrategyFactory
+from ts import (
+    CField,
+    LanguageLibrary,
+    Node,
+    Parser,
+    Tree,
+)
+
+# The examples bundled with canary, which are benchmarked unless other
+#   files are given
+EXAMPLES = os.path.join(os.path.dirname(__file__), "..", "..", "examples")
+
+def benchmark(
+    files: str = None,
+    out: str = "",
+    base: str = "",
+    repeat: int = 5,
+    synthetic_functions: int = 200,
+    trace_lines: int = 2000000,
+    baseline: str = None,
+    threshold: float = 0.1,
+) -> List[Dict[str, Any]]:
+    # Step 0: Initialize the system
+    initialize_system_request = InitializeSystemRequest()
+    InitializeSystemUseCase().do(initialize_system_request)
+
+    # Step 1: Read the files, and generate the synthetic one
+    inputs: List[Tuple[str, str]] = list()
+    if files:
+        for file in files.split():
+            inputs.append((file, _read(f'{base}/{file}' if base else file)))
+    else:
+        for file in sorted(glob.glob(os.path.join(EXAMPLES, "c_0*", "src", "original.c"))):
+            name = os.path.basename(os.path.dirname(os.path.dirname(file)))
+            inputs.append((name, _read(file)))
+    if synthetic_functions > 0:
+        inputs.append(("synthetic", synthetic_c_source(synthetic_functions)))
+
+    # Step 2: Time the stages of the analysis on each of them
+    bench = Benchmark(repeat)
+    for name, source in inputs:
+        _benchmark_source(bench, name, source, trace_lines if name == "synthetic" else 0)
+
+    # Step 3: Write the results, and compare them to those of the baseline
+    directory = f'{base}/{out}' if base else out
+    if directory: os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, "benchmark.json")
+    bench.write(path)
+    print(_results_table(bench))
+    print(f'Wrote the benchmark to {path}')
+
+    if not baseline:
+        return list()
+    file = open(baseline)
+    rows = compare(bench.to_json(), json.load(file), threshold)
+    file.close()
+    print(_comparison_table(rows))
+    regressions = [ row for row in rows if row["regression"] ]
+    print(f'{len(regressions)} of {len(rows)} benchmarks are more than {threshold:.0%} slower than the baseline')
+    return regressions
+
+def _benchmark_source(bench: Benchmark, name: str, source: str, trace_lines: int) -> None:
+    # The stages depend on each other, so an input which fails a stage
+    #   is not benchmarked any further
+    stage = "parse"
+    try:
+        parser = Parser.c()
+        tree: Tree = bench.measure(f'{name}/parse', lambda: parser.parse(source), len(source))
+        units = _units(tree)
+
+        stage = "infect"
+        cfas = [ CCFAFactory(tree).create(definition.child_by_field(CField.BODY)) for definition, _ in units ]
+        instrumented: Tree = bench.measure(
+            f'{name}/infect',
+            lambda: CTreeInfestator(parser, CCanaryFactory()).infect_all(tree, cfas),
+            len(units),
+        )
+        instrumented_units = _units(instrumented)
+
+        stage = "cfa"
+        instrumented_cfas = bench.measure(
+            f'{name}/cfa',
+            lambda: [
+                CCFAFactory(instrumented).create(definition) for definition, _ in instrumented_units
+            ],
+            len(instrumented_units),
+        )
+
+        stage = "decorate"
+        localised_cfas: List[LocalisedCFA] = bench.measure(
+            f'{name}/decorate',
+            lambda: [ LocationDecorator(instrumented).decorate(cfa) for cfa in instrumented_cfas ],
+            len(instrumented_cfas),
+        )
+        named_cfas = [ (unit, cfa) for (_, unit), cfa in zip(instrumented_units, localised_cfas) ]
+
+        stage = "follow"
+        traces = [
+            (unit, _parse_trace(synthetic_trace_lines([ (unit, cfa) ], 2000, seed=u_idx)))
+                for u_idx, (unit, cfa) in enumerate(named_cfas)
+        ]
+        bench.measure(
+            f'{name}/follow',
+            lambda: [
+                (list(cfa.follow(unit, trace)), cfa.split_on_finals(trace))
+                    for (unit, trace), (_, cfa) in zip(traces, named_cfas)
+            ],
+            len(traces),
+        )
+
+        if trace_lines > 0:
+            stage = "trace_parse"
+            lines = synthetic_trace_lines(named_cfas, trace_lines)
+            bench.measure(f'{name}/trace_parse', lambda: _parse_trace(lines), len(lines))
+            del lines
+
+        stage = "capture"
+        strategy = MutationStrategyFactory().create("obom", parser)
+        nodes: List[Node] = [ node.node for cfa in localised_cfas for node in cfa.nodes if node.node is not None ]
+        candidates: List[Node] = bench.measure(
+            f'{name}/capture',
+            lambda: [ candidate for node in nodes for candidate in strategy.capture(node) ],
+            len(nodes),
+        )
+
+        stage = "mutations"
+        bench.measure(
+            f'{name}/mutations',
+            lambda: [ strategy.mutations(parser, instrumented, candidate) for candidate in candidates ],
+            len(candidates),
+        )
+    except Exception as excep:
+        print(f'Benchmarking {stage} of {name} failed: {excep}')
+        bench.error(f'{name}/{stage}', excep)
+
+def _units(tree: Tree) -> List[Tuple[Node, str]]:
+    unit_analysis_of_tree_request = UnitAnalyseTreeRequest(tree, LanguageLibrary.c())
+    return UnitAnalyseTreeUseCase().do(unit_analysis_of_tree_request).unit_functions
+
+def _parse_trace(lines: List[str]):
+    trace_parser = TraceParser(TraceTreeBuilder())
+    trace_parser.parse(lines)
+    return trace_parser.finish()
+
+def _read(path: str) -> str:
+    file = open(path)
+    source = file.read()
+    file.close()
+    return source
+
+def _results_table(bench: Benchmark) -> str:
+    rows = [ [ "benchmark", "items", "min ms", "median ms", "mean ms" ] ]
+    for name, result in bench.results.items():
+        if "error" in result:
+            rows.append([ name, "", "", "", result["error"] ])
+            continue
+        rows.append([
+            name,
+            str(result["items"]) if result["items"] is not None else "",
+            f'{result["min"] * 1e3:.2f}',
+            f'{result["median"] * 1e3:.2f}',
+            f'{result["mean"] * 1e3:.2f}',
+        ])
+    return _table(rows)
+
+def _comparison_table(rows: List[Dict[str, Any]]) -> str:
+    return _table([ [ "benchmark", "baseline min ms", "current min ms", "ratio", "" ] ] + [
+        [
+            row["name"],
+            f'{row["baseline"] * 1e3:.2f}',
+            f'{row["current"] * 1e3:.2f}',
+            f'{row["ratio"]:.2f}',
+            "REGRESSION" if row["regression"] else "",
+        ] for row in rows
+    ])
+
+def _table(rows: List[List[str]]) -> str:
+    widths = [ max(len(row[idx]) for row in rows) for idx in range(len(rows[0])) ]
+    return "\n".join(
+        "  ".join(
+            # The names are aligned left, the numbers right
+            cell.ljust(width) if idx == 0 else cell.rjust(width)
+                for idx, (cell, width) in enumerate(zip(row, widths))
+        ).rstrip() for row in rows
+    )
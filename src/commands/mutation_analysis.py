@@ -1,6 +1,10 @@
+from concurrent.futures import ThreadPoolExecutor
 from shutil import register_unpack_format
+import os
+import shutil
+import subprocess
 import time
-from typing import Dict
+from typing import Any, Callable, Dict, Iterator
 from urllib import request
 from application import (
     InitializeSystemRequest,
@@ -11,23 +15,42 @@ from application import (
     RunTestUseCase,
     InfestProgramRequest,
     InfestProgramUseCase,
-    ParseTestResultRequest,
-    ParseTestResultUseCase,
     UnitAnalyseTreeRequest,
     UnitAnalyseTreeUseCase,
     MutateAlongAllTracesRequest,
+    MutateAlongAllTracesResponse,
     MutateAlongAllTracesUseCase,
     MutateRandomlyRequest,
     MutateRandomlyUseCase,
+    MutationTestOptions,
+    LearnIncrementalBuildRequest,
+    LearnIncrementalBuildUseCase,
+    RunSubsystemRequest,
+    RunSubsystemUseCase,
 )
 from cfa import CCFAFactory
+from checkpoint import CheckpointJournal
+from instrumentation_trace import CoverageMap
 from decorators import LocationDecorator
 from mutator import MutationStrategyFactory
+from profiling import PROFILER
 from test_results_parsing import ResultsParserFactory
 from ts import (
     Parser,
     LanguageLibrary,
 )
+from incremental_build import IncrementalBuild
+from result_cache import ResultCache, MutantDeduplicator, source_fingerprint
+from results_writer import (
+    ResultsWriterFactory,
+    parquet_available,
+    UNIT_RECORD,
+    NODE_RECORD,
+    MUTANT_RECORD,
+    SUMMARY_RECORD,
+)
+from work_queue import WorkQueue
+from workspace import Workspace, WorkspacePool
 
 def mutation_analysis(
     files: str,
@@ -40,9 +63,230 @@ def mutation_analysis(
     placement_strategy: str = "randomly",
     mutation_strategy: str = "obom",
     unit_whitelist: str = None,
-    unit_blacklist: str = None
+    unit_blacklist: str = None,
+    jobs: int = 1,
+    schemata: bool = False,
+    incremental_build: bool = False,
+    keep_test_results: bool = False,
+    result_cache: bool = False,
+    deduplicate: bool = False,
+    compiler_equivalence: bool = False,
+    full_traces: bool = False,
+    timeout_factor: float = 3.0,
+    timeout_constant: float = 5.0,
+    select_tests: bool = False,
+    fork_server: bool = False,
+    binary_trace: bool = False,
+    coverage_counts: bool = False,
+    batch_units: bool = False,
+    file_jobs: int = 1,
+    work_queue: str = None,
+    checkpoint: bool = False,
+    resume: bool = False,
+    parquet: bool = False,
+    profile: bool = False,
+) -> None:
+    file_jobs = min(file_jobs, len(files.split()))
+    if file_jobs > 1 and not base:
+        print("Analysing files in parallel requires a base directory, analysing them one at a time")
+        file_jobs = 1
+    if jobs > 1 and not base:
+        print("Running mutants in parallel requires a base directory, running them one at a time")
+        jobs = 1
+    if result_cache and not base:
+        print("Caching the results of mutants requires a base directory, testing all of them")
+        result_cache = False
+    if work_queue and not base:
+        print("Testing mutants through a work queue requires a base directory, testing them here")
+        work_queue = None
+    if work_queue and (schemata or fork_server):
+        # The workers build and test one mutant at a time
+        print("The workers of a work queue test the mutants one at a time, not using schemata")
+        schemata = False
+        fork_server = False
+    if checkpoint and not base:
+        print("Recording the tested mutants requires a base directory, not recording them")
+        checkpoint = False
+    if resume and not base:
+        print("Resuming an analysis requires a base directory, starting over")
+        resume = False
+    if parquet and not parquet_available():
+        print("Writing the results as Parquet requires pyarrow, only writing them as JSON lines")
+        parquet = False
+    if fork_server and not schemata:
+        print("Only the mutants of a schemata are forked from a fork server, starting the tests for every mutant")
+        fork_server = False
+    if profile:
+        PROFILER.enable()
+    if compiler_equivalence:
+        # The objects of the mutants are compiled by the learned commands
+        deduplicate = True
+        incremental_build = True
+
+    # The mutants are published to the queue, and tested by the workers
+    #   pulling them from it
+    queue: WorkQueue = WorkQueue(work_queue) if work_queue else None
+
+    # Every tested mutant is recorded, such that an interrupted analysis
+    #   can be resumed. The files it left mutated are restored first
+    journal: CheckpointJournal = None
+    if checkpoint or resume:
+        os.makedirs(f'{base}/{out}', exist_ok=True)
+        journal = CheckpointJournal(f'{base}/{out}/checkpoint.sqlite3')
+        if resume:
+            for file in journal.restore(base):
+                print(f'Restored {file} from the checkpoint journal')
+            print(f'Resuming with {len(journal)} mutants already tested')
+        else: journal.clear()
+
+    def analyse(files: str, workspace: Workspace, jobs: int) -> None:
+        # The files are analysed in the workspace if there is one, the
+        #   results of the mutants are cached in the out directory of the base
+        root = workspace.root if workspace is not None else base
+        workspaces: WorkspacePool = None
+        if jobs > 1:
+            # Every worker gets its own copy of the base directory, such that
+            #   the mutants can be built and tested without interfering
+            workspaces = WorkspacePool(root, jobs, [ f'{root}/{out}' ])
+        try:
+            _mutation_analysis(
+                files,
+                unit,
+                workspace.command(build_command) if workspace is not None else build_command,
+                workspace.command(test_command) if workspace is not None else test_command,
+                out,
+                root,
+                testing_backend,
+                placement_strategy,
+                mutation_strategy,
+                unit_whitelist,
+                unit_blacklist,
+                workspaces,
+                schemata,
+                incremental_build,
+                keep_test_results,
+                result_cache,
+                deduplicate,
+                compiler_equivalence,
+                full_traces,
+                timeout_factor,
+                timeout_constant,
+                select_tests,
+                fork_server,
+                binary_trace,
+                coverage_counts,
+                batch_units,
+                f'{base}/{out}',
+                queue,
+                journal,
+                parquet,
+            )
+        finally:
+            if workspaces is not None:
+                workspaces.close()
+
+    try:
+        if file_jobs <= 1:
+            analyse(files, None, jobs)
+            return
+
+        # Every file is analysed in its own copy of the base directory, and
+        #   the jobs are shared out between the files analysed at once
+        InitializeSystemUseCase().do(InitializeSystemRequest())
+        with ThreadPoolExecutor(
+            max_workers=file_jobs, thread_name_prefix="canary_file"
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _analyse_in_workspace, analyse, file, base, out, max(1, jobs // file_jobs)
+                ) for file in files.split()
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        if queue is not None:
+            queue.close()
+        if journal is not None:
+            journal.close()
+        if profile:
+            # The phases as a trace for chrome://tracing or Perfetto, and
+            #   added up per phase
+            PROFILER.disable()
+            PROFILER.write_chrome_trace(os.path.join(base, out, "profile.json"))
+            PROFILER.write_summary(os.path.join(base, out, "profile.txt"))
+            print(PROFILER.summary_table())
+
+def _analyse_in_workspace(
+    analyse: Callable[[str, Workspace, int], None],
+    file: str,
+    base: str,
+    out: str,
+    jobs: int,
+) -> None:
+    workspace = Workspace.create(base, [ f'{base}/{out}' ])
+    try:
+        analyse(file, workspace, jobs)
+    finally:
+        # The result files of the units are merged into the out directory
+        shutil.copytree(
+            workspace.path(f'{base}/{out}'), f'{base}/{out}', dirs_exist_ok=True
+        )
+        workspace.remove()
+
+def _mutation_analysis(
+    files: str,
+    unit: str,
+    build_command: str,
+    test_command: str,
+    out: str,
+    base: str,
+    testing_backend: str,
+    placement_strategy: str,
+    mutation_strategy: str,
+    unit_whitelist: str,
+    unit_blacklist: str,
+    workspaces: WorkspacePool,
+    schemata: bool,
+    incremental_build: bool,
+    keep_test_results: bool,
+    result_cache: bool,
+    deduplicate: bool,
+    compiler_equivalence: bool,
+    full_traces: bool,
+    timeout_factor: float,
+    timeout_constant: float,
+    select_tests: bool,
+    fork_server: bool,
+    binary_trace: bool,
+    coverage_counts: bool,
+    batch_units: bool,
+    cache_directory: str,
+    work_queue: WorkQueue,
+    checkpoint_journal: CheckpointJournal,
+    parquet: bool,
 ) -> None:
     for file in files.split():
+        learned_build: IncrementalBuild = None
+        learned = False
+
+        # Mutants of the file are only tested again if their text, the
+        #   rest of the sources or the way they are tested changed
+        cache: ResultCache = None
+        if result_cache:
+            cache = ResultCache(
+                f'{cache_directory}/results.sqlite3',
+                source_fingerprint(
+                    base,
+                    [ f'{base}/{file}', f'{base}/{out}' ],
+                    # Killed mutants only have complete traces with full_traces,
+                    #   and only counted ones with coverage_counts
+                    [
+                        build_command, test_command, testing_backend,
+                        full_traces, select_tests, coverage_counts,
+                    ],
+                )
+            )
+
         # Step 0: Initialize the system
         initialize_system_request = InitializeSystemRequest()
         InitializeSystemUseCase().do(initialize_system_request)
@@ -54,9 +298,24 @@ def mutation_analysis(
         unit_analysis_of_file_response = UnitAnalyseFileUseCase().do(
             unit_analysis_of_file_request
         )
+        if checkpoint_journal is not None:
+            checkpoint_journal.put_source(file, unit_analysis_of_file_response.tree.source)
         
         whitelist = (unit_whitelist or "").split()
         blacklist = (unit_blacklist or "").split()
+        selected_units = [
+            unit_node for unit_node, unit_name in unit_analysis_of_file_response.unit_functions
+                if not (len(whitelist) > 0 and unit_name not in whitelist) and \
+                    not (len(blacklist) > 0 and unit_name in blacklist)
+        ]
+
+        # With batch_units, the selected units are instrumented together
+        #   and the original program is only tested for the first of them
+        instrumentation_request: InfestProgramRequest = None
+        instrumentation_response = None
+        instrumented_unit_analysis_of_file_response = None
+        original_test_response = None
+        original_object_digest: str = None
 
         for u_idx, unit_tuple in enumerate(unit_analysis_of_file_response.unit_functions):
             try:
@@ -65,30 +324,32 @@ def mutation_analysis(
                 unit_node = unit_tuple[0]
                 unit_name = unit_tuple[1]
 
-                if (len(whitelist) > 0 and unit_name not in whitelist) or \
-                    (len(blacklist) > 0 and unit_name in blacklist):
+                if unit_node not in selected_units:
                     print(f'Skipping unit {unit_name}')
                     continue
                 print(f"Unit {unit_name}")
 
-                # Step 2: Instrument the mutable version
-                instrumentation_request = InfestProgramRequest(
-                    Parser.c(),
-                    unit_analysis_of_file_response.tree,
-                    unit_node,
-                    unit_analysis_of_file_request.filepath
-                )
-                instrumentation_response = InfestProgramUseCase().do(
-                    instrumentation_request
-                )
+                batched = batch_units and original_test_response is not None
+                if not batched:
+                    # Step 2: Instrument the mutable version
+                    instrumentation_request = InfestProgramRequest(
+                        Parser.c(),
+                        unit_analysis_of_file_response.tree,
+                        unit_node,
+                        unit_analysis_of_file_request.filepath,
+                        unit_functions=selected_units if batch_units else None,
+                    )
+                    instrumentation_response = InfestProgramUseCase().do(
+                        instrumentation_request
+                    )
 
-                # Step 3: Instrumented tree unit analysis
-                instrumented_unit_analysis_of_file_request = UnitAnalyseFileRequest(
-                    unit_analysis_of_file_request.filepath, LanguageLibrary.c(), unit_name
-                )
-                instrumented_unit_analysis_of_file_response = UnitAnalyseFileUseCase().do(
-                    instrumented_unit_analysis_of_file_request
-                )
+                    # Step 3: Instrumented tree unit analysis
+                    instrumented_unit_analysis_of_file_request = UnitAnalyseFileRequest(
+                        unit_analysis_of_file_request.filepath, LanguageLibrary.c(), unit_name
+                    )
+                    instrumented_unit_analysis_of_file_response = UnitAnalyseFileUseCase().do(
+                        instrumented_unit_analysis_of_file_request
+                    )
 
                 # Step 4: Get the localised CFG
                 unit_analysis_of_tree_request = UnitAnalyseTreeRequest(
@@ -99,40 +360,116 @@ def mutation_analysis(
                 unit_analysis_of_tree_response = UnitAnalyseTreeUseCase().do(
                     unit_analysis_of_tree_request
                 )
-                instrumented_cfg = CCFAFactory(instrumentation_response.instrumented_tree).create(
-                    unit_analysis_of_tree_response.unit_functions[u_idx][0]
-                )
-                localised_cfg = LocationDecorator(instrumentation_response.instrumented_tree).decorate(
-                    instrumented_cfg
-                )
-
-                # Step 5: Run tests on original program
-                original_test_request = RunTestRequest(
-                    build_command, test_command, f'{base}/{out}/original_test_results.txt'
-                )
-                RunTestUseCase().do(original_test_request)
+                with PROFILER.span("cfa"):
+                    instrumented_cfg = CCFAFactory(instrumentation_response.instrumented_tree).create(
+                        unit_analysis_of_tree_response.unit_functions[u_idx][0]
+                    )
+                with PROFILER.span("decorate"):
+                    localised_cfg = LocationDecorator(instrumentation_response.instrumented_tree).decorate(
+                        instrumented_cfg
+                    )
 
-                # Step 6: Parse test results
+                # Step 5: Run tests on original program, parsing
+                #   the results while they are produced
                 test_results_parser = ResultsParserFactory().create(
                     testing_backend
                 )
-                parse_test_results_request = ParseTestResultRequest(
-                    original_test_request.out,
-                    test_results_parser
-                )
-                parse_test_results_response = ParseTestResultUseCase().do(
-                    parse_test_results_request
-                )
+                if not batched:
+                    original_test_request = RunTestRequest(
+                        build_command,
+                        test_command,
+                        f'{base}/{out}/original_test_results.txt' if keep_test_results else None,
+                        results_parser=test_results_parser,
+                        build_timeout=None,
+                        test_timeout=None,
+                        binary_trace=binary_trace,
+                    )
+                    original_test_response = RunTestUseCase().do(original_test_request)
+                    if original_test_response.build_failed:
+                        # The mutants would be compared to a program built before
+                        print(f'Building the original program failed, skipping unit {unit_name}')
+                        original_test_response = None
+                        continue
+
+                # The locations of the batched units are distinct, so the
+                #   trace of a unit is made of the visits of its own locations
+                original_trace = original_test_response.test_results.trace
+                if batch_units:
+                    original_trace = original_trace.at_locations(localised_cfg.locations)
+
+                # The mutants get a budget relative to how long it took
+                #   to build and test the original program
+                build_timeout = timeout_factor * original_test_response.build_duration + timeout_constant
+                test_timeout = timeout_factor * original_test_response.test_duration + timeout_constant
+
+                # Step 5.1: Learn which commands rebuild the file, the other
+                #   objects are left by the original build
+                if incremental_build and not learned:
+                    learned = True
+                    learned_build = LearnIncrementalBuildUseCase().do(
+                        LearnIncrementalBuildRequest(
+                            build_command, unit_analysis_of_file_request.filepath, base
+                        )
+                    ).incremental_build
+                    if learned_build is None:
+                        print(f'Could not learn how to rebuild {file}, building everything for every mutant')
+                    elif workspaces is not None:
+                        workspaces.each(_build_in_workspace, build_command)
+
+                # The objects of the original program are only on disk until
+                #   the first mutant is built, the batched units share them
+                if not batched and compiler_equivalence and learned_build is not None:
+                    original_object_digest = learned_build.object_digest()
+
+                # Step 5.2: Remember the original program, such that the
+                #   mutants identical to it or to each other are not tested
+                deduplicator: MutantDeduplicator = None
+                if deduplicate:
+                    deduplicator = MutantDeduplicator(
+                        original_test_response.test_results,
+                        compiler_equivalence and learned_build is not None,
+                    )
+                    deduplicator.add_original(
+                        deduplicator.digest(instrumentation_response.instrumented_tree.source)
+                    )
+                    if deduplicator.compiler_equivalence and original_object_digest is not None:
+                        deduplicator.add_original(original_object_digest)
+
+                # Step 5.3: Remember which tests visit each location, such
+                #   that a mutant is only tested by the tests which can observe it
+                coverage_map: CoverageMap = None
+                if select_tests:
+                    coverage_map = CoverageMap.of(
+                        original_test_response.test_results.trace
+                    )
 
-                # Step 7: Create mutation strategy
+                # Step 6: Create mutation strategy
                 applied_mutation_strategy = MutationStrategyFactory().create(
                     mutation_strategy, instrumentation_request.parser
                 )
+                mutation_test_options = MutationTestOptions(
+                    workspaces=workspaces,
+                    schemata=schemata,
+                    incremental_build=learned_build,
+                    keep_test_results=keep_test_results,
+                    result_cache=cache,
+                    deduplicator=deduplicator,
+                    abort_on_failure=not full_traces,
+                    build_timeout=build_timeout,
+                    test_timeout=test_timeout,
+                    coverage_map=coverage_map,
+                    fork_server=fork_server,
+                    binary_trace=binary_trace,
+                    coverage_counts=coverage_counts,
+                    other_units=batch_units,
+                    work_queue=work_queue,
+                    checkpoint_journal=checkpoint_journal,
+                )
 
                 if placement_strategy == "randomly":
                     # Step 7: Mutate 'randomly'
                     randomly_mutate_request = MutateRandomlyRequest(
-                        instrumented_unit_analysis_of_file_response.unit_functions,
+                        unit_analysis_of_tree_response.unit_functions[u_idx][0],
                         instrumentation_response.instrumented_tree,
                         instrumentation_request.parser,
                         applied_mutation_strategy,
@@ -142,15 +479,15 @@ def mutation_analysis(
                         unit_analysis_of_file_request.filepath,
                         out,
                         base,
+                        options=mutation_test_options,
+                        localised_cfg=localised_cfg,
                     )
                     MutateRandomlyUseCase().do(
                         randomly_mutate_request
                     )
                 elif placement_strategy == "pathbased":
                     # Step 7: Get individual unit sequences
-                    unit_traces = localised_cfg.split_on_finals(
-                        parse_test_results_response.test_results.trace
-                    )
+                    unit_traces = localised_cfg.split_on_finals(original_trace)
 
                     # Step 8: Mutate 'pathbased'
                     mutate_along_trace_request = MutateAlongAllTracesRequest(
@@ -165,6 +502,7 @@ def mutation_analysis(
                         unit_analysis_of_file_request.filepath,
                         out,
                         base,
+                        options=mutation_test_options,
                     )
                     mutation_start_time = time.perf_counter()
                     mutate_along_trace_response = MutateAlongAllTracesUseCase().do(
@@ -173,209 +511,147 @@ def mutation_analysis(
                     mutation_end_time = time.perf_counter()
                     mutation_duration = mutation_end_time - mutation_start_time
 
-                    results_file = open(f"{mutate_along_trace_request.base}/{mutate_along_trace_request.out}/{unit_name}_{u_idx}.txt", "w+")
-                    results_file.write(f"Mutation took {mutation_duration} seconds\n")
-
-                    results_file.write(f"Original execution {mutate_along_trace_response.trace_count} traces\n")
-
-                    results_file.write("\Visited count\n")
-                    for location in mutate_along_trace_response.amount_visited_locations:
-                        if location == "" or location is None: continue
-                        amount = mutate_along_trace_response.amount_visited_locations[location]
-                        results_file.write(f"{location} was visited {amount} times\n")
-                    results_file.write("\n")
-
-                    results_file.write(f"Visited locations " + ", ".join(mutate_along_trace_response.visited_locations) + "\n")
-                    results_file.write(f"Unvisited locations " + ", ".join(mutate_along_trace_response.unvisited_locations) + "\n")
-                    amount_visited = len(mutate_along_trace_response.visited_locations)
-                    amount_unvisited = len(mutate_along_trace_response.unvisited_locations)
-                    results_file.write(f"Visited {amount_visited}, Unvisted {amount_unvisited}")
-                    if amount_visited + amount_unvisited > 0:
-                        results_file.write(f", percentage visited {amount_visited / (amount_visited + amount_unvisited)}")
-                    results_file.write("\n")
-
-                    results_file.write("\n")
-
-                    results_file.write(f"Visited nodes {len(mutate_along_trace_response.visited_nodes)}\n")
-                    results_file.write(f"Unvisited nodes {len(mutate_along_trace_response.unvisited_nodes)}\n")
-                    nodes_total = len(mutate_along_trace_response.visited_nodes) + len(mutate_along_trace_response.unvisited_nodes)
-                    if nodes_total > 0:
-                        results_file.write(f"Percentage visited {len(mutate_along_trace_response.visited_nodes) / nodes_total}\n")
-
-                    results_file.write("\n")
-
-                    results_file.write(f"Visited candidates {mutate_along_trace_response.visited_candidates}\n")
-                    results_file.write(f"Unvisited candidates {mutate_along_trace_response.unvisited_candidates}\n")
-                    candidates_total = mutate_along_trace_response.visited_candidates + mutate_along_trace_response.unvisited_candidates
-                    if candidates_total > 0:
-                        results_file.write(f"Percentage visited {mutate_along_trace_response.visited_candidates / candidates_total}\n")
-
-                    results_file.write("\n")
-
-                    results_file.write(f"Tested mutations {mutate_along_trace_response.visited_mutations}\n")
-                    results_file.write(f"Untested mutations {mutate_along_trace_response.unvisited_mutations}\n")
-                    mutations_total = mutate_along_trace_response.visited_mutations + mutate_along_trace_response.unvisited_mutations
-                    if mutations_total > 0:
-                        results_file.write(f"Percentage visited {mutate_along_trace_response.visited_mutations / mutations_total}\n")
-
-                    all_locations_total_killed = 0
-                    all_locations_total_survied = 0
-                    total_if_conditional_killed = 0
-                    total_if_conditional_survived = 0
-                    total_for_initilisation_killed = 0
-                    total_for_initilisation_survived = 0
-                    total_for_condition_killed = 0
-                    total_for_condition_survived = 0
-                    total_for_update_killed = 0
-                    total_for_update_survived = 0
-                    total_do_while_condition_killed = 0
-                    total_do_while_condition_survived = 0
-                    total_while_condition_killed = 0
-                    total_while_condition_survived = 0
-                    total_switch_condition_killed = 0
-                    total_switch_condition_survived = 0
-                    c_syntax = LanguageLibrary.c().syntax
-                    for visited_locaiton in mutate_along_trace_response.visited_locations:
-                        results_file.write(f"\nLocation {visited_locaiton}\n")
-                        if len(mutate_along_trace_response.random_mutations_runs) == 0:
-                            results_file.write("No runs\n")
-                            continue
-                        results_file.write(f"{len(mutate_along_trace_response.random_mutations_runs)} Runs\n")
-
-                        location_total_killed = 0
-                        location_total_survied = 0
-                        for mutation_run in mutate_along_trace_response.random_mutations_runs:
-                            cfa_node = mutation_run[0]
-                            run_result = mutation_run[1]
-
-                            if cfa_node.location != visited_locaiton:
-                                continue
-                            results_file.write("\n")
-
-                            results_file.write(f"Code :: '{mutate_along_trace_request.tree.contents_of(cfa_node.node)}'\n")
-
-                            if run_result.amount_killed + run_result.amount_survived == 0:
-                                results_file.write("No mutations\n")
-                                continue
-
-                            amount_killed = 0
-                            amount_survived = 0
-
-                            # "if"-condition
-                            if c_syntax.is_condition_of_if(cfa_node.node):
-                                results_file.write("Is :: if-condition\n")
-                            # "for" initialisation
-                            if c_syntax.is_initialisation_of_for(cfa_node.node):
-                                results_file.write("Is :: for-initalisation\n")
-                            # "for" conditional
-                            if c_syntax.is_condition_of_for(cfa_node.node):
-                                results_file.write("Is :: for-condition\n")
-                            # "for" update
-                            if c_syntax.is_update_of_for(cfa_node.node):
-                                results_file.write("Is :: for-udapte\n")
-                            # "do while" condition
-                            if c_syntax.is_condition_of_do_while(cfa_node.node):
-                                results_file.write("Is :: do_while-condition\n")
-                            # "while" condition
-                            if c_syntax.is_condition_of_while(cfa_node.node):
-                                results_file.write("Is :: while-condition\n")
-                            # "switch" condition
-                            if c_syntax.is_condition_of_switch(cfa_node.node):
-                                results_file.write("Is :: switch-condition\n")
-
-                            if len(run_result.mutation_tests) == 0: continue
-
-                            for mutation_test in run_result.mutation_tests:
-                                split_traces = mutate_along_trace_request.localised_cfg.split_on_finals(
-                                    mutation_test.test_results.trace
-                                )
-                                results_file.write(f"Mutant trace count {len(split_traces)}\n")
-                                
-                                location_visitations: Dict[str, int] = dict()
-                                for location in mutation_test.test_results.trace.sequence:
-                                    if location.id not in location_visitations:
-                                        location_visitations[location.id] = 1
-                                    else: location_visitations[location.id] += 1
-
-                                for location in location_visitations:
-                                    amount = location_visitations[location]
-                                    results_file.write(f"{location} was visited {amount} times\n")
-
-                                results_file.write(f"[{mutation_test.candidate.start_point}, {mutation_test.candidate.end_point}]")
-                                results_file.write(f" {str(mutation_test.mutation)}")
-                                if mutation_test.test_results.summary.failure_count > 0:
-                                    amount_killed += 1
-                                    mutation_state = "KILLED"
-                                else:
-                                    amount_survived += 1
-                                    mutation_state = "SURVIVED"
-                                results_file.write(f" :: {mutation_state}\n")
-                                results_file.write("\n")
-
-                            # "if"-condition
-                            if c_syntax.is_condition_of_if(cfa_node.node):
-                                total_if_conditional_killed += amount_killed
-                                total_if_conditional_survived += amount_survived
-                            # "for" initialisation
-                            if c_syntax.is_initialisation_of_for(cfa_node.node):
-                                total_for_initilisation_killed += amount_killed
-                                total_for_initilisation_survived += amount_survived
-                            # "for" conditional
-                            if c_syntax.is_condition_of_for(cfa_node.node):
-                                total_for_condition_killed += amount_killed
-                                total_for_condition_survived += amount_survived
-                            # "for" update
-                            if c_syntax.is_update_of_for(cfa_node.node):
-                                total_for_update_killed += amount_killed
-                                total_for_update_survived += amount_survived
-                            # "do while" condition
-                            if c_syntax.is_condition_of_do_while(cfa_node.node):
-                                total_do_while_condition_killed += amount_killed
-                                total_do_while_condition_survived += amount_survived
-                            # "while" condition
-                            if c_syntax.is_condition_of_while(cfa_node.node):
-                                total_while_condition_killed += amount_killed
-                                total_while_condition_survived += amount_survived
-                            # "switch" condition
-                            if c_syntax.is_condition_of_switch(cfa_node.node):
-                                total_switch_condition_killed += amount_killed
-                                total_switch_condition_survived += amount_survived
-
-                            results_file.write(f"Killed {amount_killed} and {amount_survived} survived")
-                            amount_total = amount_killed + amount_survived
-                            if amount_total > 0:
-                                results_file.write(f", mutation score of {amount_killed / (amount_killed + amount_survived)}")
-                            results_file.write("\n")
-
-                            location_total_killed += amount_killed
-                            location_total_survied += amount_survived
-
-                        all_locations_total_killed += location_total_killed
-                        all_locations_total_survied += location_total_survied
-
-                        location_total_sum = location_total_killed + location_total_survied
-                        results_file.write(f"\nLocation Killed {location_total_killed} and {location_total_survied} survived")
-                        if location_total_sum > 0:
-                            results_file.write(f", mutation score of {location_total_killed / (location_total_sum)}")
-                        results_file.write("\n\n")
-
-                    results_file.write(f"\nTotal killed {all_locations_total_killed} and {all_locations_total_survied} total survived")
-                    if all_locations_total_killed + all_locations_total_survied > 0:
-                        results_file.write(f", with a total mutations score of {all_locations_total_killed/(all_locations_total_killed + all_locations_total_survied)}")
-                    results_file.write("\n")
-
-                    mutate_along_trace_request.localised_cfg.draw(
-                        mutate_along_trace_request.tree, f"{unit_name}_{u_idx}"
-                    ).save(directory=f"{mutate_along_trace_request.base}/{mutate_along_trace_request.out}")
-
-                results_file.write("\n")
-                results_file.write(f"Took {time.perf_counter() - start_time} seconds")
-                results_file.close()
+                    # Step 9: Write a record per mutant, the report is
+                    #   generated from the same records
+                    writers = [
+                        ResultsWriterFactory().create(
+                            results_format, f"{mutate_along_trace_request.base}/{mutate_along_trace_request.out}/{unit_name}_{u_idx}"
+                        ) for results_format in [ "text", "jsonl" ] + ([ "parquet" ] if parquet else list())
+                    ]
+                    try:
+                        for record in _records(
+                            file, unit_name, mutate_along_trace_request, mutate_along_trace_response, mutation_duration
+                        ):
+                            for writer in writers:
+                                writer.write(record)
+
+                        mutate_along_trace_request.localised_cfg.draw(
+                            mutate_along_trace_request.tree, f"{unit_name}_{u_idx}"
+                        ).save(directory=f"{mutate_along_trace_request.base}/{mutate_along_trace_request.out}")
+
+                        for writer in writers:
+                            writer.write({
+                                "record": SUMMARY_RECORD,
+                                "file": file,
+                                "unit": unit_name,
+                                "killed": mutate_along_trace_response.amount_killed,
+                                "survived": mutate_along_trace_response.amount_survived,
+                                "duration": time.perf_counter() - start_time,
+                            })
+                    finally:
+                        for writer in writers:
+                            writer.close()
                 
             except Exception as excep:
                 print(f"{unit} encountered an exception :: {excep}")
 
-            # Step 6: Revert to the original program after mutation
-            file = open(unit_analysis_of_file_request.filepath, "w+")
-            file.write(unit_analysis_of_file_response.tree.text)
-            file.close()
\ No newline at end of file
+            finally:
+                # Step 6: Revert to the original program after mutation, also
+                #   when the analysis is interrupted. The copies in the workspaces
+                #   hold the last mutant they tested, and are shared with the next file
+                original_paths = [ unit_analysis_of_file_request.filepath ]
+                if workspaces is not None:
+                    original_paths.extend(
+                        workspace.path(unit_analysis_of_file_request.filepath)
+                            for workspace in workspaces.workspaces
+                    )
+                for original_path in original_paths:
+                    original_file = open(original_path, "w+")
+                    original_file.write(unit_analysis_of_file_response.tree.text)
+                    original_file.close()
+
+        if checkpoint_journal is not None:
+            checkpoint_journal.finish_source(file)
+        if cache is not None:
+            cache.close()
+
+def _records(
+    file: str,
+    unit_name: str,
+    request: MutateAlongAllTracesRequest,
+    response: MutateAlongAllTracesResponse,
+    mutation_duration: float,
+) -> Iterator[Dict[str, Any]]:
+    c_syntax = LanguageLibrary.c().syntax
+    kinds = [
+        ("if_condition", c_syntax.is_condition_of_if),
+        ("for_initialisation", c_syntax.is_initialisation_of_for),
+        ("for_condition", c_syntax.is_condition_of_for),
+        ("for_update", c_syntax.is_update_of_for),
+        ("do_while_condition", c_syntax.is_condition_of_do_while),
+        ("while_condition", c_syntax.is_condition_of_while),
+        ("switch_condition", c_syntax.is_condition_of_switch),
+    ]
+
+    yield {
+        "record": UNIT_RECORD,
+        "file": file,
+        "unit": unit_name,
+        "mutation_duration": mutation_duration,
+        "trace_count": response.trace_count,
+        "visits": {
+            location: amount for location, amount in response.amount_visited_locations.items()
+                if location != "" and location is not None
+        },
+        "visited_locations": list(response.visited_locations),
+        "unvisited_locations": list(response.unvisited_locations),
+        "visited_nodes": len(response.visited_nodes),
+        "unvisited_nodes": len(response.unvisited_nodes),
+        "visited_candidates": response.visited_candidates,
+        "unvisited_candidates": response.unvisited_candidates,
+        "visited_mutations": response.visited_mutations,
+        "unvisited_mutations": response.unvisited_mutations,
+        "runs": len(response.random_mutations_runs),
+    }
+
+    for cfa_node, run_result in response.random_mutations_runs:
+        node_kinds = [ kind for kind, is_kind in kinds if is_kind(cfa_node.node) ]
+        yield {
+            "record": NODE_RECORD,
+            "file": file,
+            "unit": unit_name,
+            "location": cfa_node.location,
+            "code": request.tree.contents_of(cfa_node.node),
+            "kinds": node_kinds,
+            "start_byte": cfa_node.node.start_byte,
+            "end_byte": cfa_node.node.end_byte,
+            "mutants": len(run_result.mutation_tests),
+        }
+
+        for mutation_test in run_result.mutation_tests:
+            trace = None
+            if mutation_test.test_results is not None:
+                trace = mutation_test.test_results.trace
+            candidate = mutation_test.candidate
+            yield {
+                "record": MUTANT_RECORD,
+                "file": file,
+                "unit": unit_name,
+                "location": cfa_node.location,
+                "kinds": node_kinds,
+                "node_type": candidate.type,
+                "start_byte": candidate.start_byte,
+                "end_byte": candidate.end_byte,
+                "start_point": list(candidate.start_point),
+                "end_point": list(candidate.end_point),
+                "operator": request.tree.contents_of(candidate),
+                "replacement": mutation_test.mutation.edit.replacement.decode("utf8"),
+                "status": mutation_test.state.value,
+                "cached": mutation_test.cached,
+                "build_duration": mutation_test.build_duration,
+                "test_duration": mutation_test.test_duration,
+                "trace_count": len(request.localised_cfg.split_on_finals(trace)) if trace is not None else 0,
+                "trace_length": len(trace) if trace is not None else 0,
+                "visits": dict(mutation_test.location_visitations.items()),
+            }
+
+def _build_in_workspace(workspace: Workspace, build_command: str) -> None:
+    RunSubsystemUseCase().do(
+        RunSubsystemRequest(
+            workspace.command(build_command),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            cwd=workspace.cwd,
+            timeout=None,
+        )
+    )
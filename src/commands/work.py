@@ -0,0 +1,79 @@
+import os
+import socket
+import time
+from application import (
+    RunTestRequest,
+    RunTestUseCase,
+)
+from test_results_parsing import ResultsParserFactory
+from work_queue import WorkQueue
+from workspace import Workspace
+
+def work(
+    queue: str,
+    build_command: str,
+    test_command: str,
+    out: str = "",
+    base: str = "",
+    testing_backend: str = "ffs_gnu_assert",
+    idle_timeout: float = 10.0,
+) -> None:
+    # The mutants are built and tested in a copy of the base directory,
+    #   such that any amount of workers can run next to the coordinator
+    work_queue = WorkQueue(queue)
+    workspace = Workspace.create(base, [ f'{base}/{out}' ])
+    worker = f'{socket.gethostname()}:{os.getpid()}'
+    idle_since = time.perf_counter()
+    try:
+        while True:
+            # Step 1: Claim the next job, and stop once there have been
+            #   none for a while
+            job = work_queue.claim(worker)
+            if job is None:
+                if time.perf_counter() - idle_since > idle_timeout:
+                    return
+                time.sleep(0.5)
+                continue
+
+            # Step 2: Write the mutant into the workspace, keeping what
+            #   was there such that the next job starts from it
+            file_path = workspace.path(f'{base}/{job.file}')
+            file = open(file_path, "rb")
+            previous = file.read()
+            file.close()
+            file = open(file_path, "wb")
+            file.write(job.apply_to(work_queue.source(job.source)))
+            file.close()
+
+            # Step 3: Build and test the mutant
+            try:
+                run_test_response = RunTestUseCase().do(
+                    RunTestRequest(
+                        workspace.command(build_command),
+                        workspace.command(test_command),
+                        cwd=workspace.cwd,
+                        env=job.env,
+                        results_parser=ResultsParserFactory().create(testing_backend),
+                        abort_on_failure=job.abort_on_failure,
+                        build_timeout=job.build_timeout,
+                        test_timeout=job.test_timeout,
+                        binary_trace=job.binary_trace,
+                    )
+                )
+            finally:
+                file = open(file_path, "wb")
+                file.write(previous)
+                file.close()
+
+            # Step 4: Hand the results to the coordinator
+            work_queue.complete(
+                job.identifier,
+                run_test_response.test_results,
+                run_test_response.timed_out or run_test_response.build_timed_out,
+                run_test_response.build_failed,
+            )
+            print(f'Tested job {job.identifier} of {job.file}')
+            idle_since = time.perf_counter()
+    finally:
+        work_queue.close()
+        workspace.remove()
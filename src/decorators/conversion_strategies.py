@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Set
 from cfa import CFANode, CFA, CFAEdge
 from . import LocalisedCFA
 
@@ -8,7 +8,7 @@ class EdgeConversionStrategy(ABC):
     def convert_edges(
         self,
         edges: List[CFAEdge],
-        converted_edges:List[CFAEdge],
+        converted_edges: Set[CFAEdge],
         localised_cfa: CFA,
         converted_nodes: List[CFANode]
     ):
@@ -19,7 +19,7 @@ class CFANodeToLocationConversionStrategy(EdgeConversionStrategy):
     def convert_edges(
         self,
         edges: List[CFAEdge],
-        converted_edges: List[CFAEdge],
+        converted_edges: Set[CFAEdge],
         localised_cfa: LocalisedCFA,
         converted_nodes: List[CFANode]
     ):
@@ -30,4 +30,4 @@ class CFANodeToLocationConversionStrategy(EdgeConversionStrategy):
                 converted_nodes[edge.destination],
                 edge.label
             )
-            converted_edges.append(edge)
\ No newline at end of file
+            converted_edges.add(edge)
\ No newline at end of file
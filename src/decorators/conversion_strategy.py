@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Set
 from cfa import CFANode, CFAEdge
 from cfa import LocalisedCFA
 
@@ -6,7 +6,7 @@ class ConversionStrategy:
     def convert_edges(
         self,
         edges: List[CFAEdge],
-        converted_edges: List[CFAEdge],
+        converted_edges: Set[CFAEdge],
         localised_cfa: LocalisedCFA,
         converted_nodes: List[CFANode]
     ):
@@ -17,4 +17,4 @@ class ConversionStrategy:
                 converted_nodes[edge.destination],
                 edge.label
             )
-            converted_edges.append(edge)
\ No newline at end of file
+            converted_edges.add(edge)
\ No newline at end of file
@@ -1,6 +1,6 @@
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Set
 from cfa import CFAEdge
 from cfa import LocalisedCFA, LocalisedNode
 from .tweet_handler import TweetHandler
@@ -14,7 +14,7 @@ class DecorationStrategy(ABC):
     def decorate_frontier(
         self,
         frontier: List[LocalisedNode],
-        visited: List[LocalisedNode],
+        visited: Set[LocalisedNode],
         location: str,
         edge: CFAEdge[LocalisedNode]
     ): pass
@@ -30,7 +30,7 @@ class StandardDecorationStrategy(DecorationStrategy):
     def decorate_frontier(
         self,
         frontier: List[LocalisedNode],
-        visited: List[LocalisedNode],
+        visited: Set[LocalisedNode],
         location: str,
         edge: CFAEdge[LocalisedNode]
     ):
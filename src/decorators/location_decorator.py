@@ -1,5 +1,5 @@
 
-from typing import List, Dict
+from typing import List, Dict, Set
 from ts.c_syntax import CSyntax
 from ts import Tree
 from cfa import CFANode, CFA, CFAEdge
@@ -39,13 +39,13 @@ class LocationDecorator():
 
         # Step 2: Propagate seeds downwards
         frontier: List[LocalisedNode] = list()
-        visited: List[LocalisedNode] = list()
+        visited: Set[LocalisedNode] = set()
         frontier.append(localised_cfa.root)
 
         while len(frontier) > 0:
             cfa_node = frontier.pop(-1)
             location = cfa_node.location
-            visited.append(cfa_node)
+            visited.add(cfa_node)
             for edge in localised_cfa.outgoing_edges(cfa_node):
                 self.decoration_strategy.decorate_frontier(frontier, visited, location, edge)
 
@@ -57,6 +57,7 @@ class LocationDecorator():
                 # We can assume that each case is followed by a location tweet
                 cfa_node.location = outgoings[0].location
 
+        localised_cfa.locations_changed()
         return localised_cfa
 
     def convert_cfa_to_localised(self, cfa: CFA[CFANode]) -> LocalisedCFA:
@@ -70,7 +71,7 @@ class LocationDecorator():
         )
 
         # Step 2: Reconstruct all edges
-        converted_edges: List[CFAEdge[CFANode]] = list()
+        converted_edges: Set[CFAEdge[CFANode]] = set()
         for cfa_node in cfa.nodes:
             self.edge_converter.convert_edges(
                 cfa.outgoing_edges(cfa_node),
@@ -0,0 +1 @@
+from .fork_server_runner import *
@@ -0,0 +1,171 @@
+import os
+import shlex
+import signal
+import subprocess
+import threading
+from typing import IO, Any, Dict, Iterator, Tuple
+from test_results_parsing import ResultsParser, TestResults, read_lines
+
+CANARY_FORK_SERVER = "CANARY_FORK_SERVER"
+
+# Lines the fork server writes between the output of its runs
+FORK_SERVER_READY = "CanaryForkServer=Ready"
+FORK_SERVER_CHILD = "CanaryForkServer=Child "
+FORK_SERVER_DONE = "CanaryForkServer=Done"
+
+# Runs the tests through a test program which calls CANARY_FORK_SERVER()
+#   first thing in main, see CanaryForkServer.h. The program is started
+#   once, and forks a child for every run, which saves the start up of
+#   the program for every mutant of a schemata. A runner is used by one
+#   thread at a time, and has to be closed once the program is rebuilt
+class ForkServerRunner:
+    def __init__(self, test_command: str, cwd: str = None) -> None:
+        self._test_command = test_command
+        self._cwd = cwd
+        self._process: subprocess.Popen = None
+        self._lines: Iterator[str] = None
+        # None until started, False if the program is no fork server
+        self._available: bool = None
+        self._child: int = None
+        self._done = False
+
+    @property
+    def available(self) -> bool:
+        # None if it has not been started yet
+        return self._available
+
+    def run(
+        self,
+        env: Dict[str, str],
+        results_parser: ResultsParser,
+        abort_on_failure: bool = False,
+        timeout: float = None,
+        test_output: IO[Any] = None,
+    ) -> Tuple[TestResults, bool]:
+        # None if the tests could not be run by the fork server, in
+        #   which case they have to be run as usual
+        if not self._start(timeout):
+            return None
+
+        # Step 1: Hand the environment of the run to the fork server
+        self._child = None
+        self._done = False
+        try:
+            for name, value in (env or dict()).items():
+                self._process.stdin.write(f'{name}={value}\n')
+            self._process.stdin.write("\n")
+            self._process.stdin.flush()
+        except OSError:
+            self.close()
+            return None
+
+        # Step 2: Parse the output of the child, the fork server is
+        #   killed along with it if it runs out of time
+        timed_out = threading.Event()
+        process = self._process
+        def kill() -> None:
+            timed_out.set()
+            self._kill(process)
+        timer: threading.Timer = None
+        if timeout is not None:
+            timer = threading.Timer(timeout, kill)
+            timer.start()
+        try:
+            lines = self._run_lines(test_output)
+            test_results = results_parser.parse(lines, abort_on_failure)
+
+            if abort_on_failure and test_results is not None and \
+                (test_results.summary.failure_count or 0) > 0:
+                self._kill_child()
+
+            # The rest of the output is read up to the end of the run
+            for _ in lines: pass
+        finally:
+            if timer is not None: timer.cancel()
+
+        # Step 3: A fork server which died is started again on the next
+        #   run, if it died before forking the tests are run as usual
+        if not self._done:
+            self.close()
+            self._available = None
+            if self._child is None and not timed_out.is_set():
+                return None
+        return test_results, timed_out.is_set()
+
+    def close(self) -> None:
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+        self._kill(self._process)
+        self._process.wait()
+        self._process.stdout.close()
+        self._process = None
+        self._lines = None
+
+    def _start(self, timeout: float = None) -> bool:
+        if self._available is False:
+            return False
+        if self._process is not None:
+            return True
+
+        self._process = subprocess.Popen(
+            shlex.split(self._test_command),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            cwd=self._cwd,
+            env={ **os.environ, CANARY_FORK_SERVER: "1" },
+            text=True,
+            errors="replace",
+            start_new_session=True,
+        )
+        self._lines = read_lines(self._process.stdout)
+
+        # A program which does not announce itself runs the tests as
+        #   usual, so it is not used again. Neither is one which does not
+        #   announce itself in time, it is killed once the time is up
+        timer: threading.Timer = None
+        if timeout is not None:
+            timer = threading.Timer(timeout, self._kill, [ self._process ])
+            timer.start()
+        try:
+            self._available = next(self._lines, None) == FORK_SERVER_READY
+        finally:
+            if timer is not None: timer.cancel()
+        if not self._available:
+            self.close()
+        return self._available
+
+    def _run_lines(self, test_output: IO[Any]) -> Iterator[str]:
+        for line in self._lines:
+            if line.startswith(FORK_SERVER_CHILD):
+                self._child = int(line[len(FORK_SERVER_CHILD):])
+                continue
+            # The output of the child need not end with a newline
+            done = line.find(FORK_SERVER_DONE)
+            if done >= 0:
+                line = line[:done]
+            if len(line) > 0 or done < 0:
+                if test_output is not None:
+                    test_output.write(line + "\n")
+                yield line
+            if done >= 0:
+                self._done = True
+                return
+
+    def _kill_child(self) -> None:
+        if self._child is None:
+            return
+        try:
+            os.kill(self._child, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def _kill(self, process: subprocess.Popen) -> None:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
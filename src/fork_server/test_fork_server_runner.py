@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+from unittest import TestCase
+from test_results_parsing import CuTestResultsParser
+from . import *
+
+# Follows the protocol of CanaryForkServer.h, the tests report which
+#   run of the server they are
+FAKE_FORK_SERVER = """import os, sys
+if "CANARY_FORK_SERVER" not in os.environ:
+    print("..\\n\\nOK (2 tests)")
+    sys.exit(0)
+print("CanaryForkServer=Ready", flush=True)
+runs = 0
+while True:
+    env = dict()
+    line = sys.stdin.readline()
+    while line not in [ "", "\\n" ]:
+        name, value = line[:-1].split("=", 1)
+        env[name] = value
+        line = sys.stdin.readline()
+    if line == "": sys.exit(0)
+    runs += 1
+    print(f"CanaryForkServer=Child {os.getpid()}")
+    print(f"Location={runs}")
+    if env.get("RESULT") == "failure":
+        print("F\\n\\nThere was 1 failure:\\n", end="")
+    else: print("..\\n\\nOK (2 tests)", end="")
+    print("CanaryForkServer=Done 0", flush=True)
+"""
+
+class TestForkServerRunner(TestCase):
+    def setUp(self) -> None:
+        self._path = os.path.join(tempfile.mkdtemp(), "tests.py")
+        with open(self._path, "w+") as file:
+            file.write(FAKE_FORK_SERVER)
+
+    def test_runs_share_the_server(self) -> None:
+        runner = ForkServerRunner(f'{sys.executable} {self._path}')
+        try:
+            first, first_timed_out = runner.run(None, CuTestResultsParser())
+            second, _ = runner.run(None, CuTestResultsParser())
+        finally:
+            runner.close()
+
+        self.assertTrue(runner.available)
+        self.assertFalse(first_timed_out)
+        self.assertEqual(first.summary.success_count, 2)
+        self.assertEqual(first.trace.ids, [ "1" ])
+        self.assertEqual(second.trace.ids, [ "2" ])
+
+    def test_environment_of_a_run(self) -> None:
+        runner = ForkServerRunner(f'{sys.executable} {self._path}')
+        try:
+            test_results, _ = runner.run(
+                { "RESULT": "failure" }, CuTestResultsParser()
+            )
+        finally:
+            runner.close()
+
+        self.assertEqual(test_results.summary.failure_count, 1)
+
+    def test_not_a_fork_server(self) -> None:
+        runner = ForkServerRunner(f'{sys.executable} -c "print(1)"')
+        self.assertIsNone(runner.run(None, CuTestResultsParser()))
+        self.assertFalse(runner.available)
+
+    def test_does_not_announce_itself_in_time(self) -> None:
+        runner = ForkServerRunner(f'{sys.executable} -c "import time; time.sleep(60)"')
+        self.assertIsNone(runner.run(None, CuTestResultsParser(), timeout=0.5))
+        self.assertFalse(runner.available)
@@ -0,0 +1,3 @@
+from .compile_command import *
+from .compilation_database import *
+from .incremental_build import *
@@ -0,0 +1,88 @@
+import json
+import os
+import re
+import shlex
+from typing import List
+from .compile_command import CompileCommand
+
+ENTERING_DIRECTORY_PATTERN = re.compile(r"^\S*make(\[[0-9]+\])?: Entering directory [`'](.*)'$")
+LEAVING_DIRECTORY_PATTERN = re.compile(r"^\S*make(\[[0-9]+\])?: Leaving directory [`'](.*)'$")
+
+class CompilationDatabase:
+    def __init__(
+        self,
+        compile_commands: List[CompileCommand],
+        link_commands: List[CompileCommand] = None,
+    ) -> None:
+        self._compile_commands = compile_commands
+        self._link_commands = link_commands
+
+    @property
+    def compile_commands(self) -> List[CompileCommand]:
+        return self._compile_commands
+
+    @property
+    def link_commands(self) -> List[CompileCommand]:
+        # None when the database does not know how the project is linked
+        return self._link_commands
+
+    @classmethod
+    def from_json(cls, path: str) -> "CompilationDatabase":
+        file = open(path, "r")
+        entries = json.load(file)
+        file.close()
+
+        compile_commands: List[CompileCommand] = list()
+        for entry in entries:
+            if "arguments" in entry:
+                arguments = entry["arguments"]
+            else: arguments = shlex.split(entry["command"])
+            compile_commands.append(
+                CompileCommand(entry["directory"], arguments)
+            )
+        return CompilationDatabase(compile_commands)
+
+    @classmethod
+    def from_dry_run(cls, output: str, directory: str) -> "CompilationDatabase":
+        compile_commands: List[CompileCommand] = list()
+        link_commands: List[CompileCommand] = list()
+        directories: List[str] = [ directory ]
+        for line in output.replace("\\\n", " ").splitlines():
+            entering = ENTERING_DIRECTORY_PATTERN.match(line)
+            if entering is not None:
+                directories.append(entering.group(2))
+                continue
+            if LEAVING_DIRECTORY_PATTERN.match(line) is not None:
+                if len(directories) > 1: directories.pop()
+                continue
+
+            try:
+                tokens = shlex.split(line)
+            except ValueError:
+                continue
+
+            # A line may hold several commands, as in "cd build && cc ..."
+            current_directory = directories[-1]
+            commands: List[List[str]] = [ list() ]
+            for token in tokens:
+                if token in [ "&&", ";" ]: commands.append(list())
+                else: commands[-1].append(token)
+            for arguments in commands:
+                if len(arguments) == 0:
+                    continue
+                if arguments[0] == "cd" and len(arguments) > 1:
+                    current_directory = os.path.join(current_directory, arguments[1])
+                    continue
+                command = CompileCommand(current_directory, arguments)
+                if command.is_compile:
+                    compile_commands.append(command)
+                elif command.is_compiler or command.is_archiver:
+                    link_commands.append(command)
+        return CompilationDatabase(compile_commands, link_commands)
+
+    def commands_for(self, file: str) -> List[CompileCommand]:
+        file = os.path.normpath(file)
+        return [
+            command for command in self._compile_commands
+                if file in command.files
+        ]
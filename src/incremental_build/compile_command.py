@@ -0,0 +1,103 @@
+import os
+import re
+import shlex
+from typing import Callable, List
+
+COMPILER_PATTERN = re.compile(r"^(.*-)?(cc|gcc|clang|c\+\+|g\+\+|clang\+\+)(-[0-9.]+)?$")
+ARCHIVER_PATTERN = re.compile(r"^(.*-)?(ar|ranlib)$")
+SOURCE_SUFFIXES = [ ".c", ".cc", ".cpp", ".cxx", ".s", ".S" ]
+
+class CompileCommand:
+    def __init__(self, directory: str, arguments: List[str]) -> None:
+        self._directory = directory
+        self._arguments = arguments
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def arguments(self) -> List[str]:
+        return self._arguments
+
+    @property
+    def command(self) -> str:
+        return " ".join(shlex.quote(argument) for argument in self._arguments)
+
+    @property
+    def is_compiler(self) -> bool:
+        return len(self._arguments) > 0 and \
+            COMPILER_PATTERN.match(os.path.basename(self._arguments[0])) is not None
+
+    @property
+    def is_archiver(self) -> bool:
+        return len(self._arguments) > 0 and \
+            ARCHIVER_PATTERN.match(os.path.basename(self._arguments[0])) is not None
+
+    @property
+    def is_compile(self) -> bool:
+        return self.is_compiler and "-c" in self._arguments
+
+    @property
+    def files(self) -> List[str]:
+        return [
+            self.path(argument) for argument in self._arguments[1:]
+                if os.path.splitext(argument)[1] in SOURCE_SUFFIXES
+        ]
+
+    @property
+    def output(self) -> str:
+        for idx, argument in enumerate(self._arguments[:-1]):
+            if argument == "-o":
+                return self.path(self._arguments[idx + 1])
+        return None
+
+    @property
+    def object_file(self) -> str:
+        # Compiling without "-o" leaves the object in the directory
+        if self.output is not None or not self.is_compile:
+            return self.output
+        files = self.files
+        if len(files) != 1:
+            return None
+        return self.path(os.path.splitext(os.path.basename(files[0]))[0] + ".o")
+
+    def path(self, path: str) -> str:
+        return os.path.normpath(os.path.join(self._directory, path))
+
+    def dependency_scan(self) -> "CompileCommand":
+        # Lists the headers of the translation unit instead of compiling it
+        arguments: List[str] = list()
+        skip = False
+        for argument in self._arguments:
+            if skip:
+                skip = False
+            elif argument in [ "-o", "-MF", "-MT", "-MQ" ]:
+                skip = True
+            elif argument not in [ "-c", "-MD", "-MMD", "-MP" ]:
+                arguments.append(argument)
+        return CompileCommand(self._directory, arguments + [ "-M" ])
+
+    def translate(self, translation: Callable[[str], str]) -> "CompileCommand":
+        return CompileCommand(
+            translation(self._directory),
+            [ self._translate_argument(argument, translation) for argument in self._arguments ]
+        )
+
+    def _translate_argument(self, argument: str, translation: Callable[[str], str]) -> str:
+        # Handles both plain paths and options such as "-I/path"
+        for prefix in [ "-I", "-iquote", "-isystem", "-L", "-o", "" ]:
+            if argument.startswith(prefix) and os.path.isabs(argument[len(prefix):]):
+                return prefix + translation(argument[len(prefix):])
+        return argument
+
+    @staticmethod
+    def parse_dependencies(output: str) -> List[str]:
+        # Make rules such as "a.o: a.c a.h \\" spanning several lines
+        contents = output.replace("\\\n", " ")
+        dependencies: List[str] = list()
+        for line in contents.splitlines():
+            if ":" not in line:
+                continue
+            dependencies.extend(line.split(":", 1)[1].split())
+        return dependencies
@@ -0,0 +1,50 @@
+import hashlib
+import os
+from typing import Callable, List
+from .compile_command import CompileCommand
+
+class IncrementalBuild:
+    def __init__(
+        self,
+        compile_commands: List[CompileCommand],
+        link_commands: List[CompileCommand] = None,
+    ) -> None:
+        self._compile_commands = compile_commands
+        self._link_commands = link_commands
+
+    @property
+    def compile_commands(self) -> List[CompileCommand]:
+        return self._compile_commands
+
+    @property
+    def link_commands(self) -> List[CompileCommand]:
+        # None when the full build command has to do the linking
+        return self._link_commands
+
+    @property
+    def commands(self) -> List[CompileCommand]:
+        return self._compile_commands + (self._link_commands or list())
+
+    def object_digest(self) -> str:
+        # A hash of the objects of the compile commands, None if any of
+        #   them has not been compiled
+        digest = hashlib.sha256()
+        for command in self._compile_commands:
+            path = command.object_file
+            if path is None or not os.path.isfile(path):
+                return None
+            file = open(path, "rb")
+            digest.update(file.read())
+            file.close()
+        return digest.hexdigest()
+
+    def translate(self, translation: Callable[[str], str]) -> "IncrementalBuild":
+        link_commands = None
+        if self._link_commands is not None:
+            link_commands = [
+                command.translate(translation) for command in self._link_commands
+            ]
+        return IncrementalBuild(
+            [ command.translate(translation) for command in self._compile_commands ],
+            link_commands
+        )
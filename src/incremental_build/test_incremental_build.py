@@ -0,0 +1,132 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from . import *
+
+class TestCompileCommand(TestCase):
+    def test_is_compile(self) -> None:
+        compile_command = CompileCommand("/project", [ "gcc", "-c", "-o", "a.o", "a.c" ])
+        link_command = CompileCommand("/project", [ "gcc", "-o", "tests", "a.o" ])
+        archive_command = CompileCommand("/project", [ "ar", "rcs", "liba.a", "a.o" ])
+        self.assertTrue(compile_command.is_compile)
+        self.assertFalse(link_command.is_compile)
+        self.assertTrue(link_command.is_compiler)
+        self.assertTrue(archive_command.is_archiver)
+        self.assertFalse(CompileCommand("/project", [ "echo", "-c" ]).is_compiler)
+
+    def test_files_and_output(self) -> None:
+        command = CompileCommand("/project/build", [ "cc", "-c", "../src/a.c", "-o", "a.o" ])
+        self.assertEqual(command.files, [ "/project/src/a.c" ])
+        self.assertEqual(command.output, "/project/build/a.o")
+
+    def test_object_file(self) -> None:
+        self.assertEqual(
+            CompileCommand("/project", [ "gcc", "-c", "src/a.c" ]).object_file, "/project/a.o"
+        )
+        self.assertEqual(
+            CompileCommand("/project", [ "gcc", "-c", "a.c", "-o", "b.o" ]).object_file, "/project/b.o"
+        )
+        self.assertIsNone(CompileCommand("/project", [ "gcc", "-c", "a.c", "b.c" ]).object_file)
+
+    def test_dependency_scan(self) -> None:
+        command = CompileCommand(
+            "/project", [ "gcc", "-MMD", "-MF", "a.d", "-Iinclude", "-c", "a.c", "-o", "a.o" ]
+        )
+        self.assertEqual(
+            command.dependency_scan().arguments,
+            [ "gcc", "-Iinclude", "a.c", "-M" ]
+        )
+
+    def test_parse_dependencies(self) -> None:
+        output = "a.o: a.c include/a.h \\\n include/b.h\n"
+        self.assertEqual(
+            CompileCommand.parse_dependencies(output),
+            [ "a.c", "include/a.h", "include/b.h" ]
+        )
+
+    def test_translate(self) -> None:
+        command = CompileCommand(
+            "/project", [ "gcc", "-I/project/include", "-c", "/project/a.c", "-o", "a.o" ]
+        )
+        translated = command.translate(lambda path: path.replace("/project", "/workspace"))
+        self.assertEqual(translated.directory, "/workspace")
+        self.assertEqual(
+            translated.arguments,
+            [ "gcc", "-I/workspace/include", "-c", "/workspace/a.c", "-o", "a.o" ]
+        )
+
+class TestCompilationDatabase(TestCase):
+    def test_from_json(self) -> None:
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "compile_commands.json")
+        with open(path, "w+") as file:
+            json.dump([
+                { "directory": "/project", "command": "cc -c a.c -o a.o", "file": "a.c" },
+                { "directory": "/project", "arguments": [ "cc", "-c", "b.c" ], "file": "b.c" },
+            ], file)
+
+        database = CompilationDatabase.from_json(path)
+        self.assertEqual(len(database.compile_commands), 2)
+        self.assertIsNone(database.link_commands)
+        self.assertEqual(
+            database.commands_for("/project/./b.c")[0].arguments,
+            [ "cc", "-c", "b.c" ]
+        )
+
+    def test_from_dry_run(self) -> None:
+        output = "\n".join([
+            "make: Entering directory '/project'",
+            "gcc -c src/a.c -o a.o",
+            "cd lib && gcc -c b.c \\",
+            "  -o b.o",
+            "make[1]: Entering directory '/project/test'",
+            "gcc -c tests.c -o tests.o",
+            "make[1]: Leaving directory '/project/test'",
+            "gcc -o tests a.o lib/b.o test/tests.o",
+            "echo done",
+            "make: Leaving directory '/project'",
+        ])
+
+        database = CompilationDatabase.from_dry_run(output, "/")
+        self.assertEqual(
+            [ command.directory for command in database.compile_commands ],
+            [ "/project", "/project/lib", "/project/test" ]
+        )
+        self.assertEqual(len(database.link_commands), 1)
+        self.assertEqual(database.link_commands[0].output, "/project/tests")
+        self.assertEqual(len(database.commands_for("/project/lib/b.c")), 1)
+        self.assertEqual(len(database.commands_for("/project/c.c")), 0)
+
+class TestIncrementalBuild(TestCase):
+    def test_commands(self) -> None:
+        compile_command = CompileCommand("/project", [ "gcc", "-c", "a.c" ])
+        link_command = CompileCommand("/project", [ "gcc", "-o", "tests", "a.o" ])
+        self.assertEqual(
+            IncrementalBuild([ compile_command ], [ link_command ]).commands,
+            [ compile_command, link_command ]
+        )
+        self.assertEqual(
+            IncrementalBuild([ compile_command ]).commands, [ compile_command ]
+        )
+
+    def test_object_digest(self) -> None:
+        directory = tempfile.mkdtemp()
+        incremental_build = IncrementalBuild(
+            [ CompileCommand(directory, [ "gcc", "-c", "a.c" ]) ]
+        )
+        self.assertIsNone(incremental_build.object_digest())
+        with open(os.path.join(directory, "a.o"), "wb") as file:
+            file.write(b"object")
+        digest = incremental_build.object_digest()
+        self.assertIsNotNone(digest)
+        with open(os.path.join(directory, "a.o"), "wb") as file:
+            file.write(b"other object")
+        self.assertNotEqual(incremental_build.object_digest(), digest)
+
+    def test_translate(self) -> None:
+        incremental_build = IncrementalBuild(
+            [ CompileCommand("/project", [ "gcc", "-c", "a.c" ]) ]
+        ).translate(lambda path: path.replace("/project", "/workspace"))
+        self.assertEqual(incremental_build.compile_commands[0].directory, "/workspace")
+        self.assertIsNone(incremental_build.link_commands)
@@ -1,3 +1,6 @@
+from .binary_trace_parser import *
+from .coverage import *
+from .coverage_map import *
 from .location import *
 from .test import *
 from .trace_parser import *
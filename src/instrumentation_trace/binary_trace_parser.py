@@ -0,0 +1,87 @@
+import os
+import struct
+from array import array
+from typing import Dict, List
+from .coverage import Coverage
+from .test import Test
+from .trace import Trace, TraceTable
+from .unit import Unit
+
+CANARY_TRACE_FILE = "CANARY_TRACE_FILE"
+
+# The operations of the records written by Canary.h to CANARY_TRACE_FILE
+TRACE_LOCATION = 1
+TRACE_BEGIN_TEST = 2
+TRACE_END_TEST = 3
+TRACE_BEGIN_UNIT = 4
+TRACE_END_UNIT = 5
+TRACE_COUNT = 6
+
+# A record is an operation and an id, both native unsigned ints. The
+#   records which begin a test or a unit are followed by its name, of
+#   the length given by the id and padded to a multiple of a record. A
+#   count of a location is followed by a record holding the count
+RECORD_SIZE = 8
+
+# Decodes a binary trace directly into the compact trace, with the same
+#   meaning as the lines read by the TraceParser
+class BinaryTraceParser():
+    def parse(self, data: bytes) -> Trace:
+        records = array("I")
+        records.frombytes(data[:len(data) - len(data) % RECORD_SIZE])
+
+        table = TraceTable()
+        locations = array("I")
+        units = array("I")
+        tests = array("I")
+        location_index: Dict[int, int] = dict()
+        counts: Dict[str, int] = dict()
+        unit_stack: List[int] = list()
+        unit = 0
+        test = 0
+
+        idx = 0
+        count = len(records)
+        while idx + 1 < count:
+            operation = records[idx]
+            value = records[idx + 1]
+            idx += 2
+            if operation == TRACE_LOCATION:
+                index = location_index.get(value, None)
+                if index is None:
+                    index = table.intern_id(str(value))
+                    location_index[value] = index
+                locations.append(index)
+                units.append(unit)
+                tests.append(test)
+            elif operation == TRACE_BEGIN_TEST or operation == TRACE_BEGIN_UNIT:
+                start = idx * records.itemsize
+                name = data[start:start + value].decode("utf8", errors="replace")
+                idx += (value + RECORD_SIZE - 1) // RECORD_SIZE * RECORD_SIZE // records.itemsize
+                if operation == TRACE_BEGIN_TEST:
+                    test = table.intern_test(Test(name))
+                else:
+                    unit = table.intern_unit(Unit(name))
+                    unit_stack.append(unit)
+            elif operation == TRACE_COUNT:
+                if idx + 1 >= count: break
+                location = str(value)
+                counts[location] = counts.get(location, 0) + \
+                    struct.unpack_from("=Q", data, idx * records.itemsize)[0]
+                idx += 2
+            elif operation == TRACE_END_UNIT:
+                if len(unit_stack) > 0: unit_stack.pop()
+                unit = unit_stack[-1] if len(unit_stack) > 0 else 0
+            # The test is kept until the next one begins, as the TraceTreeBuilder does
+
+        return Trace.compact(
+            table, locations, units, tests,
+            Coverage(counts) if len(counts) > 0 else None,
+        )
+
+    def parse_file(self, path: str) -> Trace:
+        # None if the tests did not write a trace
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as file:
+            return self.parse(file.read())
@@ -0,0 +1,46 @@
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# The amount of times each location is visited, in the order the
+#   locations are first visited
+class Coverage():
+    def __init__(self, counts: Dict[str, int] = None) -> None:
+        self._counts: Dict[str, int] = counts if counts is not None else dict()
+
+    @classmethod
+    def merged(cls, coverages: Iterable["Coverage"]) -> "Coverage":
+        coverage = Coverage()
+        for other in coverages:
+            coverage.update(other)
+        return coverage
+
+    @property
+    def visited(self) -> List[str]:
+        return list(self._counts)
+
+    @property
+    def total(self) -> int:
+        return sum(self._counts.values())
+
+    def __getitem__(self, location: str) -> int:
+        return self._counts.get(location, 0)
+
+    def __contains__(self, location: str) -> bool:
+        return location in self._counts
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._counts)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def items(self) -> Iterable[Tuple[str, int]]:
+        return self._counts.items()
+
+    def update(self, other: "Coverage") -> "Coverage":
+        # Only walks the distinct locations of the other coverage
+        for location, count in other.items():
+            self._counts[location] = self._counts.get(location, 0) + count
+        return self
+
+    def merge(self, other: "Coverage") -> "Coverage":
+        return Coverage(dict(self._counts)).update(other)
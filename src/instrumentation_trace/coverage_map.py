@@ -0,0 +1,41 @@
+from typing import Dict, Iterable, Iterator, Set
+from .trace import Trace
+
+# The tests which visit each location, such that a mutant of a location
+#   only has to be tested by the tests which can observe it
+class CoverageMap():
+    def __init__(self, tests: Dict[str, Set[str]] = None) -> None:
+        # A None test is a visit outside of any test, which any test
+        #   could have caused
+        self._tests: Dict[str, Set[str]] = tests if tests is not None else dict()
+
+    @classmethod
+    def of(cls, trace: Trace) -> "CoverageMap":
+        # Only walks the distinct pairs of location and test
+        table = trace.table
+        tests: Dict[str, Set[str]] = dict()
+        for location, test in set(zip(trace.locations, trace.tests)):
+            test = table.tests[test]
+            tests.setdefault(table.ids[location], set()).add(
+                test.name if test is not None else None
+            )
+        return cls(tests)
+
+    def tests_of(self, locations: Iterable[str]) -> Set[str]:
+        # None if all the tests have to be run, empty if no test
+        #   visits any of the locations
+        tests: Set[str] = set()
+        for location in locations:
+            tests.update(self._tests.get(location, set()))
+        if None in tests:
+            return None
+        return tests
+
+    def __contains__(self, location: str) -> bool:
+        return location in self._tests
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tests)
+
+    def __len__(self) -> int:
+        return len(self._tests)
@@ -0,0 +1,80 @@
+import struct
+import unittest
+
+from . import (
+    BinaryTraceParser,
+    TraceParser,
+    TraceTreeBuilder,
+    TRACE_LOCATION,
+    TRACE_BEGIN_TEST,
+    TRACE_END_TEST,
+    TRACE_BEGIN_UNIT,
+    TRACE_END_UNIT,
+    TRACE_COUNT,
+)
+
+def record(operation: int, id: int = 0) -> bytes:
+    return struct.pack("=II", operation, id)
+
+def named(operation: int, name: str) -> bytes:
+    padding = (8 - len(name) % 8) % 8
+    return record(operation, len(name)) + bytes(name, "utf8") + bytes(padding)
+
+class TestBinaryTraceParser(unittest.TestCase):
+    def test_same_as_the_lines(self) -> None:
+        data = b"".join([
+            record(TRACE_LOCATION, 7),
+            named(TRACE_BEGIN_TEST, "addTest"),
+            named(TRACE_BEGIN_UNIT, "add"),
+            record(TRACE_LOCATION, 0),
+            record(TRACE_LOCATION, 1),
+            record(TRACE_END_UNIT),
+            record(TRACE_END_TEST),
+            named(TRACE_BEGIN_TEST, "subtractTest"),
+            record(TRACE_LOCATION, 0),
+        ])
+        lines = [
+            "Location=7",
+            "BeginTest=addTest",
+            "BeginUnit=add",
+            "Location=0",
+            "Location=1",
+            "EndUnit=add",
+            "EndTest=addTest",
+            "BeginTest=subtractTest",
+            "Location=0",
+        ]
+        trace_parser = TraceParser(TraceTreeBuilder())
+        trace_parser.parse(lines)
+
+        expected = [
+            (location.test and location.test.name, location.unit and location.unit.name, location.id)
+                for location in trace_parser.finish().sequence
+        ]
+        actual = [
+            (location.test and location.test.name, location.unit and location.unit.name, location.id)
+                for location in BinaryTraceParser().parse(data).sequence
+        ]
+        self.assertEqual(actual, expected)
+        self.assertEqual(actual[1], ("addTest", "add", "0"))
+
+    def test_truncated_record(self) -> None:
+        data = record(TRACE_LOCATION, 1) + record(TRACE_LOCATION, 2)[:5]
+        self.assertEqual(BinaryTraceParser().parse(data).ids, [ "1" ])
+
+    def test_missing_file(self) -> None:
+        self.assertIsNone(BinaryTraceParser().parse_file("/canary/no/such/trace"))
+
+    def test_counts(self) -> None:
+        data = b"".join([
+            named(TRACE_BEGIN_TEST, "addTest"),
+            record(TRACE_COUNT, 3), struct.pack("=Q", 2**40),
+            record(TRACE_END_TEST),
+            record(TRACE_COUNT, 3), struct.pack("=Q", 2),
+            record(TRACE_COUNT, 4), struct.pack("=Q", 1),
+        ])
+        trace = BinaryTraceParser().parse(data)
+        self.assertEqual(len(trace), 0)
+        self.assertEqual(trace.coverage["3"], 2**40 + 2)
+        self.assertEqual(trace.coverage["4"], 1)
+        self.assertTrue("4" in trace)
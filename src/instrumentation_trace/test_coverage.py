@@ -0,0 +1,46 @@
+import unittest
+
+from . import (
+    Coverage,
+    TraceTreeBuilder,
+)
+
+class TestCoverage(unittest.TestCase):
+    def test_trace_coverage(self) -> None:
+        builder = TraceTreeBuilder()
+        builder.start_test("Test") \
+            .start_unit("add") \
+            .enter_location("1") \
+            .enter_location("0") \
+            .enter_location("1") \
+            .end_unit() \
+            .end_test()
+
+        trace = builder.build()
+        coverage = trace.coverage
+
+        self.assertIs(trace.coverage, coverage)
+        self.assertEqual(coverage.visited, [ "1", "0" ])
+        self.assertEqual(coverage["1"], 2)
+        self.assertEqual(coverage["0"], 1)
+        self.assertEqual(coverage["2"], 0)
+        self.assertNotIn("2", coverage)
+        self.assertEqual(coverage.total, 3)
+
+    def test_merge(self) -> None:
+        coverage_1 = Coverage({ "0": 1, "1": 2 })
+        coverage_2 = Coverage({ "2": 1, "1": 1 })
+
+        merged = coverage_1.merge(coverage_2)
+
+        self.assertEqual(dict(merged.items()), { "0": 1, "1": 3, "2": 1 })
+        self.assertEqual(merged.visited, [ "0", "1", "2" ])
+        self.assertEqual(coverage_1["1"], 2)
+
+    def test_merged(self) -> None:
+        merged = Coverage.merged([
+            Coverage({ "0": 1 }), Coverage({ "0": 2 }), Coverage({ "3": 1 })
+        ])
+
+        self.assertEqual(dict(merged.items()), { "0": 3, "3": 1 })
+        self.assertEqual(len(Coverage.merged([])), 0)
@@ -0,0 +1,47 @@
+import unittest
+
+from . import (
+    CoverageMap,
+    TraceTreeBuilder,
+)
+
+class TestCoverageMap(unittest.TestCase):
+    def test_of_trace(self) -> None:
+        builder = TraceTreeBuilder()
+        builder.start_test("Test_1") \
+            .start_unit("add") \
+            .enter_location("0") \
+            .enter_location("1") \
+            .end_unit() \
+            .end_test()
+        builder.start_test("Test_2") \
+            .start_unit("add") \
+            .enter_location("0") \
+            .enter_location("2") \
+            .end_unit() \
+            .end_test()
+
+        coverage_map = CoverageMap.of(builder.build())
+
+        self.assertEqual(len(coverage_map), 3)
+        self.assertEqual(coverage_map.tests_of([ "0" ]), { "Test_1", "Test_2" })
+        self.assertEqual(coverage_map.tests_of([ "1" ]), { "Test_1" })
+        self.assertEqual(coverage_map.tests_of([ "1", "2" ]), { "Test_1", "Test_2" })
+        self.assertEqual(coverage_map.tests_of([ "3" ]), set())
+        self.assertNotIn("3", coverage_map)
+
+    def test_outside_of_tests(self) -> None:
+        builder = TraceTreeBuilder()
+        builder.start_unit("add") \
+            .enter_location("0") \
+            .end_unit()
+        builder.start_test("Test") \
+            .start_unit("add") \
+            .enter_location("1") \
+            .end_unit() \
+            .end_test()
+
+        coverage_map = CoverageMap.of(builder.build())
+
+        self.assertIsNone(coverage_map.tests_of([ "0", "1" ]))
+        self.assertEqual(coverage_map.tests_of([ "1" ]), { "Test" })
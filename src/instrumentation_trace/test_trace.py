@@ -6,7 +6,11 @@ from decorators import (
 )
 
 from . import (
+    Location,
+    Test,
+    Trace,
     TraceTreeBuilder,
+    Unit,
 )
 
 class TestTrace(unittest.TestCase):
@@ -285,4 +289,57 @@ class TestTrace(unittest.TestCase):
         self.assertEqual(len(path), 3)
         self.assertEqual(path[0], cfa_0)
         self.assertEqual(path[1], cfa_1)
-        self.assertEqual(path[2], cfa_2)
\ No newline at end of file
+        self.assertEqual(path[2], cfa_2)
+
+    def test_compact_trace(self) -> None:
+        builder = TraceTreeBuilder()
+        builder.start_test("Test") \
+            .start_unit("add") \
+            .enter_location("0") \
+            .enter_location("1") \
+            .start_unit("sub") \
+            .enter_location("2") \
+            .end_unit() \
+            .enter_location("1") \
+            .end_unit() \
+            .end_test()
+
+        trace = builder.build()
+
+        self.assertEqual(len(trace), 4)
+        self.assertEqual(trace.ids, [ "0", "1", "2", "1" ])
+        self.assertIn("2", trace)
+        self.assertNotIn("3", trace)
+        self.assertEqual(trace.in_unit("add").ids, [ "0", "1", "1" ])
+        self.assertEqual(len(trace.in_unit("mul")), 0)
+        self.assertEqual(dict(trace.coverage.items()), { "0": 1, "1": 2, "2": 1 })
+
+        location = trace.sequence[2]
+        self.assertEqual(location.id, "2")
+        self.assertEqual(location.unit.name, "sub")
+        self.assertEqual(location.test.name, "Test")
+
+    def test_split_on_location(self) -> None:
+        test = Test("Test")
+        unit = Unit("add")
+        trace = Trace([
+            Location(test, unit, id) for id in [ "1", "0", "1", "0", "2" ]
+        ])
+
+        traces = trace.split_on_location("0")
+
+        self.assertEqual([ split.ids for split in traces ], [ [ "1" ], [ "0", "1" ], [ "0", "2" ] ])
+        self.assertNotIn("2", traces[1])
+        self.assertEqual(traces[2].sequence[1].unit.name, "add")
+
+    def test_split_after(self) -> None:
+        test = Test("Test")
+        unit = Unit("add")
+        trace = Trace([
+            Location(test, unit, id) for id in [ "0", "1", "2", "0", "2", "0" ]
+        ])
+
+        traces = trace.split_after([ "2", "3" ])
+
+        self.assertEqual([ split.ids for split in traces ], [ [ "0", "1", "2" ], [ "0", "2" ] ])
+        self.assertEqual(trace.split_after([ "3" ]), [ ])
@@ -256,6 +256,32 @@ class TestTraceParser(unittest.TestCase):
         self.assertEqual(location_10.unit.name, "Tommy1")
         self.assertEqual(location_10.id, "10")
 
+    def test_trace_at_locations(self) -> None:
+        builder = TraceTreeBuilder()
+
+        trace = builder \
+            .start_test("Andreas") \
+            .enter_location("1") \
+            .enter_location("7") \
+            .enter_location("2") \
+            .end_test() \
+            .start_test("Tommy") \
+            .enter_location("8") \
+            .enter_location("1") \
+            .end_test() \
+            .count_location("2", 3) \
+            .count_location("8", 2) \
+            .build()
+
+        actual = trace.at_locations([ "1", "2", "3" ])
+        self.assertEqual(actual.ids, [ "1", "2", "1" ])
+        self.assertEqual(
+            [ location.test.name for location in actual.sequence ],
+            [ "Andreas", "Andreas", "Tommy" ]
+        )
+        self.assertEqual(actual.coverage["2"], 4)
+        self.assertNotIn("8", actual)
+
     def test_parse_single_deferred_trace_no_unit_no_test(self) -> None:
         parser = TraceParser(
             TraceTreeBuilder()
@@ -298,7 +324,7 @@ class TestTraceParser(unittest.TestCase):
             "Location=2"
         ])
 
-        parser.parse(lines)
+        self.assertFalse(parser.parse(lines))
         trace = parser.finish()
         sequence = [ *trace.sequence ]
 
@@ -309,6 +335,25 @@ class TestTraceParser(unittest.TestCase):
         self.assertIsNone(location_1.test)
         self.assertIsNone(location_1.unit)
 
+    def test_parse_counts(self) -> None:
+        parser = TraceParser(
+            TraceTreeBuilder()
+        )
+        lines = [
+            "Location=1",
+            "Count=2:5",
+            "Count=1:3",
+            "Count=2:1",
+        ]
+
+        self.assertTrue(parser.parse(lines))
+        trace = parser.finish()
+
+        self.assertEqual(trace.ids, [ "1" ])
+        self.assertEqual(trace.counts["2"], 6)
+        self.assertEqual(trace.coverage["1"], 4)
+        self.assertEqual(trace.coverage["2"], 6)
+
     def test_parse_trace_log(self) -> None:
         parser = TraceParser(
             TraceTreeBuilder()
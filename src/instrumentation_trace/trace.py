@@ -1,38 +1,258 @@
-from typing import List, Iterable
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Union
+from .coverage import Coverage
 from .location import Location
+from .test import Test
+from .unit import Unit
+
+# Interns the location ids, units and tests of traces, such that a trace
+#   only stores an index into the table for each of them. Index 0 of the
+#   units and tests is reserved for "no unit" and "no test"
+class TraceTable():
+    def __init__(self) -> None:
+        self._ids: List[str] = list()
+        self._id_index: Dict[str, int] = dict()
+        self._units: List[Unit] = [ None ]
+        self._unit_index: Dict[str, int] = dict()
+        self._tests: List[Test] = [ None ]
+        self._test_index: Dict[str, int] = dict()
+
+    @property
+    def ids(self) -> List[str]:
+        return self._ids
+
+    @property
+    def units(self) -> List[Unit]:
+        return self._units
+
+    @property
+    def tests(self) -> List[Test]:
+        return self._tests
+
+    def index_of_id(self, id: str) -> int:
+        # None if the id is not part of any trace in the table
+        return self._id_index.get(id, None)
+
+    def index_of_unit(self, name: str) -> int:
+        return self._unit_index.get(name, None)
+
+    def intern_id(self, id: str) -> int:
+        index = self._id_index.get(id, None)
+        if index is None:
+            index = len(self._ids)
+            self._id_index[id] = index
+            self._ids.append(id)
+        return index
+
+    def intern_unit(self, unit: Unit) -> int:
+        if unit is None: return 0
+        index = self._unit_index.get(unit.name, None)
+        if index is None:
+            index = len(self._units)
+            self._unit_index[unit.name] = index
+            self._units.append(unit)
+        return index
+
+    def intern_test(self, test: Test) -> int:
+        if test is None: return 0
+        index = self._test_index.get(test.name, None)
+        if index is None:
+            index = len(self._tests)
+            self._test_index[test.name] = index
+            self._tests.append(test)
+        return index
+
+# A read-only view of the locations of a trace, which are only
+#   created as they are accessed
+class TraceSequence():
+    def __init__(self, trace: "Trace") -> None:
+        self._trace = trace
+
+    @property
+    def ids(self) -> List[str]:
+        return self._trace.ids
+
+    def __len__(self) -> int:
+        return len(self._trace)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Location, List[Location]]:
+        if isinstance(index, slice):
+            return [ self[idx] for idx in range(*index.indices(len(self))) ]
+        return self._trace._location(index)
+
+    def __iter__(self) -> Iterator[Location]:
+        table = self._trace.table
+        for location, unit, test in zip(
+            self._trace.locations, self._trace.units, self._trace.tests
+        ):
+            yield Location(table.tests[test], table.units[unit], table.ids[location])
 
 class Trace():
     def __init__(
         self,
-        sequence: List[Location] = list()
+        sequence: Iterable[Location] = list(),
+        table: TraceTable = None,
     ) -> None:
-        self._sequence = sequence
+        self._table = table if table is not None else TraceTable()
+        self._locations = array("I")
+        self._units = array("I")
+        self._tests = array("I")
+        self._counts: Coverage = None
+        self._coverage: Coverage = None
+        for location in sequence:
+            self._locations.append(self._table.intern_id(location.id))
+            self._units.append(self._table.intern_unit(location.unit))
+            self._tests.append(self._table.intern_test(location.test))
+
+    @classmethod
+    def compact(
+        cls,
+        table: TraceTable,
+        locations: array,
+        units: array,
+        tests: array,
+        counts: Coverage = None,
+    ) -> "Trace":
+        # The arrays hold indices into the table, they are not copied
+        trace = cls.__new__(cls)
+        trace._table = table
+        trace._locations = locations
+        trace._units = units
+        trace._tests = tests
+        trace._counts = counts
+        trace._coverage = None
+        return trace
+
+    @property
+    def table(self) -> TraceTable:
+        return self._table
+
+    @property
+    def locations(self) -> array:
+        return self._locations
 
     @property
-    def sequence(self) -> Iterable[Location]:
-        return self._sequence
+    def units(self) -> array:
+        return self._units
+
+    @property
+    def tests(self) -> array:
+        return self._tests
+
+    @property
+    def counts(self) -> Coverage:
+        # The visits which were only counted, not traced, None if there
+        #   are none. They are not part of the sequence or its slices
+        return self._counts
+
+    @property
+    def sequence(self) -> TraceSequence:
+        return TraceSequence(self)
+
+    @property
+    def ids(self) -> List[str]:
+        ids = self._table.ids
+        return [ ids[location] for location in self._locations ]
 
     def __len__(self) -> int:
-        return len(self.sequence)
+        return len(self._locations)
 
     def __contains__(self, key: str) -> bool:
-        return key in [ location.id for location in self.sequence ]
+        if self._counts is not None and key in self._counts:
+            return True
+        index = self._table.index_of_id(key)
+        return index is not None and index in self._locations
 
-    def in_unit(self, unit: str) -> Iterable[Location]:
-        result: List[Location] = list()
-        for location in self.sequence:
-            if location.unit.name == unit:
-                result.append(location)
-        return result
+    def in_unit(self, unit: str) -> TraceSequence:
+        index = self._table.index_of_unit(unit)
+        selected = [
+            idx for idx, curr in enumerate(self._units) if curr == index
+        ] if index is not None else list()
+        return Trace.compact(
+            self._table,
+            array("I", [ self._locations[idx] for idx in selected ]),
+            array("I", [ self._units[idx] for idx in selected ]),
+            array("I", [ self._tests[idx] for idx in selected ]),
+        ).sequence
+
+    def at_locations(self, locations: Iterable[str]) -> "Trace":
+        # Only the visits of the locations, such as those of one unit
+        #   when the locations of all units are distinct
+        locations = set(locations)
+        indices = set(
+            self._table.index_of_id(location) for location in locations
+        )
+        selected = [
+            idx for idx, curr in enumerate(self._locations) if curr in indices
+        ]
+        counts: Coverage = None
+        if self._counts is not None:
+            counts = Coverage({
+                location: count for location, count in self._counts.items()
+                    if location in locations
+            })
+        return Trace.compact(
+            self._table,
+            array("I", [ self._locations[idx] for idx in selected ]),
+            array("I", [ self._units[idx] for idx in selected ]),
+            array("I", [ self._tests[idx] for idx in selected ]),
+            counts,
+        )
+
+    @property
+    def coverage(self) -> Coverage:
+        # Counted once per trace, traces are not changed once built
+        if self._coverage is None:
+            ids = self._table.ids
+            self._coverage = Coverage({
+                ids[location]: count for location, count in Counter(self._locations).items()
+            })
+            if self._counts is not None:
+                self._coverage.update(self._counts)
+        return self._coverage
 
     def split_on_location(self, location: str) -> List["Trace"]:
+        # Each trace starts at an occurrence of the location, anything
+        #   before the first occurrence is a trace of its own
+        index = self._table.index_of_id(location)
+        starts = [
+            idx for idx, curr in enumerate(self._locations) if curr == index
+        ] if index is not None else list()
+        if len(starts) == 0 or starts[0] != 0:
+            starts.insert(0, 0)
+        ends = starts[1:] + [ len(self) ]
+        return [
+            self._slice(start, end) for start, end in zip(starts, ends)
+                if start < end
+        ]
+
+    def split_after(self, locations: Iterable[str]) -> List["Trace"]:
+        # Each trace ends at an occurrence of one of the locations,
+        #   anything after the last occurrence is left out
+        indices = set(
+            self._table.index_of_id(location) for location in locations
+        )
+        indices.discard(None)
         traces: List["Trace"] = list()
-        sequence: List[Location] = None
-        for curr in self.sequence:
-            if curr.id == location:
-                if sequence is not None:
-                    traces.append(Trace(sequence))
-                sequence = list()
-            sequence.append(curr)
-        traces.append(sequence)
-        return traces
\ No newline at end of file
+        start = 0
+        for idx, curr in enumerate(self._locations):
+            if curr in indices:
+                traces.append(self._slice(start, idx + 1))
+                start = idx + 1
+        return traces
+
+    def _slice(self, start: int, end: int) -> "Trace":
+        return Trace.compact(
+            self._table,
+            self._locations[start:end],
+            self._units[start:end],
+            self._tests[start:end],
+        )
+
+    def _location(self, index: int) -> Location:
+        return Location(
+            self._table.tests[self._tests[index]],
+            self._table.units[self._units[index]],
+            self._table.ids[self._locations[index]],
+        )
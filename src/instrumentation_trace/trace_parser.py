@@ -2,6 +2,10 @@ from typing import Iterator
 from .trace_tree_builder import TraceTreeBuilder
 from .trace import Trace
 
+# Makes the instrumented program count the visits of each location, which
+#   it writes once at exit, instead of tracing every visit
+CANARY_COVERAGE = "CANARY_COVERAGE"
+
 class TraceParser():
     def __init__(self, builder = TraceTreeBuilder()) -> None:
         self._builder = builder
@@ -12,22 +16,31 @@ class TraceParser():
 
     def parse(self, lines: Iterator[str]) -> bool:
         for line in lines:
-            split_line = line.split("=")
-            action = split_line[0]
-
-            information = split_line[1] if len(split_line) is 2 else None
-
-            if action == "BeginTest":
-                self.builder.start_test(information)
-            elif action == "EndTest":
-                self.builder.end_test()
-            elif action == "BeginUnit":
-                self.builder.start_unit(information)
-            elif action == "EndUnit":
-                self.builder.end_unit()
-            elif action == "Location":
-                self.builder.enter_location(information)
-            else: break
+            if not self.parse_line(line):
+                return False
+        return True
+
+    def parse_line(self, line: str) -> bool:
+        split_line = line.split("=")
+        action = split_line[0]
+
+        information = split_line[1] if len(split_line) is 2 else None
+
+        if action == "BeginTest":
+            self.builder.start_test(information)
+        elif action == "EndTest":
+            self.builder.end_test()
+        elif action == "BeginUnit":
+            self.builder.start_unit(information)
+        elif action == "EndUnit":
+            self.builder.end_unit()
+        elif action == "Location":
+            self.builder.enter_location(information)
+        elif action == "Count" and information is not None and ":" in information:
+            location, count = information.split(":", 1)
+            self.builder.count_location(location, int(count))
+        else: return False
+        return True
 
     def finish(self) -> Trace:
         return self.builder.build()
\ No newline at end of file
@@ -1,14 +1,20 @@
-from typing import List
+from array import array
+from typing import Dict, List
+from .coverage import Coverage
 from .unit import Unit
-from .location import Location
 from .test import Test
-from .trace import Trace
+from .trace import Trace, TraceTable
 
 class TraceTreeBuilder():
     def __init__(self) -> None:
         self._unit_stack: List[Unit] = list()
-        self._sequence: List[Location] = list()
+        self._table = TraceTable()
+        self._locations = array("I")
+        self._units = array("I")
+        self._tests = array("I")
         self._current_test = None
+        self._current_test_index = 0
+        self._counts: Dict[str, int] = dict()
 
     @property
     def current_unit(self) -> Unit:
@@ -25,8 +31,9 @@ class TraceTreeBuilder():
         return len(self._unit_stack)
 
     def start_test(self, test_name: str) -> "TraceTreeBuilder":
-        self._sequence: List[Location] = list()
+        # The trace spans all of the tests, each location knows its test
         self._current_test = Test(test_name)
+        self._current_test_index = self._table.intern_test(self._current_test)
         return self
 
     def start_unit(self, unit_name: str) -> "TraceTreeBuilder":
@@ -39,12 +46,18 @@ class TraceTreeBuilder():
         self,
         location_name: str
     ) -> "TraceTreeBuilder":
-        location = Location(
-            self.current_test,
-            self.current_unit,
-            location_name
-        )
-        self._sequence.append(location)
+        self._locations.append(self._table.intern_id(location_name))
+        self._units.append(self._table.intern_unit(self.current_unit))
+        self._tests.append(self._current_test_index)
+        return self
+
+    def count_location(
+        self,
+        location_name: str,
+        count: int
+    ) -> "TraceTreeBuilder":
+        # Visits which were counted by the program, instead of traced
+        self._counts[location_name] = self._counts.get(location_name, 0) + count
         return self
 
     def end_unit(self) -> "TraceTreeBuilder":
@@ -55,6 +68,10 @@ class TraceTreeBuilder():
         return self
 
     def build(self) -> Trace:
-        return Trace(
-            self._sequence
-        )
\ No newline at end of file
+        return Trace.compact(
+            self._table,
+            self._locations,
+            self._units,
+            self._tests,
+            Coverage(self._counts) if len(self._counts) > 0 else None,
+        )
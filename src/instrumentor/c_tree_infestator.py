@@ -241,6 +241,12 @@ class CTreeInfestator(TreeInfestator):
         return [ self._canary_factory.insert_location_tweet(node) ]
 
     def infect(self, tree: Tree, cfa: CFA[CFANode]) -> Tree:
+        return self.infect_all(tree, [ cfa ])
+
+    def infect_all(self, tree: Tree, cfas: List[CFA[CFANode]]) -> Tree:
+        # The CFAs are of the same tree, such as the units of a file, and
+        #   share the locations of the canary factory, so no two of them
+        #   get the same location
         probes: Dict[str, Callable[[Node], List[TreeInfection]]] = {
             # Sequential statements
             CNodeType.EXPRESSION_STATEMENT.value: self.infection_spore_expression_statement,
@@ -263,13 +269,16 @@ class CTreeInfestator(TreeInfestator):
 
         # Step 1: Find the infections
         infections: List[TreeInfection] = [ ]
-        for nest in self.nests(cfa):
-            if nest.type in probes:
-                infections.extend(probes[nest.type](nest))
-
-        # Step 2: Infect the tree from end to start
+        for cfa in cfas:
+            for nest in self.nests(cfa):
+                if nest.type in probes:
+                    infections.extend(probes[nest.type](nest))
+
+        # Step 2: Infect the tree from end to start, all at once. Applied
+        #   one by one, a later infection at the same byte would end up in
+        #   front of the earlier ones, hence the order is reversed
         infections.sort(key=lambda x: x.last_byte_index, reverse=True)
-        for infection in infections:
-            tree = infection.do(self._parser, tree)
-
-        return tree
\ No newline at end of file
+        return self._parser.insert_all(
+            tree,
+            [ (infection.last_byte_index, infection.nest) for infection in reversed(infections) ]
+        )
\ No newline at end of file
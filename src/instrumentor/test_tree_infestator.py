@@ -99,6 +99,19 @@ class TestTreeInfestator(unittest.TestCase):
         self.assertEqual(len(nests), 2)
         self.assertEqual(expected, actual)
 
+    def test_infect_all_units(self) -> None:
+        program: str = "int a() { return 1; } int b() { return 2; }"
+        tree: Tree = self._parser.parse(program)
+        cfas: List[CFA[CFANode]] = [
+            CCFAFactory(tree).create(function.child_by_field(CField.BODY))
+                for function in tree.root.named_children
+        ]
+
+        expected = "int a() {CANARY_TWEET_LOCATION(0); return 1; } int b() {CANARY_TWEET_LOCATION(1); return 2; }"
+        actual = self._infestator.infect_all(tree, cfas).text
+
+        self.assertEqual(expected, actual)
+
     def test_nests_if_if(self) -> None:
         program: str = "if(a) { if(a) { } }"
         tree: Tree = self._parser.parse(program)
@@ -2,13 +2,19 @@ from abc import ABC, abstractmethod
 from ts import Parser, Tree
 
 class TreeInfection(ABC):
-    def __init__(self, last_byte_index: int) -> None:
+    def __init__(self, last_byte_index: int, nest: str) -> None:
         self._last_byte_index = last_byte_index
+        self._nest = nest
         super().__init__()
 
     @property
     def last_byte_index(self) -> int:
+        # The byte the nest is inserted at
         return self._last_byte_index
 
+    @property
+    def nest(self) -> str:
+        return self._nest
+
     @abstractmethod
     def do(self, parser: Parser, tree: Tree) -> Tree: pass
\ No newline at end of file
@@ -9,7 +9,7 @@ class TreeInfectionAppend(TreeInfection):
         #   should be th eindex of the furthest (greates)
         #   affected byte of the source in order to be
         #   able to sort the TreeInfection(s) correctly.
-        super().__init__(node.end_byte)
+        super().__init__(node.end_byte, nest)
 
     def do(self, parser: Parser, tree: Tree) -> Tree:
         return parser.append(tree, self._node, self._nest)
\ No newline at end of file
@@ -5,7 +5,7 @@ class TreeInfectionInsert(TreeInfection):
     def __init__(self, node: Node, nest: str) -> None:
         self._node = node
         self._nest = nest
-        super().__init__(node.start_byte)
+        super().__init__(node.start_byte, nest)
 
     def do(self, parser: Parser, tree: Tree) -> Tree:
         return parser.insert(tree, self._node, self._nest)
\ No newline at end of file
@@ -3,4 +3,6 @@ from .mutator import *
 from .obom_strategy import *
 from .ocor_strategy import *
 from .mutation import *
-from .mutation_strategy_factory import *
\ No newline at end of file
+from .mutation_strategy_factory import *
+from .mutant_schemata import *
+from .mutant_state import *
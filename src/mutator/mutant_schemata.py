@@ -0,0 +1,199 @@
+from typing import Dict, List, Tuple
+from ts import CField, CNodeType, Node, Parser, Tree
+from .mutation import Mutation, ReplacementMutation
+
+CANARY_MUTANT_ID = "CANARY_MUTANT_ID"
+
+SCHEMATA_EXPRESSIONS = [
+    CNodeType.BINARY_EXPRESSION,
+    CNodeType.ASSIGNMENT_EXPRESSION,
+]
+
+# Reads the selected mutant once from the environment, mutant 0
+#   (or no selection at all) is the original program
+CANARY_MUTANT_SCHEMATA_PRELUDE = """#ifndef CANARY_MUTANT_SCHEMATA
+#define CANARY_MUTANT_SCHEMATA
+#include <stdlib.h>
+static inline long canary_mutant_id(void) {
+    static long identifier = -1;
+    if (identifier < 0) {
+        const char *value = getenv("CANARY_MUTANT_ID");
+        identifier = value == NULL ? 0 : atol(value);
+    }
+    return identifier;
+}
+#define CANARY_MUTANT_ID() canary_mutant_id()
+#endif
+"""
+
+class MutantSchemata:
+    def __init__(
+        self,
+        parser: Parser,
+        tree: Tree,
+        mutations: List[ReplacementMutation],
+        first_identifier: int = 1,
+    ) -> None:
+        self._parser = parser
+        self._tree = tree
+        self._mutations = mutations
+        self._identifiers: Dict[int, int] = dict()
+        for idx, mutation in enumerate(mutations):
+            self._identifiers[id(mutation)] = first_identifier + idx
+        self._text: str = None
+
+    @property
+    def mutations(self) -> List[ReplacementMutation]:
+        return self._mutations
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self._render()
+        return self._text
+
+    def identifier(self, mutation: Mutation) -> int:
+        return self._identifiers[id(mutation)]
+
+    def apply(self, encoding: str = "utf8") -> Tree:
+        return self._parser.parse(self.text, None, encoding)
+
+    def __contains__(self, mutation: Mutation) -> bool:
+        return id(mutation) in self._identifiers
+
+    def __len__(self) -> int:
+        return len(self._mutations)
+
+    def _render(self) -> str:
+        source: bytes = bytes(self._tree.text, "utf8")
+
+        # All the mutations of an expression become a single switch
+        expressions: Dict[Tuple[int, int], List[ReplacementMutation]] = dict()
+        for mutation in self._mutations:
+            expression = mutation.node.parent
+            key = (expression.start_byte, expression.end_byte)
+            expressions.setdefault(key, list()).append(mutation)
+
+        def contains_expression(node: Node) -> bool:
+            return any(
+                node.start_byte <= start and end <= node.end_byte
+                    for start, end in expressions
+            )
+
+        def render(node: Node) -> bytes:
+            if not contains_expression(node):
+                return source[node.start_byte: node.end_byte]
+
+            result: bytes = b""
+            position = node.start_byte
+            for child in node.children:
+                result += source[position: child.start_byte] + render(child)
+                position = child.end_byte
+            result += source[position: node.end_byte]
+
+            mutations = expressions.get((node.start_byte, node.end_byte), None)
+            if mutations is None or not node.is_either_type(SCHEMATA_EXPRESSIONS):
+                return result
+
+            left = render(node.child_by_field(CField.LEFT))
+            right = render(node.child_by_field(CField.RIGHT))
+            switch: bytes = b"("
+            for mutation in mutations:
+                switch += bytes(
+                    f"CANARY_MUTANT_ID() == {self.identifier(mutation)} ? ", "utf8"
+                )
+                switch += b"((" + left + b") " + \
+                    bytes(mutation.replacement, "utf8") + \
+                    b" (" + right + b")) : "
+            return switch + b"(" + result + b"))"
+
+        root = self._tree.root
+        return CANARY_MUTANT_SCHEMATA_PRELUDE + render(root).decode("utf8")
+
+class MutantSchemataFactory:
+    def __init__(self, parser: Parser) -> None:
+        self._parser = parser
+
+    def create(
+        self,
+        tree: Tree,
+        mutations: List[Mutation],
+    ) -> Tuple[List[MutantSchemata], List[Mutation]]:
+        """Groups the mutations into schematas, each compiled as a single program
+
+        Args:
+            tree (Tree): the tree the mutations apply to
+            mutations (List[Mutation]): the mutations to group
+
+        Returns:
+            Tuple[List[MutantSchemata], List[Mutation]]: the schematas, and the
+            mutations which cannot be selected at runtime
+        """
+        supported: List[ReplacementMutation] = list()
+        unsupported: List[Mutation] = list()
+        for mutation in mutations:
+            if self.is_supported(mutation): supported.append(mutation)
+            else: unsupported.append(mutation)
+
+        # Mutated expressions nested in each other would duplicate their
+        #   operands for every alternative, hence each nesting depth
+        #   is compiled separately
+        expressions = set(
+            (mutation.node.parent.start_byte, mutation.node.parent.end_byte)
+                for mutation in supported
+        )
+        depths: Dict[int, List[ReplacementMutation]] = dict()
+        for mutation in supported:
+            start, end = mutation.node.parent.start_byte, mutation.node.parent.end_byte
+            depth = sum(
+                1 for other_start, other_end in expressions
+                    if other_start <= start and end <= other_end and \
+                        (other_start, other_end) != (start, end)
+            )
+            depths.setdefault(depth, list()).append(mutation)
+
+        schematas: List[MutantSchemata] = list()
+        first_identifier = 1
+        for depth in sorted(depths):
+            schemata = MutantSchemata(
+                self._parser, tree, depths[depth], first_identifier
+            )
+            first_identifier += len(schemata)
+            schematas.append(schemata)
+        return (schematas, unsupported)
+
+    def is_supported(self, mutation: Mutation) -> bool:
+        if not isinstance(mutation, ReplacementMutation):
+            return False
+        expression = mutation.node.parent
+        if expression is None or \
+            not expression.is_either_type(SCHEMATA_EXPRESSIONS) or \
+            expression.child_by_field(CField.OPERATOR) != mutation.node:
+            return False
+        return not self.is_constant_context(expression)
+
+    def is_constant_context(self, node: Node) -> bool:
+        # A runtime switch is not a constant expression, so these
+        #   places still need a build per mutant
+        current = node
+        while current.parent is not None:
+            parent = current.parent
+            if parent.type in [ "enumerator", "bitfield_clause", "preproc_if", "preproc_elif" ]:
+                return True
+            if parent.is_type(CNodeType.CASE_STATEMENT) and \
+                parent.child_by_field(CField.VALUE) == current:
+                return True
+            if parent.is_type(CNodeType.ARRAY_DECLARATOR) and \
+                parent.child_by_field(CField.SIZE) == current:
+                return True
+            if parent.is_type(CNodeType.DECLARATION) and ( \
+                parent.parent is None or \
+                parent.parent.is_type(CNodeType.TRANSLATION_UNIT) or \
+                any(child.is_type(CNodeType.STORAGE_CLASS_SPECIFIERS) and \
+                    child.child_count > 0 and child.children[0].type == "static"
+                        for child in parent.children)):
+                return True
+            if parent.is_type(CNodeType.FUNCTION_DEFINITION):
+                return False
+            current = parent
+        return True
@@ -0,0 +1,15 @@
+from enum import Enum
+
+class MutantState(Enum):
+    KILLED = "KILLED"
+    SURVIVED = "SURVIVED"
+    # The tests ran out of time, which is as good as killing it
+    TIMEOUT = "TIMEOUT"
+    # The mutant does not compile, so there is no program to test
+    BUILD_FAILED = "BUILD_FAILED"
+    # Identical to the original program, so it cannot be killed
+    EQUIVALENT = "EQUIVALENT"
+    # Identical to a mutant which has already been tested
+    DUPLICATE = "DUPLICATE"
+    # No test visits the mutated location, so it is not tested
+    NOT_COVERED = "NOT_COVERED"
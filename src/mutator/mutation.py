@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from ts import Tree, Node, Parser
+from ts import Tree, Node, Parser, TreeEdit
 
 class Mutation(ABC):
     def __init__(
@@ -16,10 +16,19 @@ class Mutation(ABC):
     def node(self) -> Node:
         return self._node
 
+    @property
+    def edit(self) -> TreeEdit:
+        return self.encoded_edit()
+
     @abstractmethod
-    def apply(self, encoding: str = "utf8") -> Tree:
+    def encoded_edit(self, encoding: str = "utf8") -> TreeEdit:
+        # The replacement is encoded as the source of the tree is
         pass
 
+    def apply(self, encoding: str = "utf8") -> Tree:
+        # The edit lets tree-sitter reuse the unchanged parts of the tree
+        return self._parser.apply_edit(self._tree, self.encoded_edit(encoding))
+
     @abstractmethod
     def __str__(self) -> str:
         pass
@@ -35,13 +44,12 @@ class ReplacementMutation(Mutation):
         self._replacement = replacement
         super().__init__(parser, tree, node)
 
-    def apply(self, encoding: str = "utf8") -> Tree:
-        return self._parser.replace(
-            self._tree,
-            self._node,
-            self._replacement,
-            encoding
-        )
+    @property
+    def replacement(self) -> str:
+        return self._replacement
+
+    def encoded_edit(self, encoding: str = "utf8") -> TreeEdit:
+        return TreeEdit.replace(self._node, self._replacement, encoding)
 
     def __str__(self) -> str:
         return f"'{self._tree.contents_of(self._node)}' --> '{self._replacement}'"
@@ -60,13 +68,8 @@ class WrappedMutation(Mutation):
         super().__init__(parser, tree, node)
         self._replacement = f'{prefix}{self._tree.contents_of(self._node)}{postfix}'
 
-    def apply(self, encoding: str = "utf8") -> Tree:
-        return self._parser.replace(
-            self._tree,
-            self._node,
-            self._replacement,
-            encoding
-        )
+    def encoded_edit(self, encoding: str = "utf8") -> TreeEdit:
+        return TreeEdit.replace(self._node, self._replacement, encoding)
 
     def __str__(self) -> str:
         return f"'{self._tree.contents_of(self._node)}' --> '{self._replacement}'"
@@ -0,0 +1,84 @@
+from unittest import TestCase
+from .obom_strategy import ObomStrategy
+from .mutant_schemata import MutantSchemataFactory, CANARY_MUTANT_SCHEMATA_PRELUDE
+from ts import (
+    LanguageLibrary,
+    Parser,
+)
+
+class TestMutantSchemata(TestCase):
+    def setUp(self) -> None:
+        LanguageLibrary.build()
+        self._language = LanguageLibrary.c()
+        self._parser = Parser.create_with_language(self._language)
+        self._strategy = ObomStrategy(self._parser)
+        self._factory = MutantSchemataFactory(self._parser)
+
+    def mutations(self, program: str):
+        tree = self._parser.parse(program)
+        mutations = list()
+        for candidate in self._strategy.capture(tree.root):
+            mutations.extend(self._strategy.mutations(self._parser, tree, candidate))
+        return (tree, mutations)
+
+    def test_single_expression(self) -> None:
+        tree, mutations = self.mutations("int f(int a, int b) { return a < b; }")
+        schematas, unsupported = self._factory.create(tree, mutations)
+
+        self.assertEqual(len(schematas), 1)
+        self.assertEqual(len(unsupported), 0)
+        self.assertEqual(len(schematas[0]), len(mutations))
+        self.assertEqual(
+            [ schematas[0].identifier(mutation) for mutation in mutations ],
+            list(range(1, len(mutations) + 1))
+        )
+
+        text = schematas[0].text
+        self.assertTrue(text.startswith(CANARY_MUTANT_SCHEMATA_PRELUDE))
+        self.assertTrue("CANARY_MUTANT_ID() == 1 ? ((a) + (b)) : " in text)
+        self.assertTrue(text.endswith(" : (a < b)); }"))
+        self.assertFalse(schematas[0].apply().root.has_error)
+
+    def test_nested_expressions_are_split_by_depth(self) -> None:
+        tree, mutations = self.mutations("int f(int a, int b) { return (a + 1) * b; }")
+        schematas, unsupported = self._factory.create(tree, mutations)
+
+        self.assertEqual(len(schematas), 2)
+        self.assertEqual(len(unsupported), 0)
+        self.assertEqual(sum(len(schemata) for schemata in schematas), len(mutations))
+        for schemata in schematas:
+            self.assertFalse(schemata.apply().root.has_error)
+            for mutation in schemata.mutations:
+                self.assertTrue(mutation in schemata)
+        identifiers = set(
+            schemata.identifier(mutation)
+                for schemata in schematas for mutation in schemata.mutations
+        )
+        self.assertEqual(len(identifiers), len(mutations))
+
+    def test_assignment_expression(self) -> None:
+        tree, mutations = self.mutations("void f(int a) { a = 2; }")
+        schematas, unsupported = self._factory.create(tree, mutations)
+
+        self.assertEqual(len(schematas), 1)
+        self.assertEqual(len(unsupported), 0)
+        self.assertTrue("CANARY_MUTANT_ID() == 1 ? ((a) += (2)) : " in schematas[0].text)
+
+    def test_constant_expressions_are_unsupported(self) -> None:
+        program = "\n".join([
+            "static int g = 1 + 2;",
+            "int f(int x) {",
+            "    static int y = 3 * 4;",
+            "    int arr[2 * 2];",
+            "    switch (x) { case 1 + 1: return x - 1; }",
+            "    return x;",
+            "}",
+        ])
+        tree, mutations = self.mutations(program)
+        schematas, unsupported = self._factory.create(tree, mutations)
+
+        self.assertEqual(len(schematas), 1)
+        supported = schematas[0].mutations
+        self.assertEqual(len(supported) + len(unsupported), len(mutations))
+        for mutation in supported:
+            self.assertEqual(tree.contents_of(mutation.node), "-")
@@ -0,0 +1,38 @@
+import unittest
+
+from . import (
+    Parser,
+    ReplacementMutation,
+    WrappedMutation,
+)
+from ts import (
+    LanguageLibrary,
+    Node,
+)
+
+class TestMutation(unittest.TestCase):
+    def setUp(self) -> None:
+        LanguageLibrary.build()
+        self._parser = Parser.create_with_language(LanguageLibrary.c())
+        return super().setUp()
+
+    def test_apply_replacement(self) -> None:
+        tree = self._parser.parse("int a = b < c;")
+        node: Node = tree.root.named_children[0].named_children[1].named_children[1].children[1]
+        mutation = ReplacementMutation(self._parser, tree, node, "<=")
+        self.assertEqual(mutation.apply().text, "int a = b <= c;")
+        self.assertEqual(mutation.edit.replacement, b"<=")
+
+    def test_apply_wrapped(self) -> None:
+        tree = self._parser.parse("int a = b;")
+        node: Node = tree.root.named_children[0].named_children[1].named_children[1]
+        mutation = WrappedMutation(self._parser, tree, node, "-(", ")")
+        self.assertEqual(mutation.apply().text, "int a = -(b);")
+
+    def test_encoded_edit(self) -> None:
+        tree = self._parser.parse("char *a = \"b\";")
+        node: Node = tree.root.named_children[0].named_children[1].named_children[1]
+        mutation = ReplacementMutation(self._parser, tree, node, "\"é\"")
+        self.assertEqual(mutation.encoded_edit("latin-1").replacement, b"\"\xe9\"")
+        self.assertEqual(mutation.edit.replacement, "\"é\"".encode("utf8"))
+        self.assertEqual(mutation.apply("latin-1").source, b"char *a = \"\xe9\";")
@@ -0,0 +1,234 @@
+import json
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterator, List
+
+# A phase of the analysis as it ran on a thread. The CPU time is that of the
+#   thread, so it is the time spent in Python (and the libraries it calls),
+#   while the child CPU time is that of the builds and tests which finished
+#   during the phase. Children are accounted for the whole process, so the
+#   latter overlaps between phases running on other threads
+class Span:
+    def __init__(
+        self,
+        name: str,
+        category: str,
+        thread: int,
+        start: float,
+        wall: float,
+        cpu: float,
+        child_cpu: float,
+        max_rss: int,
+        child_max_rss: int,
+        args: Dict[str, Any] = None,
+    ) -> None:
+        self._name = name
+        self._category = category
+        self._thread = thread
+        self._start = start
+        self._wall = wall
+        self._cpu = cpu
+        self._child_cpu = child_cpu
+        self._max_rss = max_rss
+        self._child_max_rss = child_max_rss
+        self._args = args
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def category(self) -> str:
+        return self._category
+
+    @property
+    def thread(self) -> int:
+        return self._thread
+
+    @property
+    def start(self) -> float:
+        # Seconds since the profiler was enabled
+        return self._start
+
+    @property
+    def wall(self) -> float:
+        return self._wall
+
+    @property
+    def cpu(self) -> float:
+        return self._cpu
+
+    @property
+    def child_cpu(self) -> float:
+        return self._child_cpu
+
+    @property
+    def max_rss(self) -> int:
+        # The peak resident set size of canary by the end of the phase, in KiB
+        return self._max_rss
+
+    @property
+    def child_max_rss(self) -> int:
+        # The peak resident set size of the largest build or test so far, in KiB
+        return self._child_max_rss
+
+    @property
+    def args(self) -> Dict[str, Any]:
+        return self._args
+
+# Records the spans of the phases while enabled, and nothing otherwise,
+#   such that the phases can be wrapped at no cost when not profiling
+class Profiler:
+    def __init__(self) -> None:
+        self._enabled = False
+        self._origin = time.perf_counter()
+        # Phases run on the threads of a workspace pool
+        self._lock = threading.Lock()
+        self._spans: List[Span] = list()
+        self._threads: Dict[int, str] = dict()
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def enable(self) -> None:
+        with self._lock:
+            self._enabled = True
+            self._origin = time.perf_counter()
+            self._spans = list()
+            self._threads = dict()
+
+    def disable(self) -> None:
+        self._enabled = False
+
+    def span(self, name: str, category: str = "phase", args: Dict[str, Any] = None) -> ContextManager[None]:
+        if not self._enabled:
+            return nullcontext()
+        return self._span(name, category, args)
+
+    @contextmanager
+    def _span(self, name: str, category: str, args: Dict[str, Any]) -> Iterator[None]:
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        children_start = resource.getrusage(resource.RUSAGE_CHILDREN)
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.thread_time() - cpu_start
+            children = resource.getrusage(resource.RUSAGE_CHILDREN)
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            thread = threading.current_thread()
+            span = Span(
+                name,
+                category,
+                thread.ident,
+                start - self._origin,
+                wall,
+                cpu,
+                (children.ru_utime + children.ru_stime) - \
+                    (children_start.ru_utime + children_start.ru_stime),
+                usage.ru_maxrss,
+                children.ru_maxrss,
+                args,
+            )
+            with self._lock:
+                self._spans.append(span)
+                self._threads.setdefault(thread.ident, thread.name)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        # The trace event format of chrome://tracing and Perfetto, where
+        #   the spans are complete events in microseconds
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self._spans)
+            threads = dict(self._threads)
+        events: List[Dict[str, Any]] = [
+            {
+                "name": "thread_name", "ph": "M", "pid": pid, "tid": thread,
+                "args": { "name": name },
+            } for thread, name in threads.items()
+        ]
+        for span in spans:
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": span.start * 1e6,
+                "dur": span.wall * 1e6,
+                "pid": pid,
+                "tid": span.thread,
+                "args": {
+                    "cpu_ms": span.cpu * 1e3,
+                    "child_cpu_ms": span.child_cpu * 1e3,
+                    "max_rss_kib": span.max_rss,
+                    "child_max_rss_kib": span.child_max_rss,
+                    **(span.args or dict()),
+                },
+            })
+        return { "traceEvents": events, "displayTimeUnit": "ms" }
+
+    def write_chrome_trace(self, path: str) -> None:
+        file = open(path, "w+")
+        json.dump(self.chrome_trace(), file)
+        file.close()
+
+    def summary(self) -> List[Dict[str, Any]]:
+        # The spans of each phase added up, the slowest first. Nested phases
+        #   are part of the phases they ran in as well
+        phases: Dict[str, Dict[str, Any]] = dict()
+        for span in self.spans:
+            phase = phases.setdefault(span.name, {
+                "name": span.name, "category": span.category, "count": 0,
+                "wall": 0.0, "cpu": 0.0, "child_cpu": 0.0,
+                "max_wall": 0.0, "max_rss": 0, "child_max_rss": 0,
+            })
+            phase["count"] += 1
+            phase["wall"] += span.wall
+            phase["cpu"] += span.cpu
+            phase["child_cpu"] += span.child_cpu
+            phase["max_wall"] = max(phase["max_wall"], span.wall)
+            phase["max_rss"] = max(phase["max_rss"], span.max_rss)
+            phase["child_max_rss"] = max(phase["child_max_rss"], span.child_max_rss)
+        return sorted(phases.values(), key=lambda phase: phase["wall"], reverse=True)
+
+    def summary_table(self) -> str:
+        header = [ "phase", "count", "wall s", "mean ms", "max ms", "cpu s", "child cpu s", "rss MiB", "child rss MiB" ]
+        rows = [ header ] + [
+            [
+                phase["name"],
+                str(phase["count"]),
+                f'{phase["wall"]:.3f}',
+                f'{phase["wall"] / phase["count"] * 1e3:.2f}',
+                f'{phase["max_wall"] * 1e3:.2f}',
+                f'{phase["cpu"]:.3f}',
+                f'{phase["child_cpu"]:.3f}',
+                f'{phase["max_rss"] / 1024:.1f}',
+                f'{phase["child_max_rss"] / 1024:.1f}',
+            ] for phase in self.summary()
+        ]
+        widths = [ max(len(row[idx]) for row in rows) for idx in range(len(header)) ]
+        lines = [
+            "  ".join(
+                # The names are aligned left, the numbers right
+                cell.ljust(width) if idx == 0 else cell.rjust(width)
+                    for idx, (cell, width) in enumerate(zip(row, widths))
+            ) for row in rows
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write_summary(self, path: str) -> None:
+        file = open(path, "w+")
+        file.write(self.summary_table())
+        file.close()
+
+# The profiler of the phases of canary, which the use cases report to
+PROFILER = Profiler()
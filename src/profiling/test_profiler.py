@@ -0,0 +1,66 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from . import *
+
+class TestProfiler(TestCase):
+    def test_disabled(self) -> None:
+        profiler = Profiler()
+        with profiler.span("build"):
+            pass
+        self.assertEqual(profiler.spans, list())
+
+    def test_span(self) -> None:
+        profiler = Profiler()
+        profiler.enable()
+        with profiler.span("mutant", "use_case", { "mutation": "'<' --> '<='" }):
+            with profiler.span("build"):
+                sum(range(1000))
+        profiler.disable()
+        with profiler.span("test"):
+            pass
+
+        build, mutant = profiler.spans
+        self.assertEqual(build.name, "build")
+        self.assertEqual(build.category, "phase")
+        self.assertEqual(mutant.args, { "mutation": "'<' --> '<='" })
+        self.assertGreaterEqual(mutant.wall, build.wall)
+        self.assertLessEqual(mutant.start, build.start)
+        self.assertGreaterEqual(build.cpu, 0.0)
+        self.assertGreater(build.max_rss, 0)
+
+    def test_chrome_trace(self) -> None:
+        profiler = Profiler()
+        profiler.enable()
+        with profiler.span("mutant", "use_case", { "mutation": "'<' --> '<='" }):
+            pass
+        path = os.path.join(tempfile.mkdtemp(), "profile.json")
+        profiler.write_chrome_trace(path)
+
+        file = open(path)
+        events = json.load(file)["traceEvents"]
+        file.close()
+        self.assertEqual([ event["ph"] for event in events ], [ "M", "X" ])
+        self.assertEqual(events[1]["name"], "mutant")
+        self.assertEqual(events[1]["cat"], "use_case")
+        self.assertEqual(events[1]["tid"], events[0]["tid"])
+        self.assertEqual(events[1]["args"]["mutation"], "'<' --> '<='")
+        self.assertIn("cpu_ms", events[1]["args"])
+        self.assertIn("max_rss_kib", events[1]["args"])
+
+    def test_summary(self) -> None:
+        profiler = Profiler()
+        profiler.enable()
+        for _ in range(3):
+            with profiler.span("build"):
+                pass
+        with profiler.span("test"):
+            sum(range(100000))
+
+        summary = { phase["name"]: phase for phase in profiler.summary() }
+        self.assertEqual(summary["build"]["count"], 3)
+        self.assertEqual(summary["test"]["count"], 1)
+        lines = profiler.summary_table().splitlines()
+        self.assertTrue(lines[0].startswith("phase"))
+        self.assertEqual(len(lines), 3)
@@ -0,0 +1,3 @@
+from .result_cache import *
+from .source_fingerprint import *
+from .mutant_deduplicator import *
@@ -0,0 +1,48 @@
+import hashlib
+from concurrent.futures import Future
+from threading import Lock
+from typing import Any, Dict, Set
+from test_results_parsing import TestResults
+
+# Finds the mutants which are identical to the original program, or to
+#   a mutant tested before them, by the hash of their source or of the
+#   objects compiled from it. The first mutant to claim a hash resolves
+#   its future with the outcome the identical mutants then share
+class MutantDeduplicator:
+    def __init__(
+        self,
+        original_results: TestResults,
+        compiler_equivalence: bool = False,
+    ) -> None:
+        self._original_results = original_results
+        self._compiler_equivalence = compiler_equivalence
+        # Mutants are tested from the threads of a workspace pool
+        self._lock = Lock()
+        self._originals: Set[str] = set()
+        self._claims: Dict[str, "Future[Any]"] = dict()
+
+    @property
+    def original_results(self) -> TestResults:
+        return self._original_results
+
+    @property
+    def compiler_equivalence(self) -> bool:
+        # Whether the objects of mutants are compared as well
+        return self._compiler_equivalence
+
+    def digest(self, contents: bytes) -> str:
+        return hashlib.sha256(contents).hexdigest()
+
+    def add_original(self, digest: str) -> None:
+        with self._lock:
+            self._originals.add(digest)
+
+    def is_original(self, digest: str) -> bool:
+        with self._lock:
+            return digest in self._originals
+
+    def claim(self, digest: str, future: "Future[Any]") -> "Future[Any]":
+        # The future of the first mutant to claim the digest, which is
+        #   the given one if no mutant has claimed it before
+        with self._lock:
+            return self._claims.setdefault(digest, future)
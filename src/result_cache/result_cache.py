@@ -0,0 +1,122 @@
+import hashlib
+import json
+import sqlite3
+from array import array
+from threading import Lock
+from instrumentation_trace import Coverage, Trace, TraceTable, Unit, Test
+from test_results_parsing import TestResults, TestSummary
+
+# The results of testing mutants, keyed by the text of the mutated file and
+#   a fingerprint of everything else the results depend on (the tests, the
+#   rest of the sources and the testing backend). Mutants whose key is
+#   already known need not be built nor tested again
+class ResultCache:
+    def __init__(self, path: str, fingerprint: str) -> None:
+        self._path = path
+        self._fingerprint = fingerprint
+        # Mutants are tested from the threads of a workspace pool
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, "
+            "test_count INTEGER, failure_count INTEGER, success_count INTEGER, "
+            "trace_table TEXT, locations BLOB, units BLOB, tests BLOB)"
+        )
+        self._connection.commit()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def fingerprint(self) -> str:
+        return self._fingerprint
+
+    def key(self, source: bytes) -> str:
+        digest = hashlib.sha256(bytes(self._fingerprint, "utf8"))
+        digest.update(source)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> TestResults:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT test_count, failure_count, success_count, "
+                "trace_table, locations, units, tests FROM results WHERE key = ?",
+                (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return TestResults(
+            TestSummary(row[0], row[1], row[2]),
+            self._trace(row[3], row[4], row[5], row[6]),
+        )
+
+    def put(self, key: str, test_results: TestResults) -> None:
+        # Results which could not be parsed are not worth remembering
+        if test_results is None or test_results.summary is None:
+            return
+        summary = test_results.summary
+        trace = test_results.trace
+        trace_table = locations = units = tests = None
+        if trace is not None:
+            trace_table = json.dumps({
+                "ids": trace.table.ids,
+                "units": [ unit.name for unit in trace.table.units[1:] ],
+                "tests": [ test.name for test in trace.table.tests[1:] ],
+                "counts": dict(trace.counts.items()) if trace.counts is not None else None,
+            })
+            locations = trace.locations.tobytes()
+            units = trace.units.tobytes()
+            tests = trace.tests.tobytes()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    summary.test_count, summary.failure_count, summary.success_count,
+                    trace_table, locations, units, tests,
+                )
+            )
+            self._connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM results"
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _trace(
+        self,
+        trace_table: str,
+        locations: bytes,
+        units: bytes,
+        tests: bytes,
+    ) -> Trace:
+        if trace_table is None:
+            return None
+        entries = json.loads(trace_table)
+        table = TraceTable()
+        for id in entries["ids"]:
+            table.intern_id(id)
+        for name in entries["units"]:
+            table.intern_unit(Unit(name))
+        for name in entries["tests"]:
+            table.intern_test(Test(name))
+        counts = entries.get("counts", None)
+        return Trace.compact(
+            table,
+            self._array(locations),
+            self._array(units),
+            self._array(tests),
+            Coverage(counts) if counts is not None else None,
+        )
+
+    def _array(self, data: bytes) -> array:
+        result = array("I")
+        result.frombytes(data)
+        return result
@@ -0,0 +1,43 @@
+import hashlib
+import os
+from typing import Iterable
+
+# The files a mutant is built and tested from, the build outputs are left
+#   out as they are rebuilt for every mutant
+SOURCE_EXTENSIONS = (
+    ".c", ".h", ".cc", ".cpp", ".hpp", ".inc", ".s", ".S", ".mk", ".cmake",
+)
+SOURCE_NAMES = ( "Makefile", "makefile", "GNUmakefile", "CMakeLists.txt" )
+
+def source_fingerprint(
+    base: str,
+    excludes: Iterable[str] = list(),
+    parts: Iterable[str] = list(),
+) -> str:
+    # A hash of the sources under base, except the excluded files and
+    #   directories, and of the parts (e.g. the commands) used to test them
+    excluded = set(os.path.abspath(exclude) for exclude in excludes)
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(bytes(str(part), "utf8"))
+        digest.update(b"\0")
+
+    for directory, directories, files in os.walk(os.path.abspath(base)):
+        directories[:] = sorted(
+            name for name in directories
+                if not name.startswith(".") and
+                    os.path.join(directory, name) not in excluded
+        )
+        for name in sorted(files):
+            path = os.path.join(directory, name)
+            if path in excluded or not _is_source(name):
+                continue
+            digest.update(bytes(os.path.relpath(path, base), "utf8"))
+            digest.update(b"\0")
+            file = open(path, "rb")
+            digest.update(hashlib.sha256(file.read()).digest())
+            file.close()
+    return digest.hexdigest()
+
+def _is_source(name: str) -> bool:
+    return name in SOURCE_NAMES or name.endswith(SOURCE_EXTENSIONS)
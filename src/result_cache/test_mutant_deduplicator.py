@@ -0,0 +1,22 @@
+from concurrent.futures import Future
+from unittest import TestCase
+from test_results_parsing import TestResults, TestSummary
+from . import *
+
+class TestMutantDeduplicator(TestCase):
+    def test_original(self) -> None:
+        original_results = TestResults(TestSummary(1, 0, 1))
+        deduplicator = MutantDeduplicator(original_results)
+        deduplicator.add_original(deduplicator.digest(b"a+b"))
+        self.assertTrue(deduplicator.is_original(deduplicator.digest(b"a+b")))
+        self.assertFalse(deduplicator.is_original(deduplicator.digest(b"a-b")))
+        self.assertIs(deduplicator.original_results, original_results)
+        self.assertFalse(deduplicator.compiler_equivalence)
+
+    def test_claim(self) -> None:
+        deduplicator = MutantDeduplicator(None, True)
+        first: Future = Future()
+        second: Future = Future()
+        self.assertIs(deduplicator.claim(deduplicator.digest(b"a-b"), first), first)
+        self.assertIs(deduplicator.claim(deduplicator.digest(b"a-b"), second), first)
+        self.assertIs(deduplicator.claim(deduplicator.digest(b"a*b"), second), second)
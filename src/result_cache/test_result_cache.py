@@ -0,0 +1,96 @@
+import os
+import tempfile
+from unittest import TestCase
+from instrumentation_trace import TraceTreeBuilder
+from test_results_parsing import TestResults, TestSummary
+from . import *
+
+class TestResultCache(TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.mkdtemp()
+        self._path = os.path.join(self._directory, "results.sqlite3")
+        return super().setUp()
+
+    def test_key(self) -> None:
+        cache = ResultCache(self._path, "a")
+        self.assertEqual(cache.key(b"int a;"), cache.key(b"int a;"))
+        self.assertNotEqual(cache.key(b"int a;"), cache.key(b"int b;"))
+        self.assertNotEqual(
+            cache.key(b"int a;"), ResultCache(self._path, "b").key(b"int a;")
+        )
+
+    def test_get_unknown(self) -> None:
+        cache = ResultCache(self._path, "a")
+        self.assertIsNone(cache.get(cache.key(b"int a;")))
+
+    def test_put_get(self) -> None:
+        builder = TraceTreeBuilder()
+        builder.start_test("test").start_unit("unit") \
+            .enter_location("1").enter_location("2").enter_location("1") \
+            .end_unit().end_test()
+        cache = ResultCache(self._path, "a")
+        key = cache.key(b"int a;")
+        cache.put(key, TestResults(TestSummary(2, 1, 1), builder.build()))
+        cache.close()
+
+        test_results = ResultCache(self._path, "a").get(key)
+        self.assertEqual(test_results.summary.test_count, 2)
+        self.assertEqual(test_results.summary.failure_count, 1)
+        self.assertEqual(test_results.summary.success_count, 1)
+        self.assertEqual(test_results.trace.ids, [ "1", "2", "1" ])
+        self.assertEqual(test_results.trace.sequence[1].unit.name, "unit")
+        self.assertEqual(test_results.trace.sequence[1].test.name, "test")
+        self.assertEqual(test_results.trace.coverage["1"], 2)
+
+    def test_put_get_counts(self) -> None:
+        builder = TraceTreeBuilder()
+        builder.count_location("1", 40).count_location("2", 2)
+        cache = ResultCache(self._path, "a")
+        key = cache.key(b"int a;")
+        cache.put(key, TestResults(TestSummary(1, 0, 1), builder.build()))
+
+        test_results = cache.get(key)
+        self.assertEqual(len(test_results.trace), 0)
+        self.assertEqual(test_results.trace.counts["1"], 40)
+        self.assertEqual(test_results.trace.coverage["2"], 2)
+
+    def test_put_without_trace(self) -> None:
+        cache = ResultCache(self._path, "a")
+        key = cache.key(b"int a;")
+        cache.put(key, TestResults(TestSummary(1, 0, 1)))
+        cache.put(cache.key(b"int b;"), None)
+        self.assertIsNone(cache.get(key).trace)
+        self.assertEqual(len(cache), 1)
+
+class TestSourceFingerprint(TestCase):
+    def test_source_fingerprint(self) -> None:
+        base = tempfile.mkdtemp()
+        os.makedirs(os.path.join(base, "out"))
+        self._write(base, "a.c", "int a;")
+        self._write(base, "b.c", "int b;")
+        self._write(base, "tests", "binary")
+        self._write(base, "out/results.txt", "results")
+        fingerprint = source_fingerprint(base, [ f'{base}/b.c', f'{base}/out' ], [ "make" ])
+
+        # Neither the excluded files nor the build outputs are part of it
+        self._write(base, "b.c", "int c;")
+        self._write(base, "tests", "other binary")
+        self._write(base, "out/results.txt", "other results")
+        self.assertEqual(
+            source_fingerprint(base, [ f'{base}/b.c', f'{base}/out' ], [ "make" ]),
+            fingerprint
+        )
+        self.assertNotEqual(
+            source_fingerprint(base, [ f'{base}/b.c', f'{base}/out' ], [ "make all" ]),
+            fingerprint
+        )
+        self._write(base, "a.c", "int d;")
+        self.assertNotEqual(
+            source_fingerprint(base, [ f'{base}/b.c', f'{base}/out' ], [ "make" ]),
+            fingerprint
+        )
+
+    def _write(self, base: str, path: str, text: str) -> None:
+        file = open(os.path.join(base, path), "w+")
+        file.write(text)
+        file.close()
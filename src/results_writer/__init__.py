@@ -0,0 +1,4 @@
+from .results_writer import *
+from .parquet_results_writer import *
+from .text_report_writer import *
+from .results_writer_factory import *
@@ -0,0 +1,36 @@
+from typing import Any, Dict, List
+from .results_writer import ResultsWriter, MUTANT_RECORD
+
+# The mutant records as the rows of a Parquet table, which is only written
+#   once all of them are known. The visits of a mutant are a list of
+#   location and count pairs, as each mutant visits other locations
+class ParquetResultsWriter(ResultsWriter):
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self._rows: List[Dict[str, Any]] = list()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        if record["record"] != MUTANT_RECORD:
+            return
+        row = dict(record)
+        row["kinds"] = list(record["kinds"])
+        row["visits"] = [
+            { "location": location, "count": count }
+                for location, count in record["visits"].items()
+        ]
+        self._rows.append(row)
+
+    def close(self) -> None:
+        import pyarrow
+        import pyarrow.parquet
+        pyarrow.parquet.write_table(
+            pyarrow.Table.from_pylist(self._rows), self.path
+        )
+
+def parquet_available() -> bool:
+    # pyarrow is not a requirement of canary, only of writing Parquet
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        return False
+    return True
@@ -0,0 +1,42 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+# The records of the analysis of a unit, in the order they are written. A
+#   unit record comes first, followed by a node record for every mutated
+#   node and a mutant record for each of its mutants, and a summary record last
+UNIT_RECORD = "unit"
+NODE_RECORD = "node"
+MUTANT_RECORD = "mutant"
+SUMMARY_RECORD = "summary"
+
+class ResultsWriter(ABC):
+    def __init__(self, path: str) -> None:
+        self._path = path
+        super().__init__()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @abstractmethod
+    def write(self, record: Dict[str, Any]) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+# One JSON object per line, written as soon as the record is
+class JsonLinesResultsWriter(ResultsWriter):
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self._file = open(path, "w+")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record))
+        self._file.write("\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
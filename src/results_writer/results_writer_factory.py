@@ -0,0 +1,16 @@
+from .results_writer import ResultsWriter, JsonLinesResultsWriter
+from .parquet_results_writer import ParquetResultsWriter
+from .text_report_writer import TextReportWriter
+
+class ResultsWriterFactory():
+    def __init__(self) -> None:
+        pass
+
+    def create(self, name: str, path: str) -> ResultsWriter:
+        # The path is without the extension of the format
+        if name == "text":
+            return TextReportWriter(f'{path}.txt')
+        if name == "jsonl":
+            return JsonLinesResultsWriter(f'{path}.jsonl')
+        if name == "parquet":
+            return ParquetResultsWriter(f'{path}.parquet')
@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+from unittest import TestCase, skipUnless
+from . import *
+
+class TestResultsWriter(TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.mkdtemp()
+        self._records = [
+            {
+                "record": UNIT_RECORD, "file": "src/a.c", "unit": "add",
+                "mutation_duration": 1.5, "trace_count": 2, "visits": { "0": 2, "1": 1 },
+                "visited_locations": [ "0", "1" ], "unvisited_locations": [ "2" ],
+                "visited_nodes": 2, "unvisited_nodes": 1,
+                "visited_candidates": 1, "unvisited_candidates": 0,
+                "visited_mutations": 2, "unvisited_mutations": 0, "runs": 2,
+            },
+            {
+                "record": NODE_RECORD, "file": "src/a.c", "unit": "add", "location": "0",
+                "code": "(a < b)", "kinds": [ "if_condition" ], "start_byte": 10, "end_byte": 17, "mutants": 2,
+            },
+            self._mutant("<=", "KILLED"),
+            self._mutant(">", "SURVIVED"),
+            {
+                "record": NODE_RECORD, "file": "src/a.c", "unit": "add", "location": "1",
+                "code": "return a;", "kinds": [], "start_byte": 20, "end_byte": 29, "mutants": 0,
+            },
+            { "record": SUMMARY_RECORD, "file": "src/a.c", "unit": "add", "killed": 1, "survived": 1, "duration": 2.5 },
+        ]
+        return super().setUp()
+
+    def test_json_lines(self) -> None:
+        writer = ResultsWriterFactory().create("jsonl", os.path.join(self._directory, "add_0"))
+        for record in self._records:
+            writer.write(record)
+        writer.close()
+
+        file = open(os.path.join(self._directory, "add_0.jsonl"))
+        records = [ json.loads(line) for line in file ]
+        file.close()
+        self.assertEqual(records, self._records)
+
+    def test_text_report(self) -> None:
+        writer = ResultsWriterFactory().create("text", os.path.join(self._directory, "add_0"))
+        for record in self._records:
+            writer.write(record)
+        writer.close()
+
+        file = open(os.path.join(self._directory, "add_0.txt"))
+        lines = file.read().split("\n")
+        file.close()
+        self.assertEqual(lines[0], "Mutation took 1.5 seconds")
+        self.assertIn("Visited 2, Unvisted 1, percentage visited 0.6666666666666666", lines)
+        self.assertIn("Is :: if-condition", lines)
+        self.assertIn("[Point(line=1, char=3), Point(line=1, char=4)] '<' --> '<=' :: KILLED", lines)
+        self.assertIn("Killed 1 and 1 survived, mutation score of 0.5", lines)
+        self.assertEqual(lines[lines.index("Code :: 'return a;'") + 1], "No mutations")
+        self.assertIn("Total killed 1 and 1 total survived, with a total mutations score of 0.5", lines)
+        self.assertEqual(lines[-1], "Took 2.5 seconds")
+
+    @skipUnless(parquet_available(), "pyarrow is not installed")
+    def test_parquet(self) -> None:
+        import pyarrow.parquet
+        writer = ResultsWriterFactory().create("parquet", os.path.join(self._directory, "add_0"))
+        for record in self._records:
+            writer.write(record)
+        writer.close()
+
+        table = pyarrow.parquet.read_table(os.path.join(self._directory, "add_0.parquet"))
+        self.assertEqual(table.num_rows, 2)
+        self.assertEqual(table.column("status").to_pylist(), [ "KILLED", "SURVIVED" ])
+
+    def _mutant(self, replacement: str, status: str) -> dict:
+        return {
+            "record": MUTANT_RECORD, "file": "src/a.c", "unit": "add", "location": "0",
+            "kinds": [ "if_condition" ], "node_type": "<", "start_byte": 13, "end_byte": 14,
+            "start_point": [ 1, 3 ], "end_point": [ 1, 4 ], "operator": "<", "replacement": replacement,
+            "status": status, "cached": False, "build_duration": 0.5, "test_duration": 0.25,
+            "trace_count": 1, "trace_length": 3, "visits": { "0": 2, "1": 1 },
+        }
@@ -0,0 +1,144 @@
+from typing import Any, Dict, List
+from ts import FilePoint
+from mutator import MutantState
+from .results_writer import ResultsWriter, UNIT_RECORD, NODE_RECORD, MUTANT_RECORD, SUMMARY_RECORD
+
+# How the kinds of the nodes read in the report
+KIND_LABELS = {
+    "if_condition": "if-condition",
+    "for_initialisation": "for-initalisation",
+    "for_condition": "for-condition",
+    "for_update": "for-udapte",
+    "do_while_condition": "do_while-condition",
+    "while_condition": "while-condition",
+    "switch_condition": "switch-condition",
+}
+
+# The report a person reads, grouping the mutants by the location of their
+#   node, which is why it is only written once all the records are known
+class TextReportWriter(ResultsWriter):
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self._unit: Dict[str, Any] = None
+        self._summary: Dict[str, Any] = None
+        # The node records, each with the mutant records which follow it
+        self._nodes: List[Dict[str, Any]] = list()
+        self._mutants: List[List[Dict[str, Any]]] = list()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        kind = record["record"]
+        if kind == UNIT_RECORD:
+            self._unit = record
+        elif kind == NODE_RECORD:
+            self._nodes.append(record)
+            self._mutants.append(list())
+        elif kind == MUTANT_RECORD:
+            self._mutants[-1].append(record)
+        elif kind == SUMMARY_RECORD:
+            self._summary = record
+
+    def close(self) -> None:
+        file = open(self.path, "w+")
+        file.write(self._header(self._unit))
+
+        all_locations_total_killed = 0
+        all_locations_total_survived = 0
+        for visited_location in self._unit["visited_locations"]:
+            file.write(f"\nLocation {visited_location}\n")
+            if self._unit["runs"] == 0:
+                file.write("No runs\n")
+                continue
+            file.write(f"{self._unit['runs']} Runs\n")
+
+            location_total_killed = 0
+            location_total_survived = 0
+            for node, mutants in zip(self._nodes, self._mutants):
+                if node["location"] != visited_location:
+                    continue
+                file.write("\n")
+                file.write(f"Code :: '{node['code']}'\n")
+                if len(mutants) == 0:
+                    file.write("No mutations\n")
+                    continue
+                for kind in node["kinds"]:
+                    file.write(f"Is :: {KIND_LABELS[kind]}\n")
+
+                amount_killed = 0
+                amount_survived = 0
+                for mutant in mutants:
+                    file.write(self._mutant(mutant))
+                    state = MutantState(mutant["status"])
+                    if state in [ MutantState.KILLED, MutantState.TIMEOUT ]:
+                        amount_killed += 1
+                    elif state is MutantState.SURVIVED:
+                        amount_survived += 1
+
+                file.write(f"Killed {amount_killed} and {amount_survived} survived")
+                file.write(self._ratio(", mutation score of ", amount_killed, amount_survived))
+                file.write("\n")
+                location_total_killed += amount_killed
+                location_total_survived += amount_survived
+
+            all_locations_total_killed += location_total_killed
+            all_locations_total_survived += location_total_survived
+            file.write(f"\nLocation Killed {location_total_killed} and {location_total_survived} survived")
+            file.write(self._ratio(", mutation score of ", location_total_killed, location_total_survived))
+            file.write("\n\n")
+
+        file.write(f"\nTotal killed {all_locations_total_killed} and {all_locations_total_survived} total survived")
+        file.write(self._ratio(", with a total mutations score of ", all_locations_total_killed, all_locations_total_survived))
+        file.write("\n")
+
+        if self._summary is not None:
+            file.write("\n")
+            file.write(f"Took {self._summary['duration']} seconds")
+        file.close()
+
+    def _header(self, unit: Dict[str, Any]) -> str:
+        text = f"Mutation took {unit['mutation_duration']} seconds\n"
+        text += f"Original execution {unit['trace_count']} traces\n"
+
+        text += "\\Visited count\n"
+        for location, amount in unit["visits"].items():
+            text += f"{location} was visited {amount} times\n"
+        text += "\n"
+
+        text += "Visited locations " + ", ".join(unit["visited_locations"]) + "\n"
+        text += "Unvisited locations " + ", ".join(unit["unvisited_locations"]) + "\n"
+        amount_visited = len(unit["visited_locations"])
+        amount_unvisited = len(unit["unvisited_locations"])
+        text += f"Visited {amount_visited}, Unvisted {amount_unvisited}"
+        text += self._ratio(", percentage visited ", amount_visited, amount_unvisited)
+        text += "\n"
+        text += "\n"
+
+        text += f"Visited nodes {unit['visited_nodes']}\n"
+        text += f"Unvisited nodes {unit['unvisited_nodes']}\n"
+        text += self._ratio("Percentage visited ", unit["visited_nodes"], unit["unvisited_nodes"], "\n")
+        text += "\n"
+
+        text += f"Visited candidates {unit['visited_candidates']}\n"
+        text += f"Unvisited candidates {unit['unvisited_candidates']}\n"
+        text += self._ratio("Percentage visited ", unit["visited_candidates"], unit["unvisited_candidates"], "\n")
+        text += "\n"
+
+        text += f"Tested mutations {unit['visited_mutations']}\n"
+        text += f"Untested mutations {unit['unvisited_mutations']}\n"
+        text += self._ratio("Percentage visited ", unit["visited_mutations"], unit["unvisited_mutations"], "\n")
+        return text
+
+    def _mutant(self, mutant: Dict[str, Any]) -> str:
+        text = f"Mutant trace count {mutant['trace_count']}\n"
+        for location, amount in mutant["visits"].items():
+            text += f"{location} was visited {amount} times\n"
+        text += f"[{FilePoint(*mutant['start_point'])}, {FilePoint(*mutant['end_point'])}]"
+        text += f" '{mutant['operator']}' --> '{mutant['replacement']}'"
+        text += f" :: {mutant['status']}\n"
+        text += "\n"
+        return text
+
+    def _ratio(self, prefix: str, amount: int, other: int, postfix: str = "") -> str:
+        # Left out if there is nothing to divide by
+        if amount + other == 0:
+            return ""
+        return f"{prefix}{amount / (amount + other)}{postfix}"
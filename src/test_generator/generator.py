@@ -140,6 +140,8 @@ class CuTestLinker(CodeGenerator):
         self._write_line("#ifndef CANARY_CUTEST")
         self._write_line("#define CANARY_CUTEST")
         self._write_line()
+        self._write_line("#include <stdlib.h>")
+        self._write_line("#include <string.h>")
         self._write_line("#include \"CuTest.h\"")
 
         self._write_line()
@@ -154,5 +156,37 @@ class CuTestLinker(CodeGenerator):
         self._deindent()
         self._write_line("}")
 
+        self._write_line()
+        self._write_selection()
+
         self._write_line("#endif")
-        return self._lines
\ No newline at end of file
+        return self._lines
+
+    def _write_selection(self) -> None:
+        # Canary names the tests which can observe a mutant in CANARY_TESTS,
+        #   separated by spaces. Every test is run if it is not set
+        self._write_line("int CanaryIsSelected(const char *name, const char *tests) {")
+        self._indent()
+        self._write_line("size_t length = strlen(name);")
+        self._write_line("for (const char *at = strstr(tests, name); at != NULL; at = strstr(at + 1, name)) {")
+        self._indent()
+        self._write_line("if ((at == tests || at[-1] == ' ') && (at[length] == '\\0' || at[length] == ' ')) return 1;")
+        self._deindent()
+        self._write_line("}")
+        self._write_line("return 0;")
+        self._deindent()
+        self._write_line("}")
+        self._write_line()
+        self._write_line("CuSuite *CanarySelectedTests(CuSuite *suite) {")
+        self._indent()
+        self._write_line("const char *tests = getenv(\"CANARY_TESTS\");")
+        self._write_line("if (tests == NULL) return suite;")
+        self._write_line("CuSuite *selected = CuSuiteNew();")
+        self._write_line("for (int idx = 0; idx < suite->count; ++idx) {")
+        self._indent()
+        self._write_line("if (CanaryIsSelected(suite->list[idx]->name, tests)) CuSuiteAdd(selected, suite->list[idx]);")
+        self._deindent()
+        self._write_line("}")
+        self._write_line("return selected;")
+        self._deindent()
+        self._write_line("}")
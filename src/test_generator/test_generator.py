@@ -159,4 +159,16 @@ class TestFunctionDeclaration(unittest.TestCase):
     #     self.assertEqual(lines[3].strip(), "// Act")
     #     self.assertEqual(lines[4].strip(), "CANARY_ACT(int actual = foo(bar_0););")
     #     self.assertEqual(lines[5].strip(), "// Assert")
-    #     self.assertEqual(lines[6].strip(), "}")
\ No newline at end of file
+    #     self.assertEqual(lines[6].strip(), "}")
+
+class TestCuTestLinker(unittest.TestCase):
+    def test_only_linker_selects_tests(self) -> None:
+        suite = TestSuite("Add", [ TestCase("test_add", list(), None, list()) ])
+        suite_lines: List[str] = CuTestSuiteCodeGenerator().visit_test_suite(suite)
+        linker_lines: List[str] = CuTestLinker().link([ suite ])
+
+        self.assertEqual(suite_lines[-1], "#endif")
+        self.assertFalse(any("CanarySelectedTests" in line for line in suite_lines))
+        self.assertEqual(
+            len([ line for line in linker_lines if line.startswith("CuSuite *CanarySelectedTests(") ]), 1
+        )
@@ -1,5 +1,6 @@
 import re
-from typing import List
+from collections import deque
+from typing import Deque, Dict, Iterable
 from instrumentation_trace import (
     TraceParser,
     TraceTreeBuilder
@@ -8,72 +9,103 @@ from .test_summary import TestSummary
 from .test_results import TestResults
 from .resutls_parser import ResultsParser
 
+# Read by CanarySelectedTests of CanaryCuTest.h
+CANARY_TESTS = "CANARY_TESTS"
+
 class CuTestResultsParser(ResultsParser):
     def __init__(self) -> None:
-        self._trace_parser = TraceParser(
+        pass
+
+    def parse(self, lines: Iterable[str], abort_on_failure: bool = False) -> TestResults:
+        # A parser per call, such that a single results parser can
+        # be shared between mutants that are tested concurrently.
+        # The failures are only known from the summary, so there is
+        # nothing to abort
+        trace_parser = TraceParser(
             TraceTreeBuilder()
         )
 
-    def parse(self, lines: List[str]) -> TestResults:
-        for idx, line in enumerate(lines):
-            if self._trace_parser.parse([ line ]):
+        # The summary is recognised from its first three lines, so only
+        #   those are kept while the output is read
+        window: Deque[str] = deque()
+        for line in lines:
+            window.append(line)
+            if len(window) < 3:
                 continue
+            test_results = self._parse_window(window, trace_parser)
+            if test_results is not None:
+                return test_results
+            window.popleft()
+        while len(window) > 0:
+            test_results = self._parse_window(window, trace_parser)
+            if test_results is not None:
+                return test_results
+            window.popleft()
+
+    def test_filter(self, tests: Iterable[str]) -> Dict[str, str]:
+        return { CANARY_TESTS: " ".join(sorted(tests)) }
+
+    def _parse_window(self, window: Deque[str], trace_parser: TraceParser) -> TestResults:
+        line = window[0]
+        if trace_parser.parse_line(line):
+            return None
 
-            # Check if it is the beginning of the summary
-            # Case 1: Only passes (First line is only "...")
-            # Example:
-            #   "..",
-            #   "",
-            #   "OK (2 tests)"
-            if idx + 2 < len(lines) and \
-                all("." == c for c in line) and \
-                lines[idx + 1] == "" and \
-                re.search("OK \([0-9]+ tests\)", lines[idx + 2]):
-                # Since the line only consists of "." the
-                #   length of it is the amount of successes.
-                success_count = len(line)
-                summary = TestSummary(
-                    success_count, 0, success_count
-                )
-                return TestResults(
-                    summary,
-                    self._trace_parser.finish()
-                )
-            # Case 2: Has failures (First line is only "F")
-            # Example:
-            #   "FF"
-            #   ""
-            #   "There were 2 failures:"
-            #   "1) addTest: /input/tests/AllTests.c:15: expected <1> but was <-1>"
-            #   "2) addTest_1_1: /input/tests/AllTests.c:25: expected <12> but was <-6>"
-            #   ""
-            #   "!!!FAILURES!!!"
-            #   "Runs: 2 Passes: 0 Fails: 2"
-            # Example:
-            #   ".F"
-            #   ""
-            #   "There was 1 failure:"
-            #   "1) addTest_1_1: /input/tests/AllTests.c:25: expected <12> but was <-6>"
-            #   ""
-            #   "!!!FAILURES!!!"
-            #   "Runs: 2 Passes: 1 Fails: 1"
-            elif idx + 2 < len(lines) and \
-                all("." == c or "F" == c for c in line) and \
-                lines[idx + 1] == "" and \
-                (re.search("There was 1 failure:", lines[idx + 2]) or \
-                re.search("There were [0-9]+ failures:", lines[idx + 2])):
-                sucess_count = line.count(".")
-                failure_count = line.count("F")
-                summary = TestSummary(
-                    sucess_count + failure_count, failure_count, sucess_count
-                )
-                return TestResults(
-                    summary,
-                    self._trace_parser.finish()
-                )
-            # Case 3: No tests
-            elif line == "OK (0 tests)":
-                return TestResults(
-                    TestSummary(0, 0, 0),
-                    self._trace_parser.finish()
-                )
+        # Check if it is the beginning of the summary
+        # Case 1: Only passes (First line is only "...")
+        # Example:
+        #   "..",
+        #   "",
+        #   "OK (2 tests)"
+        if len(window) == 3 and \
+            all("." == c for c in line) and \
+            window[1] == "" and \
+            re.search("OK \([0-9]+ tests?\)", window[2]):
+            # Since the line only consists of "." the
+            #   length of it is the amount of successes.
+            success_count = len(line)
+            summary = TestSummary(
+                success_count, 0, success_count
+            )
+            return TestResults(
+                summary,
+                trace_parser.finish()
+            )
+        # Case 2: Has failures (First line is only "F")
+        # Example:
+        #   "FF"
+        #   ""
+        #   "There were 2 failures:"
+        #   "1) addTest: /input/tests/AllTests.c:15: expected <1> but was <-1>"
+        #   "2) addTest_1_1: /input/tests/AllTests.c:25: expected <12> but was <-6>"
+        #   ""
+        #   "!!!FAILURES!!!"
+        #   "Runs: 2 Passes: 0 Fails: 2"
+        # Example:
+        #   ".F"
+        #   ""
+        #   "There was 1 failure:"
+        #   "1) addTest_1_1: /input/tests/AllTests.c:25: expected <12> but was <-6>"
+        #   ""
+        #   "!!!FAILURES!!!"
+        #   "Runs: 2 Passes: 1 Fails: 1"
+        elif len(window) == 3 and \
+            all("." == c or "F" == c for c in line) and \
+            window[1] == "" and \
+            (re.search("There was 1 failure:", window[2]) or \
+            re.search("There were [0-9]+ failures:", window[2])):
+            sucess_count = line.count(".")
+            failure_count = line.count("F")
+            summary = TestSummary(
+                sucess_count + failure_count, failure_count, sucess_count
+            )
+            return TestResults(
+                summary,
+                trace_parser.finish()
+            )
+        # Case 3: No tests
+        elif line == "OK (0 tests)":
+            return TestResults(
+                TestSummary(0, 0, 0),
+                trace_parser.finish()
+            )
+        return None
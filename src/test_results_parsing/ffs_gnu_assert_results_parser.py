@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterable
 from instrumentation_trace import (
     TraceParser,
     TraceTreeBuilder
@@ -12,7 +12,7 @@ class FfsGnuAssertResultsParser(ResultsParser):
     def __init__(self) -> None:
         pass
 
-    def parse(self, lines: List[str]) -> TestResults:
+    def parse(self, lines: Iterable[str], abort_on_failure: bool = False) -> TestResults:
         trace_parser = TraceParser(
             TraceTreeBuilder()
         )
@@ -23,8 +23,10 @@ class FfsGnuAssertResultsParser(ResultsParser):
             elif "Assertion" in line and \
                 line.endswith("failed."):
                 found_assertion = True
-            elif trace_parser.parse([ line ]):
+            elif trace_parser.parse_line(line):
                 continue
+            if found_assertion and abort_on_failure:
+                break
         return TestResults(
             TestSummary(
                 None,
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import IO, Dict, Iterable, Iterator
 from .test_results import TestResults
 
 class ResultsParser(ABC):
@@ -7,5 +7,17 @@ class ResultsParser(ABC):
         super().__init__()
 
     @abstractmethod
-    def parse(self, lines: List[str]) -> TestResults:
-        pass
\ No newline at end of file
+    def parse(self, lines: Iterable[str], abort_on_failure: bool = False) -> TestResults:
+        # The lines are consumed once, as they are produced by the tests.
+        #   If aborting on failure, the parser may return at the first
+        #   failure, with the trace up to it
+        pass
+
+    def test_filter(self, _tests: Iterable[str]) -> Dict[str, str]:
+        # The environment which makes the tests only run the named
+        #   tests, None if the backend cannot select tests
+        return None
+
+def read_lines(stream: IO[str]) -> Iterator[str]:
+    for line in stream:
+        yield line[:-1] if line.endswith("\n") else line
@@ -19,6 +19,26 @@ class TestCuTestResultsParser(TestCase):
         self.assertEqual(summary.failure_count, 0)
         self.assertEqual(summary.success_count, 2)
 
+    def test_parse_summary_single_success(self):
+        lines = [
+            ".",
+            "",
+            "OK (1 test)"
+        ]
+
+        parser = CuTestResultsParser()
+        summary = parser.parse(lines).summary
+
+        self.assertEqual(summary.test_count, 1)
+        self.assertEqual(summary.success_count, 1)
+
+    def test_test_filter(self):
+        parser = CuTestResultsParser()
+        self.assertEqual(
+            parser.test_filter([ "subTest", "addTest" ]),
+            { "CANARY_TESTS": "addTest subTest" }
+        )
+
     def test_parse_summary_success_with_a_trace(self):
         lines = [
             "Location=1",
@@ -77,6 +97,22 @@ class TestCuTestResultsParser(TestCase):
         self.assertEqual(summary.failure_count, 0)
         self.assertEqual(summary.success_count, 2)
 
+    def test_parse_stream_stops_at_summary(self):
+        lines = iter([
+            "Location=1",
+            "..",
+            "",
+            "OK (2 tests)",
+            "Location=2",
+        ])
+
+        parser = CuTestResultsParser()
+        test_results = parser.parse(lines)
+
+        self.assertEqual(test_results.summary.test_count, 2)
+        self.assertEqual(len([ *test_results.trace.sequence ]), 1)
+        self.assertEqual([ *lines ], [ "Location=2" ])
+
     def test_parse_summary_success_missing_end(self):
         lines = [
             "..",
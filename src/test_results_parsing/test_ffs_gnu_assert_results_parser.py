@@ -58,4 +58,20 @@ class TestFfsGunAssertResultsParser(TestCase):
         location_0 = sequence[1]
         self.assertIsNone(location_0.test)
         self.assertIsNone(location_0.unit)
-        self.assertEqual(location_0.id, "0")
\ No newline at end of file
+        self.assertEqual(location_0.id, "0")
+
+    def test_parse_abort_on_failure(self):
+        lines = [
+            "Location=1",
+            "tests: tests.c:5: main: Assertion `add(1, 1) == 2' failed.",
+            "Location=2",
+        ]
+        
+        parser = FfsGnuAssertResultsParser()
+        test_results = parser.parse(iter(lines), True)
+
+        self.assertEqual(test_results.summary.failure_count, 1)
+        self.assertEqual([ *test_results.trace.ids ], [ "1" ])
+        self.assertEqual(
+            [ *parser.parse(iter(lines)).trace.ids ], [ "1", "2" ]
+        )
@@ -7,6 +7,7 @@ from .query import *
 from .range import *
 from .syntax import *
 from .tree import *
+from .tree_edit import *
 from .tree_cursor import *
 from .language import *
 from .c_syntax import *
\ No newline at end of file
@@ -1,16 +1,20 @@
 from os import linesep
-from typing import List
+from threading import Lock
+from typing import List, Tuple
 
 from tree_sitter import Parser as _Parser
 
 from .node import Node
 from .tree import Tree
+from .tree_edit import TreeEdit
 from .language_library import LanguageLibrary
 from .language_library import Language
 
 class Parser:
     def __init__(self, parser: _Parser, language: Language = None):
         self._parser: _Parser = parser
+        # Tree-sitter parsers are not safe to share between threads
+        self._lock = Lock()
         if language is not None:
             self.set_language(language)
         else:
@@ -27,11 +31,23 @@ class Parser:
         return parser
 
     def replace(self, tree: Tree, node: Node, new: str, encoding: str = "utf8") -> Tree:
-        source: str = tree.text
-        new_source: str = str(source[0: node.start_byte: 1] +
-                              new +
-                              source[node.end_byte:: 1])
-        return self.parse(new_source, tree, encoding)
+        return self.apply_edit(tree, TreeEdit.replace(node, new, encoding))
+
+    def apply_edit(self, tree: Tree, edit: TreeEdit) -> Tree:
+        source: bytes = tree.source
+        with self._lock:
+            # Tree-sitter edits trees in place, so the edit is made on a copy
+            #   of the tree, which reparsing the unchanged source makes cheaply
+            old_tree = self._parser.parse(source, tree._tree)
+            old_tree.edit(
+                edit.start_byte,
+                edit.old_end_byte,
+                edit.new_end_byte,
+                edit.start_point,
+                edit.old_end_point,
+                edit.new_end_point,
+            )
+            return Tree(self._parser.parse(edit.apply_to(source), old_tree))
 
     def wrap(self, tree: Tree, node: Node, prefix: str = "", postfix: str = "", encoding: str = "utf8") -> Tree:
         replacement: str = prefix + tree.contents_of(node) + postfix
@@ -41,11 +57,23 @@ class Parser:
         replacement: str = text + tree.contents_of(node)
         return self.replace(tree, node, replacement, encoding)
 
-
     def append(self, tree: Tree, node: Node, text: str, encoding: str = "utf8") -> Tree:
         replacement: str = tree.contents_of(node) + text
         return self.replace(tree, node, replacement, encoding)
 
+    def insert_all(self, tree: Tree, insertions: List[Tuple[int, str]], encoding: str = "utf8") -> Tree:
+        # Inserts each text at its byte offset of the source, with a single
+        #   parse. Texts at the same offset keep the order they are given in
+        source: bytes = tree.source
+        parts: List[bytes] = list()
+        position = 0
+        for offset, text in sorted(insertions, key=lambda insertion: insertion[0]):
+            parts.append(source[position: offset])
+            parts.append(bytes(text, encoding))
+            position = offset
+        parts.append(source[position:])
+        return self._parse(b"".join(parts))
+
     def insert_line(self, tree: Tree, line_num: int, line: str, encoding: str = "utf8") -> Tree:
         lines: List[str] = tree.lines.copy()
         lines.insert(line_num, line)
@@ -63,9 +91,13 @@ class Parser:
         return self.parse(linesep.join(lines), old_tree, encoding)
 
     def parse(self, source: str, old_tree: Tree = None, encoding: str = "utf8") -> Tree:
-        if old_tree is None:
-            return Tree(self._parser.parse(bytes(source, encoding)))
-        return Tree(self._parser.parse(bytes(source, encoding), old_tree._tree))
+        return self._parse(bytes(source, encoding), old_tree)
+
+    def _parse(self, source: bytes, old_tree: Tree = None) -> Tree:
+        with self._lock:
+            if old_tree is None:
+                return Tree(self._parser.parse(source))
+            return Tree(self._parser.parse(source, old_tree._tree))
 
     @staticmethod
     def c() -> "Parser":
@@ -65,3 +65,40 @@ class TestParser(unittest.TestCase):
         self.assertEqual(len(lines), 2)
         self.assertEqual(lines[0], "a=2;")
         self.assertEqual(lines[1], "b=1;")
+
+    def test_insert_all(self) -> None:
+        tree: Tree = self._parser.parse("a=2;")
+        new_tree: Tree = self._parser.insert_all(
+            tree, [ (4, "c=3;"), (0, "b"), (1, "x"), (0, "d") ]
+        )
+        self.assertEqual(new_tree.text, "bdax=2;c=3;")
+        self.assertEqual(tree.text, "a=2;")
+        self.assertFalse(new_tree.root.has_error)
+
+    def test_replace_keeps_original_tree(self) -> None:
+        tree: Tree = self._parser.parse("a=2;\nb=3;")
+        node_a: Node = tree.root.children[0].children[0].children[0]
+        new_tree: Tree = self._parser.replace(tree, node_a, "c\n")
+        self.assertEqual(new_tree.text, "c\n=2;\nb=3;")
+        self.assertEqual(
+            new_tree.root.sexp, self._parser.parse(new_tree.text).root.sexp
+        )
+        self.assertEqual(tree.root.children[1].start_point, FilePoint(1, 0))
+        self.assertFalse(tree.root.has_changes)
+
+    def test_replace_after_multibyte_character(self) -> None:
+        tree: Tree = self._parser.parse("char *s=\"æ\";a=2;")
+        node_a: Node = tree.root.children[1].children[0].children[0]
+        new_tree: Tree = self._parser.replace(tree, node_a, "b")
+        self.assertEqual(new_tree.text, "char *s=\"æ\";b=2;")
+
+    def test_tree_edit_replace(self) -> None:
+        tree: Tree = self._parser.parse("a=2;")
+        node_a: Node = tree.root.children[0].children[0].children[0]
+        edit: TreeEdit = TreeEdit.replace(node_a, "bc\nd")
+        self.assertEqual(edit.start_byte, 0)
+        self.assertEqual(edit.old_end_byte, 1)
+        self.assertEqual(edit.new_end_byte, 4)
+        self.assertEqual(edit.old_end_point, FilePoint(0, 1))
+        self.assertEqual(edit.new_end_point, FilePoint(1, 1))
+        self.assertEqual(edit.apply_to(tree.source), b"bc\nd=2;")
@@ -9,14 +9,22 @@ from .file_point import FilePoint
 class Tree:
     def __init__(self, tree: _Tree) -> None:
         self._tree = tree
+        self._text: str = None
 
     @property
     def root(self) -> Node:
         return Node(self._tree.root_node)
 
+    @property
+    def source(self) -> bytes:
+        return self._tree.text
+
     @property
     def text(self) -> str:
-        return self._tree.text.decode("utf-8")
+        # Decoded once, as every "contents_of" reads it
+        if self._text is None:
+            self._text = self._tree.text.decode("utf-8")
+        return self._text
 
     @property
     def lines(self) -> List[str]:
@@ -31,6 +39,7 @@ class Tree:
             old_end_point: FilePoint,
             new_end_point: FilePoint,
     ) -> None:
+        self._text = None
         self._tree.edit(
             start_byte,
             old_end_byte,
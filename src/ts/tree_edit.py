@@ -0,0 +1,77 @@
+from .file_point import FilePoint
+from .node import Node
+
+# An edit of the source of a tree, in the form tree-sitter needs to reuse
+#   the unchanged parts of the old tree when reparsing. Points are given
+#   as (row, byte column) as tree-sitter expects
+class TreeEdit:
+    def __init__(
+        self,
+        start_byte: int,
+        old_end_byte: int,
+        new_end_byte: int,
+        start_point: FilePoint,
+        old_end_point: FilePoint,
+        new_end_point: FilePoint,
+        replacement: bytes,
+    ) -> None:
+        self._start_byte = start_byte
+        self._old_end_byte = old_end_byte
+        self._new_end_byte = new_end_byte
+        self._start_point = start_point
+        self._old_end_point = old_end_point
+        self._new_end_point = new_end_point
+        self._replacement = replacement
+
+    @property
+    def start_byte(self) -> int:
+        return self._start_byte
+
+    @property
+    def old_end_byte(self) -> int:
+        return self._old_end_byte
+
+    @property
+    def new_end_byte(self) -> int:
+        return self._new_end_byte
+
+    @property
+    def start_point(self) -> FilePoint:
+        return self._start_point
+
+    @property
+    def old_end_point(self) -> FilePoint:
+        return self._old_end_point
+
+    @property
+    def new_end_point(self) -> FilePoint:
+        return self._new_end_point
+
+    @property
+    def replacement(self) -> bytes:
+        return self._replacement
+
+    def apply_to(self, source: bytes) -> bytes:
+        return source[:self._start_byte] + self._replacement + source[self._old_end_byte:]
+
+    @classmethod
+    def replace(cls, node: Node, new: str, encoding: str = "utf8") -> "TreeEdit":
+        replacement: bytes = bytes(new, encoding)
+        start_point: FilePoint = node.start_point
+        newlines: int = replacement.count(b"\n")
+        if newlines == 0:
+            new_end_point = FilePoint(start_point.line, start_point.char + len(replacement))
+        else:
+            new_end_point = FilePoint(
+                start_point.line + newlines,
+                len(replacement) - replacement.rfind(b"\n") - 1
+            )
+        return cls(
+            node.start_byte,
+            node.end_byte,
+            node.start_byte + len(replacement),
+            start_point,
+            node.end_point,
+            new_end_point,
+            replacement,
+        )
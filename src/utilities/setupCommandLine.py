@@ -11,7 +11,7 @@ def setupCommandLine() -> ArgumentParser:
         type=str,
         help="The action to do",
         default="generate",
-        choices=["tests", "cfg", "mutate", "instrument"]
+        choices=["tests", "cfg", "mutate", "instrument", "work", "benchmark"]
     )
     parser.add_argument(
         "-f", "--file",
@@ -80,6 +80,152 @@ def setupCommandLine() -> ArgumentParser:
         help="A space sperated list of units to blacklist",
         default=""
     )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        help="The amount of mutants to build and test in parallel, each in its own copy of the base directory",
+        default=1
+    )
+    parser.add_argument(
+        "-sch", "--schemata",
+        action="store_true",
+        help="Compile the mutants of a unit into one program and select the mutant at runtime through CANARY_MUTANT_ID"
+    )
+    parser.add_argument(
+        "-ib", "--incremental_build",
+        action="store_true",
+        help="Only recompile the translation units including the mutated file, learned from compile_commands.json or a dry run of make"
+    )
+    parser.add_argument(
+        "-ktr", "--keep_test_results",
+        action="store_true",
+        help="Write the output of every test run to the out directory, it is otherwise only parsed"
+    )
+    parser.add_argument(
+        "-rc", "--result_cache",
+        action="store_true",
+        help="Remember the results of the mutants in the out directory, and only test the mutants whose file, tests or sources changed since"
+    )
+    parser.add_argument(
+        "-dd", "--deduplicate",
+        action="store_true",
+        help="Do not test the mutants with the same text as the original program or as another mutant"
+    )
+    parser.add_argument(
+        "-tce", "--compiler_equivalence",
+        action="store_true",
+        help="Also compile the mutants first and do not test those whose objects are identical to the original or another mutant, implies --deduplicate and --incremental_build"
+    )
+    parser.add_argument(
+        "-ft", "--full_traces",
+        action="store_true",
+        help="Run all the tests of a mutant, instead of killing them at the first failure, such that the traces of killed mutants are complete"
+    )
+    parser.add_argument(
+        "-tf", "--timeout_factor",
+        type=float,
+        help="A mutant may take this many times as long as the original program to build, and to test, before it is a timeout",
+        default=3.0
+    )
+    parser.add_argument(
+        "-tco", "--timeout_constant",
+        type=float,
+        help="Seconds added to the build and test budgets of a mutant",
+        default=5.0
+    )
+    parser.add_argument(
+        "-st", "--select_tests",
+        action="store_true",
+        help="Only run the tests which visited the mutated location in the original program, and do not test mutants no test visits"
+    )
+    parser.add_argument(
+        "-fs", "--fork_server",
+        action="store_true",
+        help="Fork the tests of the mutants of a schemata from a test program started once, which has to call CANARY_FORK_SERVER() first in main"
+    )
+    parser.add_argument(
+        "-bt", "--binary_trace",
+        action="store_true",
+        help="Have the tests write their trace as binary records to a file of its own through CANARY_TRACE_FILE, instead of as lines on stdout"
+    )
+    parser.add_argument(
+        "-cc", "--coverage_counts",
+        action="store_true",
+        help="Have the tests of the mutants only count the visits of each location through CANARY_COVERAGE, instead of tracing every visit"
+    )
+    parser.add_argument(
+        "-bu", "--batch_units",
+        action="store_true",
+        help="Instrument all the selected units of a file at once and test the original program only once for all of them"
+    )
+    parser.add_argument(
+        "-fj", "--file_jobs",
+        type=int,
+        help="The amount of files to analyse in parallel, each in its own copy of the base directory. The jobs are shared out between them",
+        default=1
+    )
+    parser.add_argument(
+        "-wq", "--work_queue",
+        type=str,
+        help="The SQLite file through which the mutants are handed to the workers started with the \"work\" action, which may run on any host sharing the file",
+        default=None
+    )
+    parser.add_argument(
+        "-it", "--idle_timeout",
+        type=float,
+        help="Seconds a worker waits for a job before it stops",
+        default=10.0
+    )
+    parser.add_argument(
+        "-cp", "--checkpoint",
+        action="store_true",
+        help="Record every tested mutant in a checkpoint journal in the out directory, such that an interrupted analysis can be resumed"
+    )
+    parser.add_argument(
+        "-r", "--resume",
+        action="store_true",
+        help="Resume the last analysis from the checkpoint journal in the out directory, restoring the files it left mutated and not testing the mutants it already tested. The resumed analysis is recorded in the journal as well"
+    )
+    parser.add_argument(
+        "-pq", "--parquet",
+        action="store_true",
+        help="Also write the records of the mutants of a unit as a Parquet table next to its report and JSON lines, requires pyarrow"
+    )
+    parser.add_argument(
+        "-pf", "--profile",
+        action="store_true",
+        help="Record the wall time, CPU time and peak memory of every phase and mutant, written to profile.json as a Chrome trace and to profile.txt as a table in the out directory"
+    )
+    parser.add_argument(
+        "-rp", "--repeat",
+        type=int,
+        help="The amount of times the benchmark runs each stage",
+        default=5
+    )
+    parser.add_argument(
+        "-sf", "--synthetic_functions",
+        type=int,
+        help="The amount of units in the synthetic C file the benchmark generates, none if 0",
+        default=200
+    )
+    parser.add_argument(
+        "-tl", "--trace_lines",
+        type=int,
+        help="The amount of lines of the synthetic trace the benchmark parses",
+        default=2000000
+    )
+    parser.add_argument(
+        "-bl", "--baseline",
+        type=str,
+        help="The benchmark.json of an earlier benchmark to compare with, exiting with 1 if a stage got slower",
+        default=None
+    )
+    parser.add_argument(
+        "-rt", "--regression_threshold",
+        type=float,
+        help="How much slower, as a fraction, a stage may get than in the baseline before it is a regression",
+        default=0.1
+    )
     return parser
 
 def setupIOHandler(commandLineParser: ArgumentParser):
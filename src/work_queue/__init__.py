@@ -0,0 +1,2 @@
+from .mutant_job import *
+from .work_queue import *
@@ -0,0 +1,80 @@
+from typing import Dict
+
+# A mutant for a worker to test: the bytes from the start byte to the end
+#   byte of the instrumented source of the file are replaced. The file is
+#   relative to the base directory, and the source is kept in the queue
+class MutantJob:
+    def __init__(
+        self,
+        file: str,
+        source: str,
+        start_byte: int,
+        end_byte: int,
+        replacement: bytes,
+        env: Dict[str, str] = None,
+        abort_on_failure: bool = False,
+        build_timeout: float = None,
+        test_timeout: float = None,
+        binary_trace: bool = False,
+        identifier: int = None,
+    ) -> None:
+        self._file = file
+        self._source = source
+        self._start_byte = start_byte
+        self._end_byte = end_byte
+        self._replacement = replacement
+        self._env = env
+        self._abort_on_failure = abort_on_failure
+        self._build_timeout = build_timeout
+        self._test_timeout = test_timeout
+        self._binary_trace = binary_trace
+        self._identifier = identifier
+
+    @property
+    def file(self) -> str:
+        return self._file
+
+    @property
+    def source(self) -> str:
+        # The digest of the source in the queue
+        return self._source
+
+    @property
+    def start_byte(self) -> int:
+        return self._start_byte
+
+    @property
+    def end_byte(self) -> int:
+        return self._end_byte
+
+    @property
+    def replacement(self) -> bytes:
+        return self._replacement
+
+    @property
+    def env(self) -> Dict[str, str]:
+        return self._env
+
+    @property
+    def abort_on_failure(self) -> bool:
+        return self._abort_on_failure
+
+    @property
+    def build_timeout(self) -> float:
+        return self._build_timeout
+
+    @property
+    def test_timeout(self) -> float:
+        return self._test_timeout
+
+    @property
+    def binary_trace(self) -> bool:
+        return self._binary_trace
+
+    @property
+    def identifier(self) -> int:
+        # None until the job is put in a queue
+        return self._identifier
+
+    def apply_to(self, source: bytes) -> bytes:
+        return source[:self._start_byte] + self._replacement + source[self._end_byte:]
@@ -0,0 +1,103 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+from instrumentation_trace import TraceTreeBuilder
+from test_results_parsing import TestResults, TestSummary
+from . import *
+
+class TestMutantJob(TestCase):
+    def test_apply_to(self) -> None:
+        job = MutantJob("src/a.c", "digest", 10, 11, b"<=")
+        self.assertEqual(job.apply_to(b"int a = b < c;"), b"int a = b <= c;")
+
+class TestWorkQueue(TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.mkdtemp()
+        self._path = os.path.join(self._directory, "queue.sqlite3")
+        return super().setUp()
+
+    def test_source(self) -> None:
+        queue = WorkQueue(self._path)
+        digest = queue.put_source(b"int a;")
+        self.assertEqual(queue.put_source(b"int a;"), digest)
+        self.assertEqual(WorkQueue(self._path).source(digest), b"int a;")
+        self.assertIsNone(queue.source("unknown"))
+
+    def test_claim(self) -> None:
+        queue = WorkQueue(self._path)
+        source = queue.put_source(b"int a = b < c;")
+        first = queue.put(MutantJob(
+            "src/a.c", source, 10, 11, b"<=", { "CANARY_TESTS": "a" }, True, 1.0, 2.0, True
+        ))
+        second = queue.put(MutantJob("src/a.c", source, 10, 11, b">"))
+        self.assertEqual(len(queue), 2)
+
+        job = WorkQueue(self._path).claim("worker")
+        self.assertEqual(job.identifier, first)
+        self.assertEqual(job.replacement, b"<=")
+        self.assertEqual(job.env, { "CANARY_TESTS": "a" })
+        self.assertTrue(job.abort_on_failure)
+        self.assertEqual(job.test_timeout, 2.0)
+        self.assertTrue(job.binary_trace)
+        self.assertEqual(queue.claim("worker").identifier, second)
+        self.assertIsNone(queue.claim("worker"))
+
+    def test_complete(self) -> None:
+        queue = WorkQueue(self._path)
+        source = queue.put_source(b"int a;")
+        killed = queue.put(MutantJob("src/a.c", source, 0, 3, b"long"))
+        timed_out = queue.put(MutantJob("src/a.c", source, 0, 3, b"char"))
+        not_built = queue.put(MutantJob("src/a.c", source, 0, 3, b"int int"))
+        pending = queue.put(MutantJob("src/a.c", source, 0, 3, b"short"))
+        builder = TraceTreeBuilder()
+        builder.start_test("test").enter_location("1").end_test()
+
+        worker = WorkQueue(self._path)
+        worker.complete(
+            worker.claim("worker").identifier,
+            TestResults(TestSummary(1, 1, 0), builder.build()),
+            False
+        )
+        worker.complete(worker.claim("worker").identifier, None, True)
+        worker.complete(worker.claim("worker").identifier, None, False, True)
+
+        results = queue.results([ killed, timed_out, not_built, pending ])
+        self.assertEqual(set(results), { killed, timed_out, not_built })
+        self.assertEqual(results[killed][0].summary.failure_count, 1)
+        self.assertEqual(results[killed][0].trace.ids, [ "1" ])
+        self.assertFalse(results[killed][1])
+        self.assertFalse(results[killed][2])
+        self.assertEqual(results[timed_out], (None, True, False))
+        self.assertEqual(results[not_built], (None, False, True))
+        self.assertEqual(len(queue), 1)
+
+    def test_requeue_stale(self) -> None:
+        queue = WorkQueue(self._path)
+        source = queue.put_source(b"int a;")
+        identifier = queue.put(MutantJob("src/a.c", source, 0, 3, b"long", test_timeout=0.0))
+        queue.claim("crashed")
+        self.assertEqual(queue.requeue_stale(60.0), 0)
+        self.assertIsNone(queue.claim("worker"))
+
+        time.sleep(0.01)
+        self.assertEqual(queue.requeue_stale(0.0), 1)
+        job = queue.claim("worker")
+        self.assertEqual(job.identifier, identifier)
+        queue.complete(job.identifier, TestResults(TestSummary(1, 0, 1)), False)
+        self.assertEqual(
+            queue.wait([ identifier ])[identifier][0].summary.success_count, 1
+        )
+
+    def test_wait_without_workers(self) -> None:
+        queue = WorkQueue(self._path)
+        source = queue.put_source(b"int a;")
+        claimed = queue.put(MutantJob("src/a.c", source, 0, 3, b"long", build_timeout=0.1))
+        unclaimed = queue.put(MutantJob("src/a.c", source, 0, 3, b"char", test_timeout=0.1))
+        queue.claim("crashed")
+        self.assertAlmostEqual(queue.budget([ claimed, unclaimed ]), 0.2)
+        self.assertEqual(queue.pending([ claimed, unclaimed ]), [ unclaimed ])
+
+        with self.assertRaises(TimeoutError) as context:
+            queue.wait([ unclaimed ], grace=0.1, interval=0.01)
+        self.assertIn(f'[{unclaimed}]', str(context.exception))
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import sqlite3
+import time
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Tuple
+from result_cache import ResultCache
+from test_results_parsing import TestResults
+from .mutant_job import MutantJob
+
+PENDING = "pending"
+CLAIMED = "claimed"
+DONE = "done"
+
+# The mutant jobs of a coordinator, which publishes them, and any amount of
+#   workers, which claim and test them. The queue is a SQLite file, so the
+#   workers can be on any host sharing the file system. A job claimed by a
+#   worker which does not finish it within its budget is pending again,
+#   such that the next worker takes it over
+class WorkQueue:
+    def __init__(self, path: str, timeout: float = 60.0) -> None:
+        self._path = path
+        # Jobs are published and awaited from the threads of a workspace pool
+        self._lock = Lock()
+        # Claims are made in transactions of their own
+        self._connection = sqlite3.connect(
+            path, timeout=timeout, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS sources ("
+            "digest TEXT PRIMARY KEY, text BLOB)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id INTEGER PRIMARY KEY, "
+            "file TEXT, source TEXT, start_byte INTEGER, end_byte INTEGER, replacement BLOB, "
+            "env TEXT, abort_on_failure INTEGER, build_timeout REAL, test_timeout REAL, binary_trace INTEGER, "
+            "state TEXT, worker TEXT, claimed_at REAL, timed_out INTEGER, build_failed INTEGER)"
+        )
+        # The results of the jobs are those of the mutants, keyed by the job
+        self._results = ResultCache(path, "")
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def put_source(self, source: bytes) -> str:
+        digest = hashlib.sha256(source).hexdigest()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO sources VALUES (?, ?)", (digest, source)
+            )
+        return digest
+
+    def source(self, digest: str) -> bytes:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT text FROM sources WHERE digest = ?", (digest,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def put(self, job: MutantJob) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "INSERT INTO jobs VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, NULL, 0, 0)",
+                (
+                    job.file, job.source, job.start_byte, job.end_byte, job.replacement,
+                    json.dumps(job.env), job.abort_on_failure,
+                    job.build_timeout, job.test_timeout, job.binary_trace,
+                    PENDING,
+                )
+            ).lastrowid
+
+    def claim(self, worker: str) -> MutantJob:
+        # None if no job is pending
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._connection.execute(
+                    "SELECT id, file, source, start_byte, end_byte, replacement, "
+                    "env, abort_on_failure, build_timeout, test_timeout, binary_trace "
+                    "FROM jobs WHERE state = ? ORDER BY id LIMIT 1",
+                    (PENDING,)
+                ).fetchone()
+                if row is not None:
+                    self._connection.execute(
+                        "UPDATE jobs SET state = ?, worker = ?, claimed_at = ? WHERE id = ?",
+                        (CLAIMED, worker, time.time(), row[0])
+                    )
+            finally:
+                self._connection.execute("COMMIT")
+        if row is None:
+            return None
+        return MutantJob(
+            row[1], row[2], row[3], row[4], bytes(row[5]), json.loads(row[6]),
+            bool(row[7]), row[8], row[9], bool(row[10]), row[0],
+        )
+
+    def complete(
+        self,
+        identifier: int,
+        test_results: TestResults,
+        timed_out: bool,
+        build_failed: bool = False,
+    ) -> None:
+        # The results are stored before the job is done, such that they
+        #   are there once the coordinator sees it is
+        self._results.put(str(identifier), test_results)
+        with self._lock:
+            self._connection.execute(
+                "UPDATE jobs SET state = ?, timed_out = ?, build_failed = ? WHERE id = ?",
+                (DONE, timed_out, build_failed, identifier)
+            )
+
+    def requeue_stale(self, grace: float) -> int:
+        # Jobs whose worker has taken longer than their budget and the
+        #   grace, most likely because it crashed
+        with self._lock:
+            return self._connection.execute(
+                "UPDATE jobs SET state = ?, worker = NULL, claimed_at = NULL "
+                "WHERE state = ? AND "
+                "claimed_at + COALESCE(build_timeout, 0) + COALESCE(test_timeout, 0) + ? < ?",
+                (PENDING, CLAIMED, grace, time.time())
+            ).rowcount
+
+    def results(self, identifiers: Iterable[int]) -> Dict[int, Tuple[TestResults, bool, bool]]:
+        # The results of the jobs which are done, whether they timed out
+        #   and whether the mutant did not build
+        identifiers = set(identifiers)
+        if len(identifiers) == 0:
+            return dict()
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, timed_out, build_failed FROM jobs WHERE state = ? AND id BETWEEN ? AND ?",
+                (DONE, min(identifiers), max(identifiers))
+            ).fetchall()
+        return {
+            identifier: (self._results.get(str(identifier)), bool(timed_out), bool(build_failed))
+                for identifier, timed_out, build_failed in rows if identifier in identifiers
+        }
+
+    def wait(
+        self,
+        identifiers: Iterable[int],
+        grace: float = 60.0,
+        interval: float = 0.5,
+    ) -> Dict[int, Tuple[TestResults, bool, bool]]:
+        # Until all the jobs are done, handing the stale ones to other workers.
+        #   Jobs which are not done once a single worker could have done all
+        #   of them are left to no worker at all
+        remaining = set(identifiers)
+        results: Dict[int, Tuple[TestResults, bool, bool]] = dict()
+        deadline = time.time() + self.budget(remaining) + grace
+        while True:
+            done = self.results(remaining)
+            results.update(done)
+            remaining.difference_update(done)
+            if len(remaining) == 0:
+                return results
+            if time.time() > deadline:
+                raise TimeoutError(
+                    f'{len(remaining)} jobs of {self._path} are not done in time, '
+                    f'no worker claimed the jobs {sorted(self.pending(remaining))}'
+                )
+            self.requeue_stale(grace)
+            time.sleep(interval)
+
+    def budget(self, identifiers: Iterable[int]) -> float:
+        # The time the jobs may take one after another
+        return sum(
+            (build_timeout or 0) + (test_timeout or 0)
+                for _, build_timeout, test_timeout in self._jobs(identifiers, "build_timeout, test_timeout")
+        )
+
+    def pending(self, identifiers: Iterable[int]) -> List[int]:
+        # The jobs which are not claimed by any worker
+        return [
+            identifier for identifier, state in self._jobs(identifiers, "state")
+                if state == PENDING
+        ]
+
+    def _jobs(self, identifiers: Iterable[int], columns: str) -> List[Tuple[Any, ...]]:
+        identifiers = set(identifiers)
+        if len(identifiers) == 0:
+            return list()
+        with self._lock:
+            rows = self._connection.execute(
+                f'SELECT id, {columns} FROM jobs WHERE id BETWEEN ? AND ?',
+                (min(identifiers), max(identifiers))
+            ).fetchall()
+        return [ row for row in rows if row[0] in identifiers ]
+
+    def __len__(self) -> int:
+        # The jobs which are not done
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE state != ?", (DONE,)
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        self._results.close()
+        with self._lock:
+            self._connection.close()
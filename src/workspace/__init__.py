@@ -0,0 +1,2 @@
+from .workspace import *
+from .workspace_pool import *
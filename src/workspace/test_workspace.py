@@ -0,0 +1,88 @@
+import os
+import tempfile
+from threading import current_thread
+from time import sleep
+from unittest import TestCase
+from . import *
+
+class TestWorkspace(TestCase):
+    def setUp(self) -> None:
+        self._base = tempfile.mkdtemp()
+        os.makedirs(f'{self._base}/src')
+        os.makedirs(f'{self._base}/out')
+        with open(f'{self._base}/src/original.c', "w+") as file:
+            file.write("int main() { return 0; }")
+        with open(f'{self._base}/out/results.txt', "w+") as file:
+            file.write("results")
+
+    def test_create_copies_base(self) -> None:
+        workspace = Workspace.create(self._base)
+        self.assertNotEqual(workspace.root, workspace.base)
+        with open(f'{workspace.root}/src/original.c', "r") as file:
+            self.assertEqual(file.read(), "int main() { return 0; }")
+        workspace.remove()
+        self.assertFalse(os.path.exists(workspace.root))
+
+    def test_create_excludes_contents(self) -> None:
+        workspace = Workspace.create(self._base, [ f'{self._base}/out' ])
+        self.assertTrue(os.path.isdir(f'{workspace.root}/out'))
+        self.assertFalse(os.path.exists(f'{workspace.root}/out/results.txt'))
+        workspace.remove()
+
+    def test_path(self) -> None:
+        workspace = Workspace(self._base, "/tmp/workspace")
+        self.assertEqual(
+            workspace.path(f'{self._base}/src/original.c'),
+            "/tmp/workspace/src/original.c"
+        )
+        self.assertEqual(
+            workspace.path(f'{self._base}//out/./results.txt'),
+            "/tmp/workspace/out/results.txt"
+        )
+        self.assertEqual(workspace.path("/usr/include/stdio.h"), "/usr/include/stdio.h")
+        self.assertEqual(workspace.path(f'{self._base}_other/a.c'), f'{self._base}_other/a.c')
+
+    def test_command(self) -> None:
+        workspace = Workspace(self._base, "/tmp/workspace")
+        self.assertEqual(
+            workspace.command(f'make -C {self._base}/src --file={self._base}/Makefile'),
+            "make -C /tmp/workspace/src --file=/tmp/workspace/Makefile"
+        )
+        self.assertEqual(workspace.command("./tests/tests"), "./tests/tests")
+        self.assertIsNone(workspace.command(None))
+
+class TestWorkspacePool(TestCase):
+    def setUp(self) -> None:
+        self._base = tempfile.mkdtemp()
+
+    def test_submit_preserves_order(self) -> None:
+        def work(workspace: Workspace, idx: int):
+            sleep(0.01 * (5 - idx))
+            return (idx, workspace.root)
+
+        with WorkspacePool(self._base, 3) as pool:
+            futures = [ pool.submit(work, idx) for idx in range(5) ]
+            results = [ future.result() for future in futures ]
+            roots = [ workspace.root for workspace in pool.workspaces ]
+
+        self.assertEqual([ idx for idx, _ in results ], list(range(5)))
+        for _, root in results:
+            self.assertTrue(root in roots)
+        for root in roots:
+            self.assertFalse(os.path.exists(root))
+
+    def test_workspaces_are_exclusive(self) -> None:
+        in_use = set()
+        collisions = list()
+        def work(workspace: Workspace):
+            if workspace.root in in_use:
+                collisions.append(current_thread().name)
+            in_use.add(workspace.root)
+            sleep(0.01)
+            in_use.remove(workspace.root)
+
+        with WorkspacePool(self._base, 2) as pool:
+            futures = [ pool.submit(work) for _ in range(6) ]
+            for future in futures:
+                future.result()
+        self.assertEqual(len(collisions), 0)
@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+from typing import List
+
+class Workspace:
+    def __init__(self, base: str, root: str) -> None:
+        self._base = os.path.abspath(base)
+        self._root = os.path.abspath(root)
+
+    @property
+    def base(self) -> str:
+        return self._base
+
+    @property
+    def root(self) -> str:
+        return self._root
+
+    @property
+    def cwd(self) -> str:
+        # Commands without absolute paths are run relative to the
+        # current directory, so it has to follow along into the copy
+        return self.path(os.getcwd())
+
+    def contains(self, path: str) -> bool:
+        path = os.path.abspath(path)
+        return path == self._base or path.startswith(self._base + os.sep)
+
+    def path(self, path: str) -> str:
+        if path is None or not self.contains(path):
+            return path
+        relative_path = os.path.relpath(os.path.abspath(path), self._base)
+        return os.path.normpath(os.path.join(self._root, relative_path))
+
+    def command(self, command: str) -> str:
+        if command is None:
+            return None
+        return " ".join(
+            self._argument(argument) for argument in command.split()
+        )
+
+    def _argument(self, argument: str) -> str:
+        # Handles both plain paths and options such as "--directory=/path"
+        prefix, separator, value = argument.rpartition("=")
+        if os.path.isabs(value):
+            return prefix + separator + self.path(value)
+        return argument
+
+    def remove(self) -> None:
+        shutil.rmtree(self._root, ignore_errors=True)
+
+    @classmethod
+    def create(cls, base: str, excludes: List[str] = None) -> "Workspace":
+        base = os.path.abspath(base)
+        excluded = [ os.path.abspath(exclude) for exclude in (excludes or list()) ]
+
+        def ignore(directory: str, contents: List[str]) -> List[str]:
+            # Excluded directories are copied as empty directories such
+            # that paths into them stay valid inside the workspace
+            if os.path.abspath(directory) in excluded:
+                return contents
+            return list()
+
+        root = tempfile.mkdtemp(prefix="canary_workspace_")
+        shutil.copytree(
+            base, root, symlinks=True, ignore=ignore, dirs_exist_ok=True
+        )
+        return Workspace(base, root)
@@ -0,0 +1,60 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Queue
+from typing import Any, Callable, List
+from .workspace import Workspace
+
+class WorkspacePool:
+    def __init__(self, base: str, size: int, excludes: List[str] = None) -> None:
+        self._base = base
+        self._size = max(1, size)
+        self._workspaces: List[Workspace] = [
+            Workspace.create(base, excludes) for _ in range(self._size)
+        ]
+        self._available: "Queue[Workspace]" = Queue()
+        for workspace in self._workspaces:
+            self._available.put(workspace)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._size, thread_name_prefix="canary_worker"
+        )
+
+    @property
+    def base(self) -> str:
+        return self._base
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def workspaces(self) -> List[Workspace]:
+        return self._workspaces
+
+    def submit(self, function: Callable[..., Any], *args: Any) -> Future:
+        return self._executor.submit(self._run, function, *args)
+
+    def each(self, function: Callable[..., Any], *args: Any) -> List[Any]:
+        # Runs on every workspace at once, hence nothing else may be
+        #   submitted until it has finished
+        futures = [
+            self._executor.submit(function, workspace, *args)
+                for workspace in self._workspaces
+        ]
+        return [ future.result() for future in futures ]
+
+    def _run(self, function: Callable[..., Any], *args: Any) -> Any:
+        workspace = self._available.get()
+        try:
+            return function(workspace, *args)
+        finally:
+            self._available.put(workspace)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        for workspace in self._workspaces:
+            workspace.remove()
+
+    def __enter__(self) -> "WorkspacePool":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()